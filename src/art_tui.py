@@ -1,5 +1,7 @@
 import sys
 import click
+from functools import cache
+from typing import NamedTuple
 from ui import ArtTUIBase, TUIStub
 import random
 
@@ -12,33 +14,78 @@ red: str = "\033[31m"
 pink: str = "\033[35m"
 colors = [blue, green, red, pink]
 
+
+class FrameStrings(NamedTuple):
+    """
+    The text of an art frame: the lines of its top and bottom
+    edges, and its left and right bars (without a newline).
+    These only depend on the frame and interior widths, so they
+    are built once per pair of widths and drawn by the TUI.
+    """
+    top: tuple[str, ...]
+    bottom: tuple[str, ...]
+    left: str
+    right: str
+
+
+@cache
+def wrappers_strings(frame_width: int, interior_width: int) -> FrameStrings:
+    """
+    Build the frame strings of ArtTUIWrappers.
+    """
+    full_width = interior_width + 2 * (frame_width + 1) - 2
+    chars = [CHARS[i % len(CHARS)] for i in range(frame_width)]
+    top = tuple(char * full_width for char in chars)
+    return FrameStrings(top, top[::-1], "".join(chars), "".join(reversed(chars)))
+
+
+@cache
+def pattern_strings(frame_width: int, interior_width: int,
+                    even: str, odd: str) -> FrameStrings:
+    """
+    Build the frame strings of ArtTUICat1 and ArtTUICat2, whose
+    columns alternate between two characters.
+    """
+    line = "".join(even if col % 2 == 0 else odd
+                   for col in range(interior_width + 2 * frame_width))
+    offset = frame_width + interior_width
+    return FrameStrings((line,) * frame_width, (line,) * frame_width,
+                        line[:frame_width], line[offset:offset + frame_width])
+
+
+@cache
+def special_strings(interior_width: int, color: str) -> FrameStrings:
+    """
+    Build the frame strings of ArtTUISpecial in one color.
+    """
+    pattern = "SPECIAL STUFF"
+    other = max(0, interior_width - len(pattern) - 1)
+    edge = color + "# " + pattern + " " * other + " #" + reset
+    bar = color + "#" + reset
+    return FrameStrings((edge,), (edge,), bar, bar)
+
+
 class ArtTUIWrappers(ArtTUIBase):
     def __init__(self, frame_width: int, interior_width: int):
         self.frame_width = frame_width
         self.interior_width = interior_width
 
+    def frame_strings(self) -> FrameStrings:
+        return wrappers_strings(self.frame_width, self.interior_width)
+
     def print_top_edge(self) -> None:
-        full_width = self.interior_width + 2 * (self.frame_width + 1) - 2
-        for i in range(self.frame_width):
-            char = CHARS[i % len(CHARS)]
-            print(char * full_width)
+        for line in self.frame_strings().top:
+            print(line)
 
     def print_bottom_edge(self) -> None:
-        full_width = self.interior_width + 2 * (self.frame_width + 1) - 2
-        for i in reversed(range(self.frame_width)):
-            char = CHARS[i % len(CHARS)]
-            print(char * full_width)
+        for line in self.frame_strings().bottom:
+            print(line)
 
     def print_left_bar(self) -> None:
-        for i in range(self.frame_width):
-            char = CHARS[i % len(CHARS)]
-            print(char, end="")
+        print(self.frame_strings().left, end="")
 
     def print_right_bar(self) -> None:
-        for i in reversed(range(self.frame_width)):
-            char = CHARS[i % len(CHARS)]
-            print(char, end="")
-        print()
+        print(self.frame_strings().right)
 
     def print_frame(self, height: int) -> None:
         self.print_top_edge()
@@ -57,29 +104,22 @@ class ArtTUICat1(ArtTUIBase):
     def _get_pattern_char(self, col: int) -> str:
         return '|' if col % 2 == 0 else ' '
 
+    def frame_strings(self) -> FrameStrings:
+        return pattern_strings(self.frame_width, self.interior_width, '|', ' ')
+
     def print_top_edge(self) -> None:
-        for row in range(self.frame_width):
-            line = ""
-            for col in range(self.interior_width + 2 * self.frame_width):
-                line += self._get_pattern_char(col)
+        for line in self.frame_strings().top:
             print(line)
 
     def print_bottom_edge(self) -> None:
-        for row in range(self.frame_width):
-            line = ""
-            for col in range(self.interior_width + 2 * self.frame_width):
-                line += self._get_pattern_char(col)
+        for line in self.frame_strings().bottom:
             print(line)
 
     def print_left_bar(self) -> None:
-        for col in range(self.frame_width):
-            print(self._get_pattern_char(col), end="")
+        print(self.frame_strings().left, end="")
 
     def print_right_bar(self) -> None:
-        offset = self.frame_width + self.interior_width
-        for col in range(self.frame_width):
-            print(self._get_pattern_char(offset + col), end="")
-        print()
+        print(self.frame_strings().right)
 
     def print_frame(self, height: int) -> None:
         self.interior_height = height
@@ -100,29 +140,22 @@ class ArtTUICat2(ArtTUIBase):
     def _get_pattern_char(self, col: int) -> str:
         return '>' if col % 2 == 0 else '<'
 
+    def frame_strings(self) -> FrameStrings:
+        return pattern_strings(self.frame_width, self.interior_width, '>', '<')
+
     def print_top_edge(self) -> None:
-        for row in range(self.frame_width):
-            line = ""
-            for col in range(self.interior_width + 2 * self.frame_width):
-                line += self._get_pattern_char(col)
+        for line in self.frame_strings().top:
             print(line)
 
     def print_bottom_edge(self) -> None:
-        for row in range(self.frame_width):
-            line = ""
-            for col in range(self.interior_width + 2 * self.frame_width):
-                line += self._get_pattern_char(col)
+        for line in self.frame_strings().bottom:
             print(line)
 
     def print_left_bar(self) -> None:
-        for col in range(self.frame_width):
-            print(self._get_pattern_char(col), end="")
+        print(self.frame_strings().left, end="")
 
     def print_right_bar(self) -> None:
-        offset = self.frame_width + self.interior_width
-        for col in range(self.frame_width):
-            print(self._get_pattern_char(offset + col), end="")
-        print()
+        print(self.frame_strings().right)
 
     def print_frame(self, height: int) -> None:
         self.interior_height = height
@@ -138,26 +171,26 @@ class ArtTUISpecial(ArtTUIBase):
     def __init__(self, frame_width: int, interior_width: int):
         self.frame_width = frame_width
         self.interior_width = interior_width
+        # The edges and bars are each in a random color, picked
+        # once so that the frame does not change between redraws
+        self._colors = [random.choice(colors) for _ in range(4)]
     
+    def frame_strings(self) -> FrameStrings:
+        top, bottom, left, right = (special_strings(self.interior_width, color)
+                                    for color in self._colors)
+        return FrameStrings(top.top, bottom.bottom, left.left, right.right)
+
     def print_top_edge(self) -> None:
-        pattern: str = "SPECIAL STUFF"
-        other: int = max(0, self.interior_width - len(pattern) - 1)
-        color = random.choice(colors)
-        print(color + "# " + pattern + " " * other + " #" + reset)
+        print(special_strings(self.interior_width, random.choice(colors)).top[0])
 
     def print_bottom_edge(self) -> None:
-        pattern = "SPECIAL STUFF"
-        other = max(0, self.interior_width - len(pattern) - 1)
-        color = random.choice(colors)
-        print(color + "# " + pattern + " " * other + " #" + reset)
+        print(special_strings(self.interior_width, random.choice(colors)).bottom[0])
     
     def print_left_bar(self) -> None:
-        color = random.choice(colors)
-        print(color + "#" + reset, end="")
+        print(special_strings(self.interior_width, random.choice(colors)).left, end="")
 
     def print_right_bar(self) -> None:
-        color = random.choice(colors)
-        print(color + "#" + reset)
+        print(special_strings(self.interior_width, random.choice(colors)).right)
 
     def print_frame(self, height: int) -> None:
         for row in range(height):
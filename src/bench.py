@@ -0,0 +1,867 @@
+"""
+Benchmarks for Strands
+
+Run from the root of the repository, for example:
+    python3 src/bench.py dictionary
+"""
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Container
+from contextlib import redirect_stdout
+
+import click
+
+from boardcache import set_cache_dir
+from catalog import load_catalog
+from gamefile import parse_game
+from generator import generate_board
+from geometry import find_conflicts
+from dictionary import (MappedDictionary, compile_dictionary, get_dictionary,
+                        load_words, reset_dictionary)
+from base import Step, StrandBase
+from solver import solve_game
+from strands import STEPS, Board, Pos, Strand, StrandsGame, scan_conflicts
+from trie import build_trie, get_trie
+from validate import stamp, validate_file
+from verified import set_manifest
+
+DEFAULT_BOARD: str = "boards/face-time.txt"
+BOARD_DIR: str = "boards"
+
+
+def time_per_call(fn: Callable[[], object], n: int) -> float:
+    """
+    Call fn n times and return the average wall-clock time
+    per call, in seconds.
+    """
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def allocated_by(fn: Callable[[], object]) -> tuple[object, int]:
+    """
+    Call fn and return its result along with the number of
+    bytes of Python heap it left allocated.
+    """
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def blocks_allocated_by(fn: Callable[[], object]) -> int:
+    """
+    Call fn and return the number of memory blocks that were
+    allocated (and not yet freed) while it ran.
+    """
+    tracemalloc.start()
+    before = sum(stat.count for stat in
+                 tracemalloc.take_snapshot().statistics("filename"))
+    result = fn()
+    after = sum(stat.count for stat in
+                tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def report(label: str, seconds: float) -> None:
+    """
+    Print a single timing line in a consistent format.
+    """
+    click.echo(f"{label:<40} {seconds * 1e3:10.3f} ms")
+
+
+def report_rate(label: str, count: int, seconds: float) -> None:
+    """
+    Print a throughput line in a consistent format.
+    """
+    click.echo(f"{label:<40} {count / seconds:12,.0f} /s")
+
+
+def report_size(label: str, size: int) -> None:
+    """
+    Print a memory line in a consistent format.
+    """
+    click.echo(f"{label:<40} {size / 2**20:10.2f} MiB")
+
+
+def report_count(label: str, count: float) -> None:
+    """
+    Print a count (or average count) in a consistent format.
+    """
+    click.echo(f"{label:<40} {count:12,.1f}")
+
+
+def lookup_probe(words: list[str], n: int, seed: int = 0) -> list[str]:
+    """
+    Build a list of n lookups, half of them dictionary words
+    and half of them misspellings.
+    """
+    rng = random.Random(seed)
+    probe = []
+    for i in range(n):
+        word = rng.choice(words)
+        probe.append(word if i % 2 == 0 else word + "q")
+    return probe
+
+
+def time_lookups(words: Container[str], probe: list[str]) -> float:
+    """
+    Return the total time taken to look up every word in probe.
+    """
+    start = time.perf_counter()
+    for word in probe:
+        _ = word in words
+    return time.perf_counter() - start
+
+
+def synthetic_game_lines(num_answers: int, width: int = 6,
+                         seed: int = 0) -> list[str]:
+    """
+    Build the lines of a game file with one answer per row:
+    num_answers rows of width random letters, where each row
+    is a (nonsense) theme word read from left to right.
+    """
+    rng = random.Random(seed)
+    rows: list[str] = []
+    seen: set[str] = set()
+    while len(rows) < num_answers:
+        word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz")
+                       for _ in range(width))
+        if word not in seen:
+            seen.add(word)
+            rows.append(word)
+
+    steps = " ".join(["e"] * (width - 1))
+    return (["Synthetic", ""]
+            + [" ".join(word) for word in rows]
+            + [""]
+            + [f"{word} {r + 1} 1 {steps}" for r, word in enumerate(rows)])
+
+
+@click.group()
+def main() -> None:
+    """Strands benchmarks."""
+
+
+@main.command()
+@click.option("-n", "--num", default=50, show_default=True,
+              help="Number of games to construct.")
+@click.option("-g", "--game", default=DEFAULT_BOARD, show_default=True,
+              help="Game file to load.")
+def dictionary(num: int, game: str) -> None:
+    """Per-game construction cost with a cold and a warm dictionary."""
+    report("load web2.txt into a set", time_per_call(load_words, 3))
+
+    reset_dictionary()
+    start = time.perf_counter()
+    StrandsGame(game)
+    report("first StrandsGame (cold cache)", time.perf_counter() - start)
+
+    report("StrandsGame (warm cache)",
+           time_per_call(lambda: StrandsGame(game), num))
+
+    words = get_dictionary()
+    report("StrandsGame (injected dictionary)",
+           time_per_call(lambda: StrandsGame(game, dictionary=words), num))
+
+
+@main.command()
+@click.option("-n", "--num", default=100_000, show_default=True,
+              help="Number of lookups.")
+def mmap(num: int) -> None:
+    """Startup, memory and lookups: in-memory set vs compiled mmap file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "web2.dict")
+        start = time.perf_counter()
+        compile_dictionary(dest=path)
+        report("compile web2.txt", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        word_set, set_size = allocated_by(load_words)
+        report("open: load_words", time.perf_counter() - start)
+        start = time.perf_counter()
+        mapped, mapped_size = allocated_by(lambda: MappedDictionary(path))
+        report("open: MappedDictionary", time.perf_counter() - start)
+        report_size("heap: load_words", set_size)
+        report_size("heap: MappedDictionary", mapped_size)
+
+        assert isinstance(word_set, frozenset)
+        assert isinstance(mapped, MappedDictionary)
+        probe = lookup_probe(sorted(word_set), num)
+        report_rate("lookups: set", num, time_lookups(word_set, probe))
+        report_rate("lookups: MappedDictionary", num,
+                    time_lookups(mapped, probe))
+        mapped.close()
+
+
+@main.command()
+@click.option("-n", "--num", default=100_000, show_default=True,
+              help="Number of lookups.")
+def trie(num: int) -> None:
+    """Memory and lookups: set of words vs packed DAWG."""
+    word_set, set_size = allocated_by(load_words)
+    start = time.perf_counter()
+    dawg = build_trie()
+    report("build DAWG", time.perf_counter() - start)
+    click.echo(f"{'DAWG nodes / edges':<40} {dawg.num_nodes():,} / "
+               f"{dawg.num_edges():,}")
+    report_size("heap: set of words", set_size)
+    report_size("packed DAWG arrays", dawg.nbytes())
+
+    assert isinstance(word_set, frozenset)
+    probe = lookup_probe(sorted(word_set), num)
+    report_rate("is_word: set", num, time_lookups(word_set, probe))
+    report_rate("is_word: DAWG", num, time_lookups(dawg, probe))
+
+    prefixes = [word[:len(word) // 2 + 1] for word in probe]
+    start = time.perf_counter()
+    for prefix in prefixes:
+        dawg.is_prefix(prefix)
+    report_rate("is_prefix: DAWG", num, time.perf_counter() - start)
+
+
+@main.command()
+def bonus() -> None:
+    """Time to find every traceable bonus word, per shipped board."""
+    trie_ = get_trie()
+    times: list[float] = []
+    counts: list[int] = []
+    for name in sorted(os.listdir(BOARD_DIR)):
+        try:
+            game = StrandsGame(os.path.join(BOARD_DIR, name))
+        except ValueError:
+            continue
+        start = time.perf_counter()
+        words = game.board().trace_words(trie_)
+        times.append(time.perf_counter() - start)
+        counts.append(len(words))
+
+    click.echo(f"{'boards':<40} {len(times):10d}")
+    click.echo(f"{'words per board (mean)':<40} "
+               f"{sum(counts) / len(counts):10.1f}")
+    report("trace_words (mean)", sum(times) / len(times))
+    report("trace_words (max)", max(times))
+
+
+@main.command()
+@click.option("-n", "--num", default=200_000, show_default=True,
+              help="Number of operations per measurement.")
+def pos(num: int) -> None:
+    """take_step, step_to and is_adjacent_to: fresh vs interned Pos."""
+    board = Board([["a"] * 8 for _ in range(8)])
+    steps = list(Step)
+    walk = [steps[i % len(steps)] for i in range(num)]
+
+    def take_steps(start: Pos) -> list[Pos]:
+        # Keep every result alive so allocations can be counted
+        cur = start
+        out = []
+        for step in walk:
+            nxt = cur.take_step(step)
+            out.append(nxt)
+            if nxt.r in (0, 7) or nxt.c in (0, 7):
+                nxt = start
+            cur = nxt
+        return out
+
+    fresh, interned = Pos(3, 3), board.pos(3, 3)
+    report("take_step x n: fresh Pos",
+           time_per_call(lambda: take_steps(fresh), 1))
+    report("take_step x n: interned Pos",
+           time_per_call(lambda: take_steps(interned), 1))
+    click.echo(f"{'blocks allocated: fresh Pos':<40} "
+               f"{blocks_allocated_by(lambda: take_steps(fresh)):10,d}")
+    click.echo(f"{'blocks allocated: interned Pos':<40} "
+               f"{blocks_allocated_by(lambda: take_steps(interned)):10,d}")
+
+
+def scan_step_to(pos: Pos, other: Pos) -> Step:
+    """
+    The original Pos.step_to, which scans every step, kept
+    here as the baseline for the adjacency benchmark.
+    """
+    row_dif = other.r - pos.r
+    col_dif = other.c - pos.c
+    if row_dif == 0 and col_dif == 0:
+        raise ValueError("Cannot test difference from a position to itself")
+    for step, (r, c) in STEPS.items():
+        if (row_dif, col_dif) == (r, c):
+            return step
+    raise ValueError("More than 1 Step Away")
+
+
+def scan_is_adjacent_to(pos: Pos, other: Pos) -> bool:
+    """
+    The original Pos.is_adjacent_to, which catches the
+    ValueError from step_to for every non-neighbour.
+    """
+    try:
+        _ = scan_step_to(pos, other)
+    except ValueError:
+        return False
+    return True
+
+
+@main.command()
+@click.option("-n", "--num", default=200_000, show_default=True,
+              help="Number of probes per measurement.")
+def adjacency(num: int) -> None:
+    """Adjacency probes per second: step scan vs lookup table."""
+    board = Board([["a"] * 8 for _ in range(8)])
+    centre = board.pos(3, 3)
+    cells = [board.pos(r, c) for r in range(8) for c in range(8)]
+    probes = [cells[i % len(cells)] for i in range(num)]
+    neighbours = [p for p in probes if centre.is_adjacent_to(p)]
+
+    start = time.perf_counter()
+    for other in probes:
+        scan_is_adjacent_to(centre, other)
+    report_rate("is_adjacent_to: before (scan+raise)", num,
+                time.perf_counter() - start)
+    start = time.perf_counter()
+    for other in probes:
+        centre.is_adjacent_to(other)
+    report_rate("is_adjacent_to: after", num, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for other in neighbours:
+        scan_step_to(centre, other)
+    report_rate("step_to: before (scan)", len(neighbours),
+                time.perf_counter() - start)
+    start = time.perf_counter()
+    for other in neighbours:
+        centre.step_to(other)
+    report_rate("step_to: after", len(neighbours),
+                time.perf_counter() - start)
+
+
+@main.command()
+@click.option("-n", "--num", default=2_000, show_default=True,
+              help="Number of rounds of queries.")
+@click.option("-g", "--game", default=DEFAULT_BOARD, show_default=True,
+              help="Game file to load.")
+def strand(num: int, game: str) -> None:
+    """Cost of repeated strand queries (first call vs memoised)."""
+    answers = [s for _, s in StrandsGame(game).answers()]
+    fresh = [Strand(s.start, s.steps) for s in answers]
+
+    def query(strands: list[Strand]) -> None:
+        for s in strands:
+            s.positions()
+            s.is_cyclic()
+            s.is_folded()
+
+    report("first queries, all answers",
+           time_per_call(lambda: query([Strand(s.start, s.steps)
+                                        for s in fresh]), num))
+    report("repeated queries, all answers",
+           time_per_call(lambda: query(fresh), num))
+    lookup: dict[StrandBase, int] = {s: i for i, s in enumerate(fresh)}
+    report("dict lookup by strand, all answers",
+           time_per_call(lambda: [lookup[s] for s in answers], num))
+
+
+@main.command()
+@click.option("-s", "--sizes", default="10,100,500,2000", show_default=True,
+              help="Comma-separated answer counts.")
+def answers(sizes: str) -> None:
+    """Per-submit cost on synthetic boards with many answers."""
+    for size in [int(n) for n in sizes.split(",")]:
+        game = StrandsGame(synthetic_game_lines(size), dictionary=frozenset())
+        strands = [s for _, s in game.answers()]
+
+        start = time.perf_counter()
+        for s in reversed(strands):
+            game.submit_strand(s)
+        found = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for s in strands:
+            game.submit_strand(s)
+        again = time.perf_counter() - start
+
+        report(f"{size:5d} answers: submit (new)", found / size)
+        report(f"{size:5d} answers: submit (already found)", again / size)
+
+
+@main.command()
+@click.option("-n", "--num", default=20_000, show_default=True,
+              help="Number of rounds over the answers.")
+@click.option("-g", "--game", default=DEFAULT_BOARD, show_default=True,
+              help="Game file to load.")
+def board(num: int, game: str) -> None:
+    """Strand evaluation on the flat board: via positions vs cell IDs."""
+    loaded = StrandsGame(game)
+    grid = loaded.board()
+    strands = [s for _, s in loaded.answers()]
+    cells = [grid.strand_cells(s) for s in strands]
+    count = num * len(strands)
+
+    def by_positions() -> None:
+        for s in strands:
+            "".join(grid.get_letter(p) for p in s.positions())
+
+    report_rate("letters via get_letter(Pos)", count,
+                time_per_call(by_positions, num) * num)
+    report_rate("evaluate_strand", count,
+                time_per_call(lambda: [grid.evaluate_strand(s)
+                                       for s in strands], num) * num)
+    report_rate("evaluate_cells", count,
+                time_per_call(lambda: [grid.evaluate_cells(c)
+                                       for c in cells], num) * num)
+
+
+@main.command()
+@click.option("-n", "--num", default=50, show_default=True,
+              help="Number of rounds over the boards.")
+def cache(num: int) -> None:
+    """Loading every shipped board: cold parse vs compiled cache."""
+    paths = []
+    for name in sorted(os.listdir(BOARD_DIR)):
+        path = os.path.join(BOARD_DIR, name)
+        try:
+            StrandsGame(path)
+        except ValueError:
+            continue
+        paths.append(path)
+    click.echo(f"{len(paths)} valid boards")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        set_cache_dir(tmp)
+        try:
+            for path in paths:
+                StrandsGame(path, cache=True)
+            cold = time_per_call(lambda: [StrandsGame(p) for p in paths], num)
+            cached = time_per_call(
+                lambda: [StrandsGame(p, cache=True) for p in paths], num)
+        finally:
+            set_cache_dir()
+
+    report("cold parse, all boards", cold)
+    report("cached load, all boards", cached)
+    report("cold parse, per board", cold / len(paths))
+    report("cached load, per board", cached / len(paths))
+
+
+@main.command()
+@click.option("-s", "--sizes", default="100,1000,10000", show_default=True,
+              help="Comma-separated numbers of game files.")
+@click.option("-g", "--game", default=DEFAULT_BOARD, show_default=True,
+              help="Game file to copy.")
+def catalog(sizes: str, game: str) -> None:
+    """Picking a random game as the board library grows."""
+    with open(game) as f:
+        text = f.read()
+    for n in [int(size) for size in sizes.split(",")]:
+        with tempfile.TemporaryDirectory() as tmp:
+            set_cache_dir(os.path.join(tmp, "cache"))
+            board_dir = os.path.join(tmp, "boards")
+            index = os.path.join(tmp, "catalog.index")
+            os.mkdir(board_dir)
+            for i in range(n):
+                with open(os.path.join(board_dir, f"game-{i}.txt"), "w") as f:
+                    f.write(text)
+            try:
+                start = time.perf_counter()
+                load_catalog(board_dir, index)
+                build = time.perf_counter() - start
+
+                def pick() -> None:
+                    load_catalog(board_dir, index).choose()
+
+                def listdir() -> None:
+                    random.choice([f for f in os.listdir(board_dir)
+                                   if f.endswith(".txt")])
+
+                report(f"{n:6} boards: build catalog", build)
+                report(f"{n:6} boards: load catalog and pick", time_per_call(pick, 20))
+                report(f"{n:6} boards: listdir and pick", time_per_call(listdir, 20))
+            finally:
+                set_cache_dir()
+
+
+def split_game_lines(raw_lines: list[str]) -> tuple[str, list[list[str]],
+                                                    list[list[str]]]:
+    """
+    The tokenising half of the original parser in
+    StrandsGame.__init__ (before gamefile.py), kept here as
+    the baseline for the parse benchmark: returns the theme,
+    board rows and answer tokens, without checking them.
+    """
+    lines: list[str] = []
+    for ln in raw_lines:
+        ln = ln.rstrip('\n').strip()
+        if ln.lower().startswith("http"):
+            break
+        lines.append(ln)
+    blank_idcs = [i for i, ln in enumerate(lines) if ln == ""]
+    first_blank, second_blank = blank_idcs[0], blank_idcs[1]
+    board_lines = lines[(first_blank + 1):second_blank]
+    answer_lines = [ln for ln in lines[(second_blank + 1):] if ln]
+    grid: list[list[str]] = []
+    for row in board_lines:
+        letters = row.split()
+        if len(letters) != len(board_lines[0].split()):
+            raise ValueError("Invalid Strands Board (not rectangular)")
+        grid.append([letter.lower() for letter in letters])
+    answers = [line.split() for line in answer_lines]
+    return lines[0], grid, answers
+
+
+@main.command()
+@click.option("-s", "--sizes", default="10,1000,10000", show_default=True,
+              help="Comma-separated numbers of answers (and board rows).")
+@click.option("-w", "--width", default=8, show_default=True,
+              help="Number of board columns.")
+def parse(sizes: str, width: int) -> None:
+    """Parsing large synthetic game files."""
+    for n in [int(size) for size in sizes.split(",")]:
+        lines = [line + "\n" for line in synthetic_game_lines(n, width)]
+        size = sum(len(line) for line in lines)
+        rounds = max(1, 20_000 // n)
+
+        split = time_per_call(lambda: split_game_lines(lines), rounds)
+        streamed = time_per_call(lambda: parse_game(lines), rounds)
+        loaded = time_per_call(lambda: StrandsGame(lines, dictionary=set()),
+                               max(1, rounds // 4))
+        click.echo(f"{n} answers, {len(lines)} lines, {size / 2**10:.0f} KiB:")
+        report_rate("  original tokenising (lines)", len(lines), split)
+        report_rate("  parse_game (lines)", len(lines), streamed)
+        click.echo(f"{'  parse_game (data)':<40} {size / 2**20 / streamed:12,.1f} MiB/s")
+        report_rate("  StrandsGame (lines)", len(lines), loaded)
+
+
+@main.command()
+@click.option("-n", "--num", default=50, show_default=True,
+              help="Number of rounds over the boards.")
+def trusted(num: int) -> None:
+    """Loading the verified boards: validated vs trusted vs cached."""
+    paths = [os.path.join(BOARD_DIR, name) for name in sorted(os.listdir(BOARD_DIR))
+             if name.endswith(".txt") and validate_file(
+                 os.path.join(BOARD_DIR, name)).is_valid()]
+    click.echo(f"{len(paths)} valid boards")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = os.path.join(tmp, "verified.sha256")
+        set_manifest(manifest)
+        set_cache_dir(tmp)
+        try:
+            stamp([validate_file(p) for p in paths], manifest)
+            for path in paths:
+                StrandsGame(path, cache=True)
+            checked = time_per_call(lambda: [StrandsGame(p) for p in paths], num)
+            fast = time_per_call(
+                lambda: [StrandsGame(p, trusted=True) for p in paths], num)
+            cached = time_per_call(
+                lambda: [StrandsGame(p, cache=True, trusted=True) for p in paths],
+                num)
+        finally:
+            set_manifest()
+            set_cache_dir()
+
+    report("validated, per board", checked / len(paths))
+    report("trusted, per board", fast / len(paths))
+    report("trusted and cached, per board", cached / len(paths))
+
+
+def zigzag_strands(num_rows: int, num_cols: int,
+                   cross: bool) -> list[list[int]]:
+    """
+    Cover a board with strands (as lists of cell IDs), two
+    per pair of rows. If cross is True, each pair zigzags
+    between its two rows, so the pair crosses at every step;
+    otherwise each strand runs along its own row.
+    """
+    strands: list[list[int]] = []
+    for r in range(0, num_rows - 1, 2):
+        for first in (r, r + 1):
+            other = 2 * r + 1 - first if cross else first
+            strands.append([(first if c % 2 == 0 else other) * num_cols + c
+                            for c in range(num_cols)])
+    return strands
+
+
+@main.command()
+@click.option("-n", "--num", default=20, show_default=True,
+              help="Number of calls to time.")
+@click.option("-r", "--rows", default=200, show_default=True,
+              help="Number of rows of the synthetic boards.")
+@click.option("-c", "--cols", default=60, show_default=True,
+              help="Number of columns of the synthetic boards.")
+def geometry(num: int, rows: int, cols: int) -> None:
+    """Folds and crossings: per-edge dict scan vs vectorised pass."""
+    for cross in (False, True):
+        strands = zigzag_strands(rows, cols, cross)
+        edges = sum(len(s) - 1 for s in strands)
+        conflicts = find_conflicts(strands, cols)
+        click.echo(f"{len(strands)} strands, {edges:,} edges, "
+                   f"{len(conflicts.crossings)} crossing pairs")
+        report("  dict scan", time_per_call(
+            lambda: scan_conflicts(strands, cols), num))
+        report("  find_conflicts", time_per_call(
+            lambda: find_conflicts(strands, cols), num))
+
+
+@main.command()
+@click.option("-n", "--num", default=5, show_default=True,
+              help="Number of times to solve each board.")
+def solver(num: int) -> None:
+    """Time to count every tiling of each valid shipped board."""
+    times: list[tuple[float, str, int, int]] = []
+    for name in sorted(os.listdir(BOARD_DIR)):
+        path = os.path.join(BOARD_DIR, name)
+        if not name.endswith(".txt") or not validate_file(path).is_valid():
+            continue
+        game = StrandsGame(path, dictionary=frozenset())
+        result = solve_game(game)
+        seconds = time_per_call(lambda: solve_game(game), num)
+        times.append((seconds, name, result.num_solutions(), result.nodes))
+
+    for seconds, name, count, nodes in sorted(times, reverse=True)[:5]:
+        report(f"{name} ({count} solutions, {nodes} nodes)", seconds)
+    report(f"mean over {len(times)} boards", sum(t[0] for t in times) / len(times))
+
+
+def random_word_lengths(num_cells: int, rng: random.Random,
+                        shortest: int = 4, longest: int = 9) -> list[int]:
+    """
+    Split num_cells into random word lengths between shortest
+    and longest (the last one may be longer).
+    """
+    lengths: list[int] = []
+    left = num_cells
+    while left > longest + shortest:
+        length = rng.randint(shortest, longest)
+        lengths.append(length)
+        left -= length
+    lengths.append(left)
+    return lengths
+
+
+@main.command()
+@click.option("-n", "--num", default=20, show_default=True,
+              help="Number of boards to generate per size.")
+@click.option("-s", "--sizes", default="5x5,8x6,10x10,15x15", show_default=True,
+              help="Comma-separated ROWSxCOLS board sizes.")
+def generate(num: int, sizes: str) -> None:
+    """Generation throughput and success rate per board size."""
+    for size in sizes.split(","):
+        rows, cols = map(int, size.split("x"))
+        made = 0
+        start = time.perf_counter()
+        for seed in range(num):
+            rng = random.Random(seed)
+            words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz")
+                             for _ in range(length))
+                     for length in random_word_lengths(rows * cols, rng)]
+            if generate_board("Synthetic", words, rows, cols, seed) is not None:
+                made += 1
+        seconds = time.perf_counter() - start
+        click.echo(f"{size}: {made}/{num} generated ({100 * made / num:.0f}%)")
+        report_rate("  boards", made, seconds)
+
+
+def scan_word_paths(board: Board, word: str) -> list[tuple[int, ...]]:
+    """
+    Find every path spelling word by walking from every cell,
+    with no letter index or memo (the baseline for
+    Board.word_paths).
+    """
+    letters = board.letter_bytes()
+    neighbours = board.neighbours()
+    target = word.encode()
+    found: list[tuple[int, ...]] = []
+    path: list[int] = []
+
+    def extend(cell: int) -> None:
+        if letters[cell] != target[len(path)] or cell in path:
+            return
+        path.append(cell)
+        if len(path) == len(target):
+            found.append(tuple(path))
+        else:
+            for n in neighbours[8 * cell:8 * cell + 8]:
+                if n >= 0:
+                    extend(n)
+        path.pop()
+
+    for cell in range(len(letters)):
+        extend(cell)
+    return found
+
+
+@main.command()
+@click.option("-n", "--num", default=20, show_default=True,
+              help="Number of rounds to time.")
+def wordpaths(num: int) -> None:
+    """Finding every path that spells a word: plain walk vs indexed search."""
+    games = []
+    for name in sorted(os.listdir(BOARD_DIR)):
+        path = os.path.join(BOARD_DIR, name)
+        if name.endswith(".txt") and validate_file(path).is_valid():
+            games.append(StrandsGame(path, dictionary=frozenset()))
+
+    boards = [game.board() for game in games]
+    answers = [[w for w, _ in game.answers()] for game in games]
+
+    def shipped(search: Callable[[Board, str], object], longest: bool,
+                fresh: bool) -> None:
+        for board, words in zip(boards, answers):
+            if fresh:
+                # A new board, so nothing is remembered from the
+                # last round
+                board = Board.from_letter_bytes(board.letter_bytes(),
+                                                board.num_rows(),
+                                                board.num_cols())
+            for word in [max(words, key=len)] if longest else words:
+                search(board, word)
+
+    letters = [["a"] * 6 for _ in range(8)]
+    letters[7][5] = "b"
+    repetitive = Board(letters).letter_bytes()
+
+    def repeated(search: Callable[[Board, str], object], word: str) -> None:
+        search(Board.from_letter_bytes(repetitive, 8, 6), word)
+
+    cases: list[tuple[str, Callable[[Callable[[Board, str], object]], None]]] = [
+        (f"every answer, {len(games)} new boards",
+         lambda f: shipped(f, False, True)),
+        (f"every answer, {len(games)} boards searched before",
+         lambda f: shipped(f, False, False)),
+        ("longest answer per board", lambda f: shipped(f, True, False)),
+        ("'aaaaab' on 8x6 of a's and one b", lambda f: repeated(f, "aaaaab")),
+        ("'aaaaaz' on 8x6 of a's and one b", lambda f: repeated(f, "aaaaaz")),
+    ]
+    for label, case in cases:
+        click.echo(label)
+        report("  plain walk", time_per_call(lambda: case(scan_word_paths), num))
+        report("  Board.word_paths", time_per_call(
+            lambda: case(Board.word_paths), num))
+
+
+class CountingWriter(io.StringIO):
+    """
+    A text stream that counts the writes made to it and the
+    bytes written.
+    """
+
+    writes: int = 0
+    bytes_written: int = 0
+
+    def write(self, text: str) -> int:
+        """
+        Count, and discard, a write.
+        """
+        self.writes += 1
+        self.bytes_written += len(text.encode())
+        return len(text)
+
+
+def cursor_walk(board: Board, num: int) -> list[list[Pos]]:
+    """
+    Return the selection after each of num keystrokes that
+    walk the cursor around the board, selecting as it goes
+    and starting again at each corner.
+    """
+    cols, rows = board.num_cols(), board.num_rows()
+    ring = ([board.pos(0, c) for c in range(cols)]
+            + [board.pos(r, cols - 1) for r in range(1, rows)]
+            + [board.pos(rows - 1, c) for c in range(cols - 2, -1, -1)]
+            + [board.pos(r, 0) for r in range(rows - 2, 0, -1)])
+    selections: list[list[Pos]] = []
+    selected: list[Pos] = []
+    for i in range(num):
+        pos = ring[i % len(ring)]
+        selected = [pos] if pos.c in (0, cols - 1) and pos.r in (0, rows - 1) \
+            else selected + [pos]
+        selections.append(list(selected))
+    return selections
+
+
+@main.command()
+@click.option("-n", "--num", default=200, show_default=True,
+              help="Number of keystrokes to replay.")
+@click.option("-g", "--game", default=DEFAULT_BOARD, show_default=True,
+              help="Game file to play.")
+@click.option("-v", "--viewport", default="10x16", show_default=True,
+              help="ROWSxCOLS of the viewport that follows the cursor.")
+def tui(num: int, game: str, viewport: str) -> None:
+    """Bytes, writes and time per keystroke: full reprint vs screen buffer."""
+    from overlay import Overlay, Viewport
+    from screen import Screen
+    from tui import update_display
+    from ui import ArtTUIStub
+
+    strands = StrandsGame(game, dictionary=frozenset())
+    for _, strand in strands.answers()[:2]:
+        strands.submit_strand(strand)
+    frame = ArtTUIStub(1, 4 * (strands.board().num_cols() - 1) + 1)
+    keys = cursor_walk(strands.board(), num)
+
+    printed = CountingWriter()
+    start = time.perf_counter()
+    with redirect_stdout(printed):
+        for selected in keys:
+            update_display(strands, strands.found_strands(), selected[-1],
+                           selected, frame)
+    reprint = time.perf_counter() - start
+
+    drawn = CountingWriter()
+    screen = Screen(drawn)
+    start = time.perf_counter()
+    for selected in keys:
+        update_display(strands, strands.found_strands(), selected[-1],
+                       selected, frame, screen)
+    diffed = time.perf_counter() - start
+
+    drawn_rows = CountingWriter()
+    screen = Screen(drawn_rows)
+    overlay = Overlay(strands.board())
+    start = time.perf_counter()
+    for selected in keys:
+        update_display(strands, strands.found_strands(), selected[-1],
+                       selected, frame, screen, overlay=overlay)
+    overlaid = time.perf_counter() - start
+
+    view_rows, view_cols = map(int, viewport.split("x"))
+    view = Viewport(0, 0, view_rows, view_cols)
+    drawn_view = CountingWriter()
+    screen = Screen(drawn_view)
+    overlay = Overlay(strands.board())
+    start = time.perf_counter()
+    for selected in keys:
+        pos = selected[-1]
+        view = view.follow(pos.r, pos.c, strands.board().num_rows(),
+                           strands.board().num_cols())
+        overlay.set_viewport(view)
+        update_display(strands, strands.found_strands(), pos,
+                       selected, frame, screen, overlay=overlay)
+    viewed = time.perf_counter() - start
+
+    click.echo("full reprint")
+    report_count("  bytes per keystroke", printed.bytes_written / num)
+    report_count("  writes per keystroke", printed.writes / num)
+    report("  frame time", reprint / num)
+    click.echo("screen buffer")
+    report_count("  bytes per keystroke", drawn.bytes_written / num)
+    report_count("  writes per keystroke", drawn.writes / num)
+    report("  frame time", diffed / num)
+    click.echo("screen buffer and overlay")
+    report_count("  bytes per keystroke", drawn_rows.bytes_written / num)
+    report("  frame time", overlaid / num)
+    click.echo(f"screen buffer, overlay and {viewport} viewport")
+    report_count("  bytes per keystroke", drawn_view.bytes_written / num)
+    report("  frame time", viewed / num)
+
+
+if __name__ == "__main__":
+    main()
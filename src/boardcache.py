@@ -0,0 +1,171 @@
+"""
+Compiled board cache for Strands games.
+
+Loading a game file means tokenising it, walking every answer
+strand, checking for folds and checking that the answers cover
+the board. None of that changes unless the file does, so a
+validated game can be compiled into a small marshal record and
+stored in a cache directory under the SHA-256 hash of the file's
+contents. StrandsGame(..., cache=True) then loads the record
+instead of revalidating the file whenever an entry for the same
+contents exists (see StrandsGame.__init__).
+
+Because entries are keyed by content, an edited file simply
+misses the cache; stale entries are never used. The cache can
+be filled ahead of time with:
+
+    python3 src/boardcache.py compile boards/*.txt
+
+A record is a tuple
+
+    (theme, num_rows, num_cols, letters, answers, answer_cells)
+
+where letters holds the board row by row, one byte per cell,
+answers holds (word, row, col, packed steps) for each answer
+(see Strand.packed_steps), and answer_cells holds the cell
+bitmask of each answer. The record is stored wrapped in a
+(MAGIC, VERSION, record) tuple.
+"""
+import hashlib
+import marshal
+import os
+import threading
+
+from dictionary import PROJECT_ROOT
+
+import click
+
+CACHE_DIR: str = os.path.join(PROJECT_ROOT, "assets", "cache")
+MAGIC: str = "STRB"
+# Version of the record layout. A record is only written for a
+# valid board, so this also changes when a board that used to be
+# valid no longer is: 2 dropped records of boards whose answers
+# cross, written before crossings were checked
+VERSION: int = 2
+
+Record = tuple[str, int, int, bytes,
+               tuple[tuple[str, int, int, bytes], ...], tuple[int, ...]]
+
+_lock: threading.Lock = threading.Lock()
+_cache_dir: str = CACHE_DIR
+
+
+def content_key(data: bytes) -> str:
+    """
+    Return the cache key for a game file with the given
+    contents.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_cache_dir() -> str:
+    """
+    Return the directory that cache entries are read from
+    and written to.
+    """
+    return _cache_dir
+
+
+def set_cache_dir(path: str = CACHE_DIR) -> None:
+    """
+    Use a different cache directory (or the default one, if
+    no path is given).
+    """
+    global _cache_dir
+    with _lock:
+        _cache_dir = path
+
+
+def entry_path(key: str) -> str:
+    """
+    Return the path of the cache entry for a key.
+    """
+    return os.path.join(_cache_dir, key + ".board")
+
+
+def read_entry(key: str) -> Record | None:
+    """
+    Return the record cached under key, or None if there is
+    no usable entry (missing, unreadable, or written by a
+    different version of this module).
+    """
+    try:
+        with open(entry_path(key), "rb") as f:
+            stored = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (not isinstance(stored, tuple) or len(stored) != 3
+            or stored[0] != MAGIC or stored[1] != VERSION):
+        return None
+    return stored[2]
+
+
+def write_entry(key: str, record: Record) -> bool:
+    """
+    Store a record under key. Returns False (rather than
+    raising) if the cache directory cannot be written, since
+    the cache is only an optimisation.
+    """
+    path = entry_path(key)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(_cache_dir, exist_ok=True)
+        with open(tmp, "wb") as f:
+            marshal.dump((MAGIC, VERSION, record), f)
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+def clear_cache() -> int:
+    """
+    Delete every entry in the cache directory. Returns the
+    number of entries deleted.
+    """
+    try:
+        names = os.listdir(_cache_dir)
+    except OSError:
+        return 0
+    count = 0
+    for name in names:
+        if name.endswith(".board"):
+            os.remove(os.path.join(_cache_dir, name))
+            count += 1
+    return count
+
+
+######################################################################
+
+
+@click.group()
+def main() -> None:
+    """Board cache tools."""
+
+
+@main.command("compile")
+@click.argument("files", nargs=-1, required=True)
+def compile_command(files: tuple[str, ...]) -> None:
+    """Validate game files and store them in the cache."""
+    # Imported here because strands imports this module
+    from strands import StrandsGame
+
+    failed = 0
+    for path in files:
+        try:
+            StrandsGame(path, cache=True)
+        except ValueError as e:
+            click.echo(f"{path}: {e}", err=True)
+            failed += 1
+    click.echo(f"Compiled {len(files) - failed} of {len(files)} "
+               f"game files into {_cache_dir}")
+
+
+@main.command("clear")
+def clear_command() -> None:
+    """Delete every cached board."""
+    click.echo(f"Deleted {clear_cache()} entries from {_cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
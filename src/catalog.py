@@ -0,0 +1,486 @@
+"""
+Catalog of the game files in boards/.
+
+Picking a game used to mean listing boards/ on every launch and
+choosing a file blindly; nothing could tell a board's theme, size
+or number of answers without loading it. The catalog keeps one
+CatalogEntry per game file, built by loading each file once, and
+persists the entries in assets/cache/ so later launches only read
+the index (see Catalog for its layout).
+
+The index is brought up to date incrementally. Unless asked for
+a full check, it is reused as-is while the modification time of
+the boards directory is unchanged (adding, removing or renaming
+a file changes it) and so are the files of the invalid entries,
+so a launch costs the same however many boards there are.
+Otherwise only files whose size or modification time changed
+are loaded again. Editing a file in place does not change the
+directory, so the file of a game that is chosen or looked up by
+name is checked too, and the catalog is brought up to date if
+it changed. Files that are not valid games are kept in the
+catalog with their error, so that they are not retried on every
+launch, but are never chosen.
+
+    python3 src/catalog.py list --rows 8 --cols 6
+    python3 src/catalog.py update --full
+"""
+import io
+import marshal
+import os
+import random
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from boardcache import CACHE_DIR, content_key
+from dictionary import PROJECT_ROOT
+from gamefile import parse_game
+from strands import StrandsGame
+
+import click
+
+BOARD_DIR: str = os.path.join(PROJECT_ROOT, "boards")
+INDEX_PATH: str = os.path.join(CACHE_DIR, "catalog.index")
+MAGIC: bytes = b"STRC"
+# Version of the index layout, and of what makes an entry valid:
+# 2 re-checked every entry once crossing answers became invalid,
+# 3 added each entry's file name and the list of invalid entries
+VERSION: int = 3
+HEADER: struct.Struct = struct.Struct("<4sIqII")
+
+
+class CatalogEntry(NamedTuple):
+    """
+    What the catalog knows about one game file. For invalid
+    files, error holds the reason and the game fields are
+    empty. filename is the name of the file itself, which may
+    differ from name + ".txt" (see game_name).
+    """
+    name: str
+    filename: str
+    theme: str
+    num_rows: int
+    num_cols: int
+    num_answers: int
+    word_lengths: tuple[int, ...]
+    digest: str
+    url: str
+    mtime_ns: int
+    size: int
+    error: str
+
+    def is_valid(self) -> bool:
+        """
+        Decide whether or not the file is a valid game.
+        """
+        return not self.error
+
+
+def game_name(filename: str) -> str | None:
+    """
+    Return the name of the game in a file (the filename
+    without ".txt"), or None if it is not a game file.
+    Surrounding whitespace is ignored, since some shipped
+    boards end in ".txt ".
+    """
+    stripped = filename.strip()
+    if stripped.lower().endswith(".txt"):
+        return stripped[:-4]
+    return None
+
+
+def scan_game(path: str, name: str, mtime_ns: int, size: int) -> CatalogEntry:
+    """
+    Load a game file and describe it.
+    """
+    filename = os.path.basename(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        spec = parse_game(io.StringIO(data.decode(), newline=None))
+        # The dictionary plays no part in describing a game
+        game = StrandsGame(spec, dictionary=frozenset())
+    except ValueError as e:
+        return CatalogEntry(name, filename, "", 0, 0, 0, (), content_key(data),
+                            "", mtime_ns, size, str(e) or type(e).__name__)
+    words = [word for word, _ in game.answers()]
+    return CatalogEntry(name, filename, spec.theme, len(spec.board),
+                        len(spec.board[0]), len(words),
+                        tuple(len(word) for word in words), content_key(data),
+                        spec.url, mtime_ns, size, "")
+
+
+class Catalog:
+    """
+    Index of the games in a boards directory.
+
+    The saved index has the same layout as a compiled
+    dictionary (see dictionary.py): a header, then a table of
+    little-endian uint32 offsets, then one marshalled record
+    per entry, sorted by name. The header is followed by the
+    selection buckets, which list the valid entries for each
+    (rows, columns, answers) combination, and the list of
+    invalid entries. Opening the index
+    only decodes the header and these lists, and entries are
+    decoded when they are asked for, so opening the catalog,
+    choosing a game and finding a game by name do not depend
+    on the number of entries (other than by bisection).
+    """
+
+    _board_dir: str
+    _index_path: str
+    _dir_mtime_ns: int
+    _data: bytes
+    _offsets: memoryview | array
+    _count: int
+    _base: int
+    _buckets: dict[tuple[int, int, int], array]
+    _invalid: array
+
+    def __init__(self, board_dir: str = BOARD_DIR,
+                 index_path: str = INDEX_PATH) -> None:
+        """
+        Constructor
+
+        Loads the saved index for board_dir, if there is one;
+        call update to bring it up to date.
+        """
+        self._board_dir = board_dir
+        self._index_path = index_path
+        try:
+            with open(index_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        if not self._open(data):
+            self._open(self._pack(-1, []))
+
+    def _open(self, data: bytes) -> bool:
+        """
+        Use a packed index (see _pack). Returns False, leaving
+        the catalog unchanged, if data is not a packed index for
+        this catalog's directory.
+        """
+        try:
+            magic, version, dir_mtime_ns, count, meta_len = HEADER.unpack_from(data)
+            board_dir, buckets, invalid = marshal.loads(
+                data[HEADER.size:HEADER.size + meta_len])
+        except (struct.error, EOFError, ValueError, TypeError):
+            return False
+        if (magic != MAGIC or version != VERSION
+                or board_dir != os.path.abspath(self._board_dir)):
+            return False
+
+        table = HEADER.size + meta_len
+        table_end = table + 4 * (count + 1)
+        if sys.byteorder == "little":
+            self._offsets = memoryview(data)[table:table_end].cast("I")
+        else:
+            swapped = array("I", data[table:table_end])
+            swapped.byteswap()
+            self._offsets = swapped
+        self._buckets = {}
+        for key, packed in buckets.items():
+            bucket = array("I", packed)
+            if sys.byteorder != "little":
+                bucket.byteswap()
+            self._buckets[key] = bucket
+        self._invalid = array("I", invalid)
+        if sys.byteorder != "little":
+            self._invalid.byteswap()
+        self._data = data
+        self._dir_mtime_ns = dir_mtime_ns
+        self._count = count
+        self._base = table_end
+        return True
+
+    def _pack(self, dir_mtime_ns: int, entries: list[CatalogEntry]) -> bytes:
+        """
+        Pack entries (sorted by name) into an index.
+        """
+        offsets = array("I")
+        records = bytearray()
+        buckets: dict[tuple[int, int, int], array] = {}
+        invalid = array("I")
+        for i, entry in enumerate(entries):
+            offsets.append(len(records))
+            # marshal only handles plain tuples, not NamedTuples
+            records += marshal.dumps(tuple(entry))
+            if entry.is_valid():
+                key = (entry.num_rows, entry.num_cols, entry.num_answers)
+                buckets.setdefault(key, array("I")).append(i)
+            else:
+                invalid.append(i)
+        offsets.append(len(records))
+        if sys.byteorder != "little":
+            offsets.byteswap()
+            invalid.byteswap()
+            for bucket in buckets.values():
+                bucket.byteswap()
+
+        meta = marshal.dumps((os.path.abspath(self._board_dir),
+                              {key: bucket.tobytes()
+                               for key, bucket in buckets.items()},
+                              invalid.tobytes()))
+        return (HEADER.pack(MAGIC, VERSION, dir_mtime_ns, len(entries),
+                            len(meta))
+                + meta + offsets.tobytes() + records)
+
+    def update(self, full: bool = False) -> bool:
+        """
+        Bring the catalog up to date with the boards directory
+        and save it. Unless full is True, only the files of
+        invalid entries are checked while the directory's
+        modification time is unchanged (so that a repaired
+        board is picked up). Returns True if any entry changed.
+        """
+        dir_mtime_ns = os.stat(self._board_dir).st_mtime_ns
+        if (not full and dir_mtime_ns == self._dir_mtime_ns
+                and all(self._is_current(self._entry(i)) for i in self._invalid)):
+            return False
+
+        old_entries = {entry.name: entry for entry in self}
+        entries: dict[str, CatalogEntry] = {}
+        changed = False
+        with os.scandir(self._board_dir) as it:
+            for item in it:
+                name = game_name(item.name)
+                if name is None or not item.is_file():
+                    continue
+                st = item.stat()
+                old = old_entries.get(name)
+                if (old is not None and old.mtime_ns == st.st_mtime_ns
+                        and old.size == st.st_size):
+                    entries[name] = old
+                else:
+                    entries[name] = scan_game(item.path, name,
+                                              st.st_mtime_ns, st.st_size)
+                    changed = changed or entries[name] != old
+        changed = changed or entries.keys() != old_entries.keys()
+
+        data = self._pack(dir_mtime_ns, [entries[name] for name in sorted(entries)])
+        self._open(data)
+        self.save()
+        return changed
+
+    def save(self) -> None:
+        """
+        Write the index to disk. Failures are ignored, since
+        the index can always be rebuilt.
+        """
+        tmp = f"{self._index_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._index_path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(self._data)
+            os.replace(tmp, self._index_path)
+        except OSError:
+            pass
+
+    def __len__(self) -> int:
+        """
+        Return the number of game files in the catalog,
+        including invalid ones.
+        """
+        return self._count
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        """
+        Iterate over every entry, ordered by name.
+        """
+        for i in range(self._count):
+            yield self._entry(i)
+
+    def _entry(self, i: int) -> CatalogEntry:
+        """
+        Decode entry i.
+        """
+        start = self._base + self._offsets[i]
+        end = self._base + self._offsets[i + 1]
+        return CatalogEntry(*marshal.loads(self._data[start:end]))
+
+    def _is_current(self, entry: CatalogEntry) -> bool:
+        """
+        Decide whether or not an entry's file still has the
+        size and modification time it had when it was loaded.
+        """
+        try:
+            st = os.stat(self.path(entry))
+        except OSError:
+            return False
+        return st.st_mtime_ns == entry.mtime_ns and st.st_size == entry.size
+
+    def get(self, name: str) -> CatalogEntry | None:
+        """
+        Return the entry for the game with the given name, by
+        binary search. If the game's file has changed since it
+        was loaded, the catalog is brought up to date first.
+        """
+        entry = self._find(name)
+        if entry is not None and not self._is_current(entry):
+            self.update(full=True)
+            entry = self._find(name)
+        return entry
+
+    def _find(self, name: str) -> CatalogEntry | None:
+        """
+        Return the entry for the game with the given name, as
+        it is in the index.
+        """
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            if entry.name < name:
+                lo = mid + 1
+            elif entry.name > name:
+                hi = mid
+            else:
+                return entry
+        return None
+
+    def path(self, entry: CatalogEntry) -> str:
+        """
+        Return the path of an entry's game file.
+        """
+        return os.path.join(self._board_dir, entry.filename)
+
+    def _matching(self, rows: int | None, cols: int | None,
+                  answers: int | None) -> list[array]:
+        """
+        Return the buckets of valid entries with the given
+        number of rows, columns and answers (None matches
+        anything).
+        """
+        return [bucket for (r, c, n), bucket in self._buckets.items()
+                if rows in (None, r) and cols in (None, c)
+                and answers in (None, n)]
+
+    def games(self, rows: int | None = None, cols: int | None = None,
+              answers: int | None = None) -> list[CatalogEntry]:
+        """
+        Return the valid games with the given number of rows,
+        columns and answers (None matches anything), ordered by
+        name.
+        """
+        matching = sorted(i for bucket in self._matching(rows, cols, answers)
+                          for i in bucket)
+        return [self._entry(i) for i in matching]
+
+    def count(self, rows: int | None = None, cols: int | None = None,
+              answers: int | None = None) -> int:
+        """
+        Return the number of valid games matching the filters
+        (see games).
+        """
+        return sum(len(b) for b in self._matching(rows, cols, answers))
+
+    def choose(self, rng: random.Random | None = None, rows: int | None = None,
+               cols: int | None = None,
+               answers: int | None = None) -> CatalogEntry | None:
+        """
+        Pick a valid game at random, optionally filtered as in
+        games. Returns None if no game matches. Takes time
+        proportional to the number of buckets, not games. If
+        the file of the game picked has changed since it was
+        loaded, the catalog is brought up to date and a game is
+        picked again.
+        """
+        entry = self._pick(rng, rows, cols, answers)
+        if entry is not None and not self._is_current(entry):
+            self.update(full=True)
+            entry = self._pick(rng, rows, cols, answers)
+        return entry
+
+    def _pick(self, rng: random.Random | None, rows: int | None,
+              cols: int | None, answers: int | None) -> CatalogEntry | None:
+        """
+        Pick a valid game at random from the index (see choose).
+        """
+        matching = self._matching(rows, cols, answers)
+        total = sum(len(b) for b in matching)
+        if total == 0:
+            return None
+        k = (rng or random).randrange(total)
+        for bucket in matching:
+            if k < len(bucket):
+                return self._entry(bucket[k])
+            k -= len(bucket)
+        raise AssertionError("unreachable")
+
+
+def load_catalog(board_dir: str = BOARD_DIR, index_path: str = INDEX_PATH,
+                 full: bool = False) -> Catalog:
+    """
+    Return the catalog for board_dir, brought up to date.
+    """
+    catalog = Catalog(board_dir, index_path)
+    catalog.update(full)
+    return catalog
+
+
+######################################################################
+
+
+@click.group()
+@click.option("-d", "--dir", "board_dir", default=BOARD_DIR, show_default=True,
+              help="Directory of game files.")
+@click.pass_context
+def main(ctx: click.Context, board_dir: str) -> None:
+    """Board catalog tools."""
+    ctx.obj = board_dir
+
+
+@main.command("list")
+@click.option("-r", "--rows", type=int, help="Only boards with this many rows.")
+@click.option("-c", "--cols", type=int, help="Only boards with this many columns.")
+@click.option("-n", "--answers", type=int, help="Only boards with this many answers.")
+@click.option("--invalid", is_flag=True, help="List invalid game files instead.")
+@click.pass_obj
+def list_command(board_dir: str, rows: int | None, cols: int | None,
+                 answers: int | None, invalid: bool) -> None:
+    """List the games in the catalog."""
+    # Every entry is shown, so every file is checked for changes
+    catalog = load_catalog(board_dir, full=True)
+    if invalid:
+        for entry in catalog:
+            if not entry.is_valid():
+                click.echo(f"{entry.name:<32} {entry.error}")
+        return
+    for entry in catalog.games(rows, cols, answers):
+        lengths = ",".join(str(n) for n in entry.word_lengths)
+        click.echo(f"{entry.name:<32} {entry.num_rows}x{entry.num_cols} "
+                   f"{entry.num_answers:3} answers  {entry.theme}  [{lengths}]")
+
+
+@main.command("update")
+@click.option("--full", is_flag=True,
+              help="Check every file, even if the directory is unchanged.")
+@click.pass_obj
+def update_command(board_dir: str, full: bool) -> None:
+    """Bring the catalog up to date."""
+    catalog = load_catalog(board_dir, full=full)
+    valid = catalog.count()
+    click.echo(f"{len(catalog)} game files, {valid} valid, "
+               f"{len(catalog) - valid} invalid")
+
+
+@main.command("random")
+@click.option("-r", "--rows", type=int, help="Only boards with this many rows.")
+@click.option("-c", "--cols", type=int, help="Only boards with this many columns.")
+@click.option("-n", "--answers", type=int, help="Only boards with this many answers.")
+@click.pass_obj
+def random_command(board_dir: str, rows: int | None, cols: int | None,
+                   answers: int | None) -> None:
+    """Print the path of a random game."""
+    catalog = load_catalog(board_dir)
+    entry = catalog.choose(rows=rows, cols=cols, answers=answers)
+    if entry is None:
+        raise click.ClickException("No matching games")
+    click.echo(catalog.path(entry))
+
+
+if __name__ == "__main__":
+    main()
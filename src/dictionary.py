@@ -0,0 +1,255 @@
+"""
+Shared dictionary for Strands games.
+
+The word list in assets/web2.txt has over 200k entries, so
+it is loaded at most once per process and the same object
+is handed to every StrandsGame. The shared dictionary is
+created lazily on first use, and a prebuilt dictionary can
+be injected instead (for example, by a server that already
+has the words in memory, or by tests).
+
+The word list can also be compiled ahead of time into a
+sorted binary file (see compile_dictionary), which is then
+memory-mapped rather than parsed:
+
+    python3 src/dictionary.py compile
+
+The compiled format is a header (magic, version, word count),
+a table of count + 1 little-endian uint32 offsets, and then
+each word as a one-byte length followed by its UTF-8 bytes,
+in sorted byte order.
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Container, Iterable
+
+import click
+
+PROJECT_ROOT: str = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), os.pardir)
+)
+DICT_PATH: str = os.path.join(PROJECT_ROOT, "assets", "web2.txt")
+COMPILED_PATH: str = os.path.join(PROJECT_ROOT, "assets", "web2.dict")
+
+MAGIC: bytes = b"STRD"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sII")
+
+_lock: threading.Lock = threading.Lock()
+_shared: Container[str] | None = None
+
+
+def load_words(path: str = DICT_PATH) -> frozenset[str]:
+    """
+    Read a word list (one word per line) into a new set of
+    lowercase words. Blank lines are ignored.
+    """
+    with open(path, "r") as f:
+        return frozenset(w.strip().lower() for w in f if w.strip())
+
+
+######################################################################
+
+
+def compile_words(words: Iterable[str], dest: str) -> int:
+    """
+    Write the given words to dest in the compiled format,
+    lowercased, deduplicated and sorted. Returns the number
+    of words written.
+
+    Raises ValueError if a word is longer than 255 bytes.
+    """
+    keys: list[bytes] = sorted({w.lower().encode() for w in words if w})
+
+    offsets: array = array("I")
+    data: bytearray = bytearray()
+    for key in keys:
+        if len(key) > 255:
+            raise ValueError(f"Word too long to compile: {key!r}")
+        offsets.append(len(data))
+        data.append(len(key))
+        data += key
+    offsets.append(len(data))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    tmp = dest + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(keys)))
+        f.write(offsets.tobytes())
+        f.write(data)
+    os.replace(tmp, dest)
+    return len(keys)
+
+
+def compile_dictionary(src: str = DICT_PATH, dest: str = COMPILED_PATH) -> int:
+    """
+    Compile the word list at src into the binary file at
+    dest. Returns the number of words written.
+    """
+    with open(src, "r") as f:
+        return compile_words((w.strip() for w in f), dest)
+
+
+def is_fresh(src: str = DICT_PATH, dest: str = COMPILED_PATH) -> bool:
+    """
+    Decide whether the compiled file exists and is at
+    least as new as the word list it was built from.
+    """
+    try:
+        return os.path.getmtime(dest) >= os.path.getmtime(src)
+    except OSError:
+        return False
+
+
+class MappedDictionary:
+    """
+    A read-only dictionary backed by a memory-mapped
+    compiled word list. Membership tests binary-search the
+    offset table and compare raw bytes, so opening the file
+    costs almost nothing and its pages are shared by every
+    process that maps it.
+    """
+
+    _mm: mmap.mmap
+    _offsets: memoryview | array
+    _count: int
+    _base: int
+
+    def __init__(self, path: str = COMPILED_PATH) -> None:
+        """
+        Constructor
+
+        Raises ValueError if the file is not a compiled
+        dictionary.
+        """
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_ok = len(self._mm) >= HEADER.size
+        if header_ok:
+            magic, version, count = HEADER.unpack_from(self._mm)
+            header_ok = magic == MAGIC and version == VERSION
+        if not header_ok:
+            self._mm.close()
+            raise ValueError(f"{path} is not a compiled dictionary")
+
+        table_end = HEADER.size + 4 * (count + 1)
+        if sys.byteorder == "little":
+            self._offsets = memoryview(self._mm)[HEADER.size:table_end].cast("I")
+        else:
+            swapped = array("I", self._mm[HEADER.size:table_end])
+            swapped.byteswap()
+            self._offsets = swapped
+        self._count = count
+        self._base = table_end
+
+    def __len__(self) -> int:
+        """
+        Return the number of words in the dictionary.
+        """
+        return self._count
+
+    def __contains__(self, word: object) -> bool:
+        """
+        Decide whether or not a (lowercase) word is in the
+        dictionary, by binary search over the sorted words.
+        """
+        if not isinstance(word, str):
+            return False
+        key = word.encode()
+        mm = self._mm
+        offsets = self._offsets
+        base = self._base
+
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = base + offsets[mid]
+            entry = mm[start + 1:start + 1 + mm[start]]
+            if entry < key:
+                lo = mid + 1
+            elif entry > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def close(self) -> None:
+        """
+        Unmap the file. The dictionary cannot be used
+        afterwards.
+        """
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._mm.close()
+
+
+######################################################################
+
+
+def get_dictionary() -> Container[str]:
+    """
+    Return the process-wide dictionary, loading it the first
+    time it is needed. The compiled file at COMPILED_PATH is
+    memory-mapped if it is up to date; otherwise DICT_PATH is
+    read into a set. Safe to call from multiple threads; the
+    dictionary is only loaded once.
+    """
+    global _shared
+    words = _shared
+    if words is not None:
+        return words
+
+    with _lock:
+        if _shared is None:
+            if is_fresh():
+                _shared = MappedDictionary()
+            else:
+                _shared = load_words()
+        return _shared
+
+
+def set_dictionary(words: Container[str]) -> None:
+    """
+    Replace the process-wide dictionary with a prebuilt one.
+    Any container of lowercase words that supports "in" can
+    be used (for example, the result of load_words).
+    """
+    global _shared
+    with _lock:
+        _shared = words
+
+
+def reset_dictionary() -> None:
+    """
+    Forget the process-wide dictionary, so that the next call
+    to get_dictionary loads it again.
+    """
+    global _shared
+    with _lock:
+        _shared = None
+
+
+@click.group()
+def main() -> None:
+    """Dictionary tools."""
+
+
+@main.command("compile")
+@click.option("--src", default=DICT_PATH, show_default=True,
+              help="Word list to compile.")
+@click.option("--dest", default=COMPILED_PATH, show_default=True,
+              help="Where to write the compiled dictionary.")
+def compile_command(src: str, dest: str) -> None:
+    """Compile a word list for memory-mapped lookup."""
+    count = compile_dictionary(src, dest)
+    click.echo(f"Wrote {count} words to {dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Streaming parser for Strands game files.
+
+parse_game reads a game file one line at a time, from any
+iterable of lines (an open file, a list of lines, lines
+received over a socket, ...), in a single pass. It checks the
+layout of the file and the syntax of each line, and returns a
+GameSpec describing the theme, board and answers. Errors are
+raised as GameFileError, with the line and column they were
+found at.
+
+Whether the answers actually fit the board (start on it, stay
+on it, spell their words, do not fold and cover every cell) is
+checked by StrandsGame, which builds the game from the spec.
+
+The layout of a game file is described in the StrandsGame
+constructor's docstring. In short: theme lines, a blank line,
+board rows of space-separated letters, a blank line, then one
+"WORD ROW COL STEP ..." line per answer. Blank lines among the
+answers are ignored, and the first of them starting with
+"http://" or "https://" (the source of the game) ends the file.
+A theme, board row or answer word that merely starts with "http"
+is read like any other.
+"""
+import re
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from base import Step
+
+TOKEN: re.Pattern[str] = re.compile(r"\S+")
+SOURCE: re.Pattern[str] = re.compile(r"https?://", re.IGNORECASE)
+
+# Step for each (lowercase) step token, e.g. "nw" -> Step.NW
+STEP_TOKENS: dict[str, Step] = {step.value: step for step in Step}
+
+# Sections of a game file, in order
+THEME: int = 0
+BOARD: int = 1
+ANSWERS: int = 2
+
+
+class GameFileError(ValueError):
+    """
+    Raised when a game file is invalid. lineno and col are the
+    (1-based) line and column the problem was found at, or
+    None if it is not specific to one line or column.
+    """
+
+    lineno: int | None
+    col: int | None
+
+    def __init__(self, message: str, lineno: int | None = None,
+                 col: int | None = None) -> None:
+        """
+        Constructor
+        """
+        super().__init__(message)
+        self.lineno = lineno
+        self.col = col
+
+
+class AnswerSpec(NamedTuple):
+    """
+    One answer line: the (lowercase) word, its 0-based
+    starting row and column, and its steps. lineno and line
+    are the line's number and text, for error messages (see
+    token_col).
+    """
+    word: str
+    row: int
+    col: int
+    steps: tuple[Step, ...]
+    lineno: int
+    line: str
+
+
+class GameSpec(NamedTuple):
+    """
+    A parsed game file: the theme, the board as one string of
+    lowercase letters per row, the answers, and the source
+    line after them ("" if there is none).
+    """
+    theme: str
+    board: tuple[str, ...]
+    answers: tuple[AnswerSpec, ...]
+    url: str
+
+
+def token_col(line: str, index: int) -> int:
+    """
+    Return the 1-based column at which token number index
+    (counting from 0) of line starts.
+    """
+    for i, match in enumerate(TOKEN.finditer(line)):
+        if i == index:
+            return match.start() + 1
+    return len(line) + 1
+
+
+def parse_board_row(line: str, lineno: int, width: int | None) -> str:
+    """
+    Parse a board row into a string of lowercase letters. If
+    width is not None, the row must have that many letters.
+    """
+    tokens = line.split()
+    if width is not None and len(tokens) != width:
+        raise GameFileError("Invalid Strands Board (not rectangular)", lineno,
+                            token_col(line, min(len(tokens), width)))
+    row = "".join(tokens).lower()
+    if len(row) != len(tokens) or not row.isascii() or not row.isalpha():
+        for i, token in enumerate(tokens):
+            letter = token.lower()
+            if not (len(letter) == 1 and "a" <= letter <= "z"):
+                raise GameFileError(f"Invalid letter {letter!r} on board",
+                                    lineno, token_col(line, i))
+    return row
+
+
+def parse_answer(line: str, lineno: int) -> AnswerSpec:
+    """
+    Parse an answer line, "WORD ROW COL STEP ...", with ROW
+    and COL counted from 1.
+    """
+    tokens = line.split()
+    word = tokens[0].lower()
+    if len(word) < 3:
+        raise GameFileError(f"The word {word} is an answer with less than 3 letters",
+                            lineno, token_col(line, 0))
+    if len(tokens) < 3:
+        raise GameFileError(f"Invalid answer line for {word} (no starting position)",
+                            lineno, len(line.rstrip()) + 1)
+
+    coords: list[int] = []
+    for i in (1, 2):
+        try:
+            coords.append(int(tokens[i]) - 1)
+        except ValueError:
+            raise GameFileError(f"Invalid answer line for {word} "
+                                f"(bad position {tokens[i]!r})",
+                                lineno, token_col(line, i)) from None
+
+    steps: list[Step] = []
+    for i in range(3, len(tokens)):
+        step = STEP_TOKENS.get(tokens[i].lower())
+        if step is None:
+            raise GameFileError(f"Invalid answer line for {word} "
+                                f"(bad step {tokens[i]!r})",
+                                lineno, token_col(line, i))
+        steps.append(step)
+
+    return AnswerSpec(word, coords[0], coords[1], tuple(steps), lineno, line)
+
+
+def parse_game(lines: Iterable[str], lowercase_theme: bool = False) -> GameSpec:
+    """
+    Parse the lines of a game file (with or without their
+    line endings) in one pass. The theme is lowercased if
+    lowercase_theme is True. Lines after the source line
+    (the first one among the answers starting with "http://"
+    or "https://") are not read.
+
+    Raises GameFileError if the file is not laid out as a
+    game file, or a line cannot be parsed.
+    """
+    section = THEME
+    theme: str | None = None
+    board: list[str] = []
+    width: int | None = None
+    answers: list[AnswerSpec] = []
+    url = ""
+    lineno, line = 0, ""
+
+    for lineno, raw in enumerate(lines, 1):
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if section == ANSWERS:
+            if SOURCE.match(stripped):
+                url = stripped
+                break
+            if stripped:
+                answers.append(parse_answer(line, lineno))
+        elif not stripped:
+            if section == THEME and theme is None:
+                raise GameFileError("No theme provided", lineno)
+            if section == BOARD and not board:
+                raise GameFileError("Board must have at least one row and column",
+                                    lineno)
+            section += 1
+        elif section == THEME:
+            if theme is None:
+                theme = stripped.lower() if lowercase_theme else stripped
+        else:
+            row = parse_board_row(line, lineno, width)
+            width = len(row)
+            board.append(row)
+
+    # Errors found at the end of the file point at the end of
+    # its last line
+    end_lineno = lineno or None
+    end_col = len(line) + 1 if lineno else None
+    if section != ANSWERS or theme is None:
+        raise GameFileError("Invalid game file (it ends before the answers)",
+                            end_lineno, end_col)
+    if not answers:
+        raise GameFileError("No answers provided", end_lineno, end_col)
+    return GameSpec(theme, tuple(board), tuple(answers), url)
@@ -0,0 +1,347 @@
+"""
+Generator for new Strands boards.
+
+Given a theme and a list of theme words whose lengths add up to
+the number of cells, generate_board lays the words out as strands
+that exactly cover a board of the requested size, then fills in
+their letters:
+
+    python3 src/generator.py -r 4 -c 4 --seed 7 "Pets" cats dogs fish bird
+    python3 src/generator.py -r 8 -c 6 -o boards/new.txt "Theme" WORD ...
+
+The layout is found by backtracking over the board's cells. At each
+step the empty cell with the fewest empty neighbours (the most
+constrained cell) is covered next, by a strand starting there of
+one of the word lengths still to place. Each strand is grown
+towards the most constrained of its empty neighbours first, so
+that it hugs the edge of the empty region rather than cutting it
+in two. Strands never cross
+themselves or each other, since every diagonal step claims its
+2x2 square (see geometry.py). After each strand is placed, every
+region of empty cells left must have a size that some of the
+remaining words add up to, or the layout is abandoned early.
+
+Only word lengths matter for the layout, so words of the same
+length are interchangeable while searching, and are assigned to
+strands (in a random direction) once the board is covered. The
+search is random but seedable, and gives up on a layout after a
+budget of placements, restarting with a new random order.
+
+Generated boards are checked by loading them with StrandsGame.
+Whether the layout is the only one (see solver.py) is not checked.
+"""
+import random
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import NamedTuple
+
+from gamefile import GameSpec, parse_game
+from geometry import edge_key, find_conflicts
+from solver import Placement
+from strands import DELTA_STEPS, StrandsGame, neighbour_table
+
+import click
+
+DEFAULT_BUDGET: int = 2_000
+DEFAULT_ATTEMPTS: int = 50
+
+
+class GeneratedBoard(NamedTuple):
+    """
+    A generated game: the theme, the board as one string of
+    lowercase letters per row, and the answers.
+    """
+    theme: str
+    board: tuple[str, ...]
+    answers: tuple[Placement, ...]
+
+    def lines(self) -> list[str]:
+        """
+        Return the lines of a game file for this board, laid
+        out like the shipped boards.
+        """
+        num_cols = len(self.board[0])
+        width = max(len(p.word) for p in self.answers) + 2
+        lines = [self.theme, ""]
+        lines += [" ".join(row.upper()) for row in self.board]
+        lines.append("")
+        for word, cells in self.answers:
+            r, c = divmod(cells[0], num_cols)
+            steps = []
+            for a, b in zip(cells, cells[1:]):
+                delta = (b // num_cols - a // num_cols, b % num_cols - a % num_cols)
+                steps.append(DELTA_STEPS[delta].value)
+            lines.append(f"{word:<{width}}{r + 1} {c + 1}  {' '.join(steps)}")
+        return lines
+
+    def spec(self) -> GameSpec:
+        """
+        Return the parsed game file for this board.
+        """
+        return parse_game(self.lines())
+
+
+class Layout:
+    """
+    Search for a layout of strands of the given lengths that
+    covers a rows x cols board (see the module docstring).
+    """
+
+    _rows: int
+    _cols: int
+    _neighbours: array
+    _owner: bytearray
+    _diagonals: set[int]
+    _remaining: dict[int, int]
+    _strands: list[list[int]]
+    _rng: random.Random
+    _order: list[int]
+    nodes: int
+    budget: int
+
+    def __init__(self, rows: int, cols: int, lengths: Sequence[int],
+                 rng: random.Random, budget: int = DEFAULT_BUDGET) -> None:
+        """
+        Constructor
+        """
+        self._rows = rows
+        self._cols = cols
+        self._neighbours = neighbour_table(rows, cols)
+        self._owner = bytearray(rows * cols)
+        self._diagonals = set()
+        self._remaining = {}
+        for length in lengths:
+            self._remaining[length] = self._remaining.get(length, 0) + 1
+        self._strands = []
+        self._rng = rng
+        # Ties between equally constrained cells are broken in
+        # a random (but fixed) order
+        self._order = list(range(rows * cols))
+        rng.shuffle(self._order)
+        self.nodes = 0
+        self.budget = budget
+
+    def solve(self) -> list[list[int]] | None:
+        """
+        Return the strands of a layout (as lists of cell IDs),
+        or None if none was found within the budget.
+        """
+        if sum(k * n for k, n in self._remaining.items()) != len(self._owner):
+            return None
+        if self._search():
+            return [list(s) for s in self._strands]
+        return None
+
+    def _free_neighbours(self, cell: int) -> list[int]:
+        """
+        Return the empty neighbours of a cell.
+        """
+        owner = self._owner
+        return [n for n in self._neighbours[8 * cell:8 * cell + 8]
+                if n >= 0 and not owner[n]]
+
+    def _most_constrained(self) -> int:
+        """
+        Return the empty cell with the fewest empty neighbours,
+        or -1 if the board is covered.
+        """
+        owner = self._owner
+        best, fewest = -1, 9
+        for cell in self._order:
+            if not owner[cell]:
+                free = len(self._free_neighbours(cell))
+                if free < fewest:
+                    best, fewest = cell, free
+                    if free <= 1:
+                        break
+        return best
+
+    def _is_diagonal(self, a: int, b: int) -> bool:
+        """
+        Decide whether or not the step from a to b is diagonal.
+        """
+        cols = self._cols
+        return a // cols != b // cols and a % cols != b % cols
+
+    def _paths(self, start: int, length: int) -> Iterator[list[int]]:
+        """
+        Yield paths of empty cells of the given length from
+        start, in a random order, claiming the squares of their
+        diagonal steps while each path is being yielded.
+        """
+        owner, diagonals, cols = self._owner, self._diagonals, self._cols
+        path = [start]
+        owner[start] = 1
+
+        def extend() -> Iterator[list[int]]:
+            if len(path) == length:
+                yield path
+                return
+            cell = path[-1]
+            # Try the most constrained neighbours first, so that
+            # strands hug the edges of the empty region
+            free = self._free_neighbours(cell)
+            self._rng.shuffle(free)
+            free.sort(key=lambda n: len(self._free_neighbours(n)))
+            for n in free:
+                key = -1
+                if self._is_diagonal(cell, n):
+                    key = edge_key(cell, n, cols)
+                    if key in diagonals:
+                        continue
+                    diagonals.add(key)
+                path.append(n)
+                owner[n] = 1
+                yield from extend()
+                owner[n] = 0
+                path.pop()
+                if key >= 0:
+                    diagonals.discard(key)
+
+        yield from extend()
+        owner[start] = 0
+
+    def _fits(self) -> bool:
+        """
+        Decide whether or not every region of empty cells could
+        still be covered: its size must be a sum of some of the
+        remaining lengths.
+        """
+        sums = 1
+        for length, count in self._remaining.items():
+            for _ in range(count):
+                sums |= sums << length
+        owner = self._owner
+        seen = bytearray(owner)
+        for cell in range(len(owner)):
+            if seen[cell]:
+                continue
+            seen[cell] = 1
+            stack, size = [cell], 0
+            while stack:
+                size += 1
+                for n in self._free_neighbours(stack.pop()):
+                    if not seen[n]:
+                        seen[n] = 1
+                        stack.append(n)
+            if not sums >> size & 1:
+                return False
+        return True
+
+    def _search(self) -> bool:
+        """
+        Cover the rest of the board, returning whether or not
+        a layout was found.
+        """
+        start = self._most_constrained()
+        if start < 0:
+            return True
+        lengths = [k for k, n in self._remaining.items() if n]
+        self._rng.shuffle(lengths)
+        for length in lengths:
+            self._remaining[length] -= 1
+            for path in self._paths(start, length):
+                self.nodes += 1
+                if self.nodes > self.budget:
+                    break
+                self._strands.append(list(path))
+                if self._fits() and self._search():
+                    return True
+                self._strands.pop()
+            self._remaining[length] += 1
+            if self.nodes > self.budget:
+                break
+        return False
+
+
+def generate_board(theme: str, words: Sequence[str], rows: int, cols: int,
+                   seed: int | None = None, attempts: int = DEFAULT_ATTEMPTS,
+                   budget: int = DEFAULT_BUDGET) -> GeneratedBoard | None:
+    """
+    Generate a rows x cols board for the theme whose answers
+    are words. Tries up to attempts random layouts, each with
+    a budget of strand placements, and returns None if none
+    of them cover the board.
+
+    Raises ValueError if the words cannot cover the board.
+    """
+    words = [w.lower() for w in words]
+    for word in words:
+        if len(word) < 3 or not (word.isascii() and word.isalpha()):
+            raise ValueError(f"Invalid theme word {word!r}")
+    if sum(map(len, words)) != rows * cols:
+        raise ValueError(f"Theme words have {sum(map(len, words))} letters, "
+                         f"but the board has {rows * cols} cells")
+
+    rng = random.Random(seed)
+    for _ in range(attempts):
+        strands = Layout(rows, cols, [len(w) for w in words], rng, budget).solve()
+        if strands is not None and find_conflicts(strands, cols).is_clear():
+            return fill_board(theme, words, strands, cols, rng)
+    return None
+
+
+def fill_board(theme: str, words: Sequence[str], strands: list[list[int]],
+               cols: int, rng: random.Random) -> GeneratedBoard:
+    """
+    Assign the words to strands of their lengths, each in a
+    random direction, and spell them out on the board.
+    """
+    by_length: dict[int, list[list[int]]] = {}
+    for strand in strands:
+        by_length.setdefault(len(strand), []).append(strand)
+    for group in by_length.values():
+        rng.shuffle(group)
+
+    letters = bytearray(sum(map(len, strands)))
+    answers = []
+    for word in words:
+        cells = by_length[len(word)].pop()
+        if rng.random() < 0.5:
+            cells.reverse()
+        for cell, letter in zip(cells, word.encode()):
+            letters[cell] = letter
+        answers.append(Placement(word, tuple(cells)))
+
+    text = letters.decode()
+    board = tuple(text[i:i + cols] for i in range(0, len(text), cols))
+    return GeneratedBoard(theme, board, tuple(answers))
+
+
+######################################################################
+
+
+@click.command()
+@click.argument("theme")
+@click.argument("words", nargs=-1, required=True)
+@click.option("-r", "--rows", default=8, show_default=True, help="Number of rows.")
+@click.option("-c", "--cols", default=6, show_default=True, help="Number of columns.")
+@click.option("-s", "--seed", type=int, default=None, help="Random seed.")
+@click.option("-o", "--output", default=None,
+              help="Write the game file here instead of printing it.")
+@click.option("--attempts", default=DEFAULT_ATTEMPTS, show_default=True,
+              help="Number of random layouts to try.")
+def main(theme: str, words: tuple[str, ...], rows: int, cols: int,
+         seed: int | None, output: str | None, attempts: int) -> None:
+    """Generate a Strands board for THEME from its theme WORDS."""
+    try:
+        board = generate_board(theme, words, rows, cols, seed, attempts)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from None
+    if board is None:
+        click.echo("No layout found; try another seed or more attempts", err=True)
+        sys.exit(1)
+
+    # Check the board loads before writing it out
+    StrandsGame(board.spec(), dictionary=frozenset())
+    text = "\n".join(board.lines()) + "\n"
+    if output is None:
+        click.echo(text, nl=False)
+    else:
+        with open(output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
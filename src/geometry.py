@@ -0,0 +1,103 @@
+"""
+Vectorised fold and crossing detection for strands.
+
+Every edge of a strand (a step between two neighbouring cells)
+is encoded as an integer key: the sum of the two cells' rows
+and the sum of their columns, i.e. twice the edge's midpoint,
+packed into one number. Two edges have the same key exactly
+when they are the same pair of cells or when they are the two
+diagonals of the same 2x2 square, which is where strands cross.
+
+So, given all the strands on a board, one sort of their edge
+keys finds every pair of edges that collide:
+
+  - within one strand, that is a fold (see Strand.is_folded),
+  - between two strands, the strands cross (or share an edge).
+
+The strands are given as sequences of cell IDs (see
+Board.strand_cells), and all the work is done with NumPy arrays,
+so checking a whole layout costs a handful of array operations
+whatever its size.
+"""
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Conflicts(NamedTuple):
+    """
+    The result of find_conflicts: for each strand, whether or
+    not it is folded, and the (sorted, distinct) pairs of
+    strands i < j that cross.
+    """
+    folded: np.ndarray
+    crossings: list[tuple[int, int]]
+
+    def is_clear(self) -> bool:
+        """
+        Decide whether or not no strand is folded and no two
+        strands cross.
+        """
+        return not self.crossings and not self.folded.any()
+
+
+def edge_key(a: int, b: int, num_cols: int) -> int:
+    """
+    Return the key of the edge between cells a and b (see the
+    module docstring), for checking one edge at a time.
+    """
+    return ((a // num_cols + b // num_cols) * (2 * num_cols - 1)
+            + a % num_cols + b % num_cols)
+
+
+def edge_keys(cells: np.ndarray, num_cols: int) -> np.ndarray:
+    """
+    Return the key of each edge of a strand, given its cell
+    IDs in order (so one key fewer than cells).
+    """
+    rows, cols = np.divmod(cells, num_cols)
+    return ((rows[:-1] + rows[1:]) * (2 * num_cols - 1)
+            + (cols[:-1] + cols[1:]))
+
+
+def find_conflicts(strands: Sequence[Sequence[int]], num_cols: int) -> Conflicts:
+    """
+    Find the folded strands and the crossing pairs of strands
+    among strands (each a sequence of cell IDs) on a board
+    with num_cols columns.
+    """
+    num_strands = len(strands)
+    folded = np.zeros(num_strands, dtype=bool)
+    lengths = np.fromiter((len(s) for s in strands), dtype=np.int64,
+                          count=num_strands)
+    if num_strands == 0 or lengths.sum() == 0:
+        return Conflicts(folded, [])
+
+    cells = np.fromiter((cell for s in strands for cell in s), dtype=np.int64,
+                        count=int(lengths.sum()))
+    owner = np.repeat(np.arange(num_strands), lengths)
+
+    # Keys of consecutive cells, keeping only pairs that are
+    # both in the same strand
+    keys = edge_keys(cells, num_cols)
+    same_strand = owner[:-1] == owner[1:]
+    keys = keys[same_strand]
+    edge_owner = owner[:-1][same_strand]
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    collide = sorted_keys[1:] == sorted_keys[:-1]
+    first = edge_owner[order[:-1][collide]]
+    second = edge_owner[order[1:][collide]]
+
+    folds = first == second
+    folded[first[folds]] = True
+
+    # Each crossing pair i < j as one number, i * num_strands + j
+    first, second = first[~folds], second[~folds]
+    pairs = np.unique(np.minimum(first, second) * num_strands
+                      + np.maximum(first, second))
+    lower, upper = np.divmod(pairs, num_strands)
+    crossings = list(zip(lower.tolist(), upper.tolist()))
+    return Conflicts(folded, crossings)
@@ -2,8 +2,9 @@
 GUI for Strands
 """
 
-import click, random, os, pygame, sys, math
-from strands import Pos, Strand, StrandsGame
+import click, pygame, sys, math
+from catalog import Catalog, CatalogEntry, load_catalog
+from strands import Board, CellPath, Pos, Strand, StrandsGame
 from base import Step, PosBase, StrandBase, BoardBase, StrandsGameBase
 from ui import ArtGUIStub, ArtGUIBase
 from art_gui import ArtGUI9Slice, ArtGUICat3, ArtGUICat4
@@ -75,7 +76,7 @@ def refresh_board(surface: pygame.surface.Surface, strands: StrandsGameBase,
 
     # Creates a set of positions for the found words and adds the lines between
     # the positions
-    highlighted_positions: set[tuple[int, int]] = set()
+    highlighted_positions: set[PosBase] = set()
     for word in strands.found_strands():
         positions: list[PosBase] = word.positions()
         if len(positions) >= 2:
@@ -88,8 +89,7 @@ def refresh_board(surface: pygame.surface.Surface, strands: StrandsGameBase,
                 y2: int = FRAME + pos_2.r * CELL_SIZE + CELL_SIZE // 2
                 pygame.draw.line(surface, COLORS["LIGHTBLUE"], (x1, y1), 
                     (x2, y2), width=4)
-        for pos in positions:
-            highlighted_positions.add((pos.r, pos.c))
+        highlighted_positions.update(positions)
 
     # Displays the pending selection with the color green
     for pos in pending:
@@ -121,8 +121,8 @@ def refresh_board(surface: pygame.surface.Surface, strands: StrandsGameBase,
         _, hint_strand = strands.answers()[index]
         hint_positions: list[PosBase] = hint_strand.positions()
 
-        for i, pos in enumerate(hint_positions):
-            center = (FRAME + pos.c * CELL_SIZE + CELL_SIZE // 2, FRAME + pos.r * CELL_SIZE + 
+        for i, hint_pos in enumerate(hint_positions):
+            center = (FRAME + hint_pos.c * CELL_SIZE + CELL_SIZE // 2, FRAME + hint_pos.r * CELL_SIZE + 
                 CELL_SIZE // 2)
             radius = CELL_SIZE // 4
             if ends and (i == 0 or i == len(hint_positions) - 1):
@@ -138,7 +138,7 @@ def refresh_board(surface: pygame.surface.Surface, strands: StrandsGameBase,
             position: PosBase = Pos(row, col)
             letter: str = board.get_letter(position)
 
-            if (row, col) in highlighted_positions:
+            if position in highlighted_positions:
                 center = (FRAME + col * CELL_SIZE + CELL_SIZE // 2, 
                     FRAME + row * CELL_SIZE + CELL_SIZE // 2)
                 radius = CELL_SIZE // 3
@@ -174,6 +174,31 @@ def refresh_board(surface: pygame.surface.Surface, strands: StrandsGameBase,
     pygame.draw.rect(surface, COLORS["WHITE"], rect2.inflate(20, 10))
     surface.blit(surf2, rect2)
 
+def answer_paths(game: StrandsGame) -> dict[CellPath, StrandBase]:
+    """
+    Maps every path on the board that spells a theme word to
+    the (first) answer for that word
+    """
+    board: Board = game.board()
+    paths: dict[CellPath, StrandBase] = {}
+    for word, answer in game.answers():
+        for path in board.word_paths(word):
+            paths.setdefault(path, answer)
+    return paths
+
+def submit_selection(game: StrandsGame, selected: list[Pos],
+    paths: dict[CellPath, StrandBase]) -> None:
+    """
+    Submits the selected cells, as the answer for the theme
+    word they spell if they spell one
+    """
+    start: Pos = selected[0]
+    steps: list[Step] = [selected[i].step_to(selected[i + 1])
+        for i in range(len(selected) - 1)]
+    strand: Strand = Strand(start, steps)
+    path: CellPath = game.board().strand_cells(strand)
+    game.submit_strand(paths.get(path, strand))
+
 def run_game(filename: str, art: ArtGUIBase, show: bool = False, hint_threshold: int = 3) -> None:
     """
     Plays a game of Strands on a pygame window
@@ -182,12 +207,13 @@ def run_game(filename: str, art: ArtGUIBase, show: bool = False, hint_threshold:
     pygame.display.set_caption("Strands")
     currently_selected: list[Pos] = []
 
-    game: StrandsGameBase = StrandsGame(filename, hint_threshold = hint_threshold)
+    game: StrandsGame = StrandsGame(filename, hint_threshold = hint_threshold,
+                                    cache=True, trusted=True)
     if show:
         strand: StrandBase
         for _, strand in game.answers():
             game.submit_strand(strand)
-    board: BoardBase = game.board()
+    board: Board = game.board()
     rows: int = board.num_rows()
     cols: int = board.num_cols()
     FRAME: int = art.frame_width + 15
@@ -199,7 +225,7 @@ def run_game(filename: str, art: ArtGUIBase, show: bool = False, hint_threshold:
     show_title_screen(surface, surface_width, surface_height)
 
     clock: pygame.time.Clock = pygame.time.Clock()
-    answers: list[tuple[str, StrandBase]] = game.answers()
+    paths: dict[CellPath, StrandBase] = answer_paths(game)
 
     mouse_down: bool = False
     mouse_moved: bool = False
@@ -233,32 +259,17 @@ def run_game(filename: str, art: ArtGUIBase, show: bool = False, hint_threshold:
                 x, y = event.pos
                 col: int = (x - FRAME) // CELL_SIZE
                 row: int = (y - FRAME) // CELL_SIZE
-                cell_pos = Pos(row, col)
 
                 if 0 <= row < rows and 0 <= col < cols:
+                    cell_pos: Pos = board.pos(row, col)
                     if not currently_selected:
                         currently_selected.append(cell_pos)
                     else:
                         last_pos: Pos = currently_selected[-1]
                         if cell_pos == last_pos:
                             if len(currently_selected) >= 2:
-                                start: Pos = currently_selected[0]
-                                steps: list[Step] = [
-                                    currently_selected[i].step_to(
-                                    currently_selected[i + 1]) for i in 
-                                    range(len(currently_selected) - 1)]
-                                strand = Strand(start, steps)
-
-                                match = False
-                                for word, answer_strand in answers:
-                                    if board.evaluate_strand(strand) == word:
-                                        game.submit_strand(answer_strand)
-                                        match = True
-                                        break
-
-                                if not match:
-                                    game.submit_strand(strand)
-
+                                submit_selection(game, currently_selected,
+                                    paths)
                                 currently_selected.clear()
 
                         elif cell_pos in currently_selected:
@@ -277,23 +288,7 @@ def run_game(filename: str, art: ArtGUIBase, show: bool = False, hint_threshold:
                     mouse_down = False
 
                     if len(currently_selected) >= 2 and mouse_moved:
-                        start = currently_selected[0]
-                        steps = [
-                            currently_selected[i].step_to(
-                            currently_selected[i + 1]) for i in 
-                            range(len(currently_selected) - 1)]
-                        strand = Strand(start, steps)
-
-                        match = False
-                        for word, answer_strand in answers:
-                            if board.evaluate_strand(strand) == word:
-                                game.submit_strand(answer_strand)
-                                match = True
-                                break
-
-                        if not match:
-                            game.submit_strand(strand)
-
+                        submit_selection(game, currently_selected, paths)
                         currently_selected.clear()
 
                     mouse_moved = False
@@ -302,9 +297,9 @@ def run_game(filename: str, art: ArtGUIBase, show: bool = False, hint_threshold:
                 x, y = event.pos
                 col = (x - FRAME) // CELL_SIZE
                 row = (y - FRAME) // CELL_SIZE
-                cell_pos = Pos(row, col)
 
                 if 0 <= row < rows and 0 <= col < cols:
+                    cell_pos = board.pos(row, col)
                     center_x = FRAME + col * CELL_SIZE + CELL_SIZE // 2
                     center_y = FRAME + row * CELL_SIZE + CELL_SIZE // 2
                     dist = math.hypot(x - center_x, y - center_y)
@@ -347,11 +342,12 @@ def main(show: bool, game: str | None, hint: int, art: str) -> None:
     if game:
         filename: str = f"boards/{game}.txt"
     else:
-        txt_files: list[str] = [f for f in os.listdir("boards") if f.endswith(".txt")]
-        if not txt_files:
+        catalog: Catalog = load_catalog()
+        entry: CatalogEntry | None = catalog.choose()
+        if entry is None:
             print("Can't find game file")
             sys.exit(1)
-        filename = f"boards/{random.choice(txt_files)}"
+        filename = catalog.path(entry)
     
     art_frame: ArtGUIBase
     if art == "stub":
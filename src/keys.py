@@ -0,0 +1,214 @@
+"""
+Keyboard input for the TUI.
+
+Keys are read with the terminal in raw mode, so that each key
+press arrives as soon as it is typed, without echo. RawInput puts
+the terminal into raw mode once, for as long as it is in use, and
+puts it back as it was when it is done with, including when the
+program is stopped by SIGTERM or SIGHUP.
+
+Each read waits (with select) until input is available and then
+takes all of it, so a burst of keys, such as a held key repeating
+or a paste, is handled as one batch instead of one key at a time.
+KeyDecoder splits the bytes read into keys. Keys are given the
+way the TUI has always used them: printable characters and escape
+sequences (such as "\\033[A" for the up arrow) as strings, and
+other characters (such as 13 for Enter and 27 for Esc) as their
+code points. An escape sequence split across reads is put back
+together, and an Esc with nothing after it is only taken as the
+Esc key once no more input follows it for ESC_TIMEOUT seconds.
+"""
+import codecs
+import os
+import select
+import signal
+import sys
+import termios
+import tty
+from types import FrameType, TracebackType
+from typing import Any, TypeAlias
+
+# A key: a printable character or escape sequence, or the code
+# point of any other character
+Key: TypeAlias = str | int
+
+ESC: str = "\033"
+ESC_TIMEOUT: float = 0.05
+READ_SIZE: int = 4096
+RESTORE_SIGNALS: tuple[signal.Signals, ...] = (signal.SIGTERM, signal.SIGHUP)
+
+
+def char_key(ch: str) -> Key:
+    """
+    Return the key for a character that is not part of an
+    escape sequence.
+    """
+    return ch if " " <= ch <= "~" else ord(ch)
+
+
+def escape_end(text: str, start: int) -> int:
+    """
+    Return the end of the escape sequence starting at text[start]
+    (which is ESC), or -1 if the text ends before it does.
+    Control sequences ("\\033[" and parameters up to a final
+    character) and "\\033O" sequences are recognised; ESC and
+    any other character is a two character sequence (Alt and
+    that key), and an ESC followed by another is a sequence of
+    its own.
+    """
+    i = start + 1
+    if i == len(text):
+        return -1
+    if text[i] == "[":
+        i += 1
+        while i < len(text) and " " <= text[i] <= "?":
+            i += 1
+        return i + 1 if i < len(text) else -1
+    if text[i] == "O":
+        return i + 2 if i + 1 < len(text) else -1
+    if text[i] == ESC:
+        return i
+    return i + 1
+
+
+class KeyDecoder:
+    """
+    Splits the bytes read from a terminal into keys.
+    """
+
+    _decoder: codecs.IncrementalDecoder
+    _text: str
+
+    def __init__(self) -> None:
+        """
+        Constructor
+        """
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._text = ""
+
+    def feed(self, data: bytes) -> list[Key]:
+        """
+        Return the keys completed by the given bytes, keeping any
+        unfinished escape sequence for the next call.
+        """
+        text = self._text + self._decoder.decode(data)
+        keys: list[Key] = []
+        i = 0
+        while i < len(text):
+            if text[i] != ESC:
+                keys.append(char_key(text[i]))
+                i += 1
+                continue
+            end = escape_end(text, i)
+            if end < 0:
+                break
+            keys.append(text[i:end] if end > i + 1 else ord(ESC))
+            i = end
+        self._text = text[i:]
+        return keys
+
+    def pending(self) -> bool:
+        """
+        Decide whether or not an unfinished escape sequence is
+        waiting for more input.
+        """
+        return bool(self._text)
+
+    def flush(self) -> list[Key]:
+        """
+        Give up waiting for the rest of an escape sequence, and
+        return what there is of it as separate keys (so a lone
+        ESC is the Esc key).
+        """
+        keys = [char_key(ch) for ch in self._text]
+        self._text = ""
+        return keys
+
+
+class RawInput:
+    """
+    A terminal in raw mode, and the keys read from it. Use it
+    as a context manager:
+
+        with RawInput() as keyboard:
+            for key in keyboard.read():
+                ...
+    """
+
+    _fd: int
+    _saved: list[Any] | None
+    _handlers: dict[signal.Signals, Any]
+    _decoder: KeyDecoder
+
+    def __init__(self, fd: int | None = None) -> None:
+        """
+        Constructor (standard input by default)
+        """
+        self._fd = sys.stdin.fileno() if fd is None else fd
+        self._saved = None
+        self._handlers = {}
+        self._decoder = KeyDecoder()
+
+    def __enter__(self) -> "RawInput":
+        """
+        Put the terminal into raw mode.
+        """
+        self._saved = termios.tcgetattr(self._fd)
+        for sig in RESTORE_SIGNALS:
+            self._handlers[sig] = signal.signal(sig, self._on_signal)
+        tty.setraw(self._fd)
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,
+                 exc: BaseException | None, tb: TracebackType | None) -> None:
+        """
+        Put the terminal back the way it was.
+        """
+        if self._saved is not None:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved)
+            self._saved = None
+        for sig, handler in self._handlers.items():
+            signal.signal(sig, handler)
+        self._handlers = {}
+
+    def _on_signal(self, signum: int, frame: FrameType | None) -> None:
+        """
+        Exit on a signal that would otherwise kill the program,
+        so that the terminal is put back on the way out.
+        """
+        raise SystemExit(128 + signum)
+
+    def read(self, timeout: float | None = None) -> list[Key]:
+        """
+        Wait for input (for up to timeout seconds, if not None)
+        and return every key available. Returns an empty list if
+        there was none in time.
+
+        Raises EOFError if the input has been closed.
+        """
+        if not self._wait(timeout):
+            return self._decoder.flush()
+        keys = self._read_available()
+        while self._decoder.pending():
+            if not self._wait(ESC_TIMEOUT):
+                keys += self._decoder.flush()
+                break
+            keys += self._read_available()
+        return keys
+
+    def _wait(self, timeout: float | None) -> bool:
+        """
+        Wait for input, returning whether or not there is any.
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        return bool(ready)
+
+    def _read_available(self) -> list[Key]:
+        """
+        Read the input that is available (there must be some),
+        and return the keys it completes.
+        """
+        data = os.read(self._fd, READ_SIZE)
+        if not data:
+            raise EOFError
+        return self._decoder.feed(data)
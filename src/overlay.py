@@ -0,0 +1,342 @@
+"""
+Overlay of found strands, the hint and the selection on the TUI
+board.
+
+The TUI draws each row of the board as its letters, styled by
+what they are part of, with the links between them drawn as
+connectors: " - " between neighbours in a row, and a line of
+"|", "/", "\\" and "X" below the row for links to the next one.
+
+Rebuilding all of that on every keystroke means walking every
+found strand and every cell of the board, when usually only the
+one or two rows around the cursor change. An Overlay instead
+keeps the cells and links of each layer (the found strands, the
+hint and the selection) indexed by row, along with the text of
+every row it has drawn. When a layer changes, only the rows it
+touches before and after are drawn again.
+
+For boards too large for the terminal, only a Viewport (a window
+of rows and columns that follows the cursor) is drawn, so the cost
+of a frame depends on the size of the terminal, not of the board.
+"""
+from collections.abc import Sequence
+from typing import NamedTuple, TypeAlias
+
+from base import PosBase, StrandBase
+from strands import Board
+
+BOLD: str = "\033[1m"
+RESET: str = "\033[0m"
+BLUE: str = "\033[34m"
+GREEN: str = "\033[32m"
+RED: str = "\033[31m"
+PINK: str = "\033[35m"
+
+# The kinds of link between two neighbouring cells: to the next
+# column, to the next row, and diagonally, with the link keyed by
+# the top left cell of the pair (or of the 2x2 square)
+HORIZ: int = 0
+VERT: int = 1
+SLASH: int = 2
+BACKSLASH: int = 3
+
+# A link, as the row and column of its key cell and its kind
+Link: TypeAlias = tuple[int, int, int]
+
+
+def strand_links(positions: Sequence[PosBase]) -> list[Link]:
+    """
+    Return the links between consecutive positions.
+    """
+    links: list[Link] = []
+    for p1, p2 in zip(positions, positions[1:]):
+        dr = p2.r - p1.r
+        dc = p2.c - p1.c
+        r, c = min(p1.r, p2.r), min(p1.c, p2.c)
+        if dr == 0:
+            links.append((r, c, HORIZ))
+        elif dc == 0:
+            links.append((r, c, VERT))
+        elif dr == dc:
+            links.append((r, c, BACKSLASH))
+        else:
+            links.append((r, c, SLASH))
+    return links
+
+
+class Layer:
+    """
+    The cells and links of some strands, indexed by row.
+    """
+
+    cells: dict[int, set[int]]
+    links: dict[int, set[tuple[int, int]]]
+
+    def __init__(self) -> None:
+        """
+        Constructor
+        """
+        self.cells = {}
+        self.links = {}
+
+    def add(self, positions: Sequence[PosBase]) -> None:
+        """
+        Add the cells of a strand, and the links between them.
+        """
+        for p in positions:
+            self.cells.setdefault(p.r, set()).add(p.c)
+        for r, c, kind in strand_links(positions):
+            self.links.setdefault(r, set()).add((c, kind))
+
+    def rows(self) -> set[int]:
+        """
+        Return the rows with cells in this layer (every link
+        is in the row of one of its cells).
+        """
+        return set(self.cells)
+
+    def has_cell(self, r: int, c: int) -> bool:
+        """
+        Decide whether or not a cell is in this layer.
+        """
+        cols = self.cells.get(r)
+        return cols is not None and c in cols
+
+    def has_link(self, r: int, c: int, kind: int) -> bool:
+        """
+        Decide whether or not a link is in this layer.
+        """
+        links = self.links.get(r)
+        return links is not None and (c, kind) in links
+
+
+class Viewport(NamedTuple):
+    """
+    The part of a board that is shown: its first row and column,
+    and the number of rows and columns shown.
+    """
+    top: int
+    left: int
+    rows: int
+    cols: int
+
+    def follow(self, r: int, c: int, num_rows: int, num_cols: int) -> "Viewport":
+        """
+        Return the viewport scrolled as little as possible to
+        show the cell at (r, c), on a board of the given size.
+        """
+        rows, cols = min(self.rows, num_rows), min(self.cols, num_cols)
+        top = min(max(self.top, r - rows + 1), r, num_rows - rows)
+        left = min(max(self.left, c - cols + 1), c, num_cols - cols)
+        return Viewport(max(0, top), max(0, left), rows, cols)
+
+
+class Overlay:
+    """
+    The found strands, hint and selection shown on a board,
+    and the text of each row of the board with them drawn on.
+    Only the rows and columns in the viewport (the whole board,
+    unless set_viewport is called) are drawn.
+    """
+
+    _board: Board
+    _rows: int
+    _cols: int
+    _found: Layer
+    _found_strands: list[StrandBase]
+    _hint: Layer
+    _hint_ends: set[tuple[int, int]]
+    _hint_key: tuple[tuple[tuple[int, int], ...], bool] | None
+    _selected: Layer
+    _selection: list[PosBase]
+    _current: tuple[int, int]
+    _view: Viewport
+    _lines: dict[int, tuple[str, str]]
+    _dirty: set[int]
+
+    def __init__(self, board: Board) -> None:
+        """
+        Constructor
+        """
+        self._board = board
+        self._rows = board.num_rows()
+        self._cols = board.num_cols()
+        self._found = Layer()
+        self._found_strands = []
+        self._hint = Layer()
+        self._hint_ends = set()
+        self._hint_key = None
+        self._selected = Layer()
+        self._selection = []
+        self._current = (-1, -1)
+        self._view = Viewport(0, 0, self._rows, self._cols)
+        self._lines = {}
+        self._dirty = set()
+
+    def width(self) -> int:
+        """
+        Return the width of a row of the viewport, in characters.
+        """
+        return 4 * self._view.cols - 2
+
+    def viewport(self) -> Viewport:
+        """
+        Return the part of the board that is drawn.
+        """
+        return self._view
+
+    def set_viewport(self, view: Viewport) -> None:
+        """
+        Draw only the given part of the board (trimmed to fit it).
+        """
+        top, left = max(0, view.top), max(0, view.left)
+        view = Viewport(top, left, max(1, min(view.rows, self._rows - top)),
+                        max(1, min(view.cols, self._cols - left)))
+        if view == self._view:
+            return
+        if (view.left, view.cols) == (self._view.left, self._view.cols):
+            # Scrolling up or down keeps the rows still in view
+            self._lines = {r: line for r, line in self._lines.items()
+                           if view.top <= r < view.top + view.rows}
+        else:
+            self._lines = {}
+        self._view = view
+
+    def set_found(self, strands: Sequence[StrandBase]) -> None:
+        """
+        Show the given strands as found. Strands found since
+        the last call are added to what is shown; anything else
+        redraws every row the found strands were on.
+        """
+        known = self._found_strands
+        if (len(strands) < len(known)
+                or any(a is not b for a, b in zip(strands, known))):
+            self._dirty |= self._found.rows()
+            self._found = Layer()
+            known = self._found_strands = []
+        for strand in strands[len(known):]:
+            positions = strand.positions()
+            self._found.add(positions)
+            self._dirty.update(p.r for p in positions)
+            known.append(strand)
+
+    def set_hint(self, positions: Sequence[PosBase], show_ends: bool) -> None:
+        """
+        Show the given positions as the hint (none if empty),
+        with its first and last letters highlighted if
+        show_ends is True.
+        """
+        key = (tuple((p.r, p.c) for p in positions), show_ends)
+        if key == self._hint_key:
+            return
+        self._dirty |= self._hint.rows()
+        self._hint_key = key
+        self._hint = Layer()
+        for p in positions:
+            self._hint.cells.setdefault(p.r, set()).add(p.c)
+        self._hint_ends = set()
+        if positions and show_ends:
+            self._hint_ends = {(positions[0].r, positions[0].c),
+                               (positions[-1].r, positions[-1].c)}
+        self._dirty |= self._hint.rows()
+
+    def select(self, selected: Sequence[PosBase], current: PosBase) -> None:
+        """
+        Show the given positions as selected, and the cursor at
+        current.
+        """
+        if (current.r, current.c) != self._current:
+            self._dirty.add(self._current[0])
+            self._current = (current.r, current.c)
+            self._dirty.add(current.r)
+        if list(selected) == self._selection:
+            return
+        self._dirty |= self._selected.rows()
+        self._selection = list(selected)
+        self._selected = Layer()
+        self._selected.add(self._selection)
+        self._dirty |= self._selected.rows()
+
+    def lines(self) -> list[tuple[str, str]]:
+        """
+        Return each row of the viewport along with the connectors
+        below it (empty for the last row of the board), drawing
+        again only the rows that changed.
+        """
+        lines = self._lines
+        top, _, rows, _ = self._view
+        for r in range(top, top + rows):
+            if r in self._dirty or r not in lines:
+                lines[r] = (self._row_line(r), self._between_line(r))
+        self._dirty = set()
+        return [lines[r] for r in range(top, top + rows)]
+
+    def _row_line(self, r: int) -> str:
+        """
+        Return the letters of a row, with the connectors
+        between them.
+        """
+        board, num_cols = self._board, self._cols
+        _, left, _, cols = self._view
+        found, hint, selected = self._found, self._hint, self._selected
+        parts: list[str] = []
+        for c in range(left, left + cols):
+            letter = board.letter_at(r * num_cols + c)
+            if (r, c) == self._current:
+                parts.append(BOLD + RED + letter + RESET)
+            elif selected.has_cell(r, c):
+                parts.append(BOLD + GREEN + letter + RESET)
+            elif hint.has_cell(r, c):
+                if (r, c) in self._hint_ends:
+                    parts.append(BOLD + PINK + letter + RESET)
+                else:
+                    parts.append(PINK + letter + RESET)
+            elif found.has_cell(r, c):
+                parts.append(BOLD + BLUE + letter + RESET)
+            else:
+                parts.append(letter)
+            if c == left + cols - 1:
+                parts.append(" ")
+            elif selected.has_link(r, c, HORIZ):
+                parts.append(BOLD + GREEN + " - " + RESET)
+            elif found.has_link(r, c, HORIZ):
+                parts.append(BOLD + BLUE + " - " + RESET)
+            else:
+                parts.append("   ")
+        return "".join(parts)
+
+    def _between_line(self, r: int) -> str:
+        """
+        Return the connectors from a row to the next one (empty
+        for the last row). Where diagonals cross, an "X" is
+        drawn.
+        """
+        if r == self._rows - 1:
+            return ""
+        _, left, _, cols = self._view
+        found, selected = self._found, self._selected
+        blue_backslash = BOLD + BLUE + "\\" + RESET
+        slots: list[str] = [" "] * self.width()
+        for c in range(left, left + cols):
+            i = (c - left) * 4
+            if selected.has_link(r, c, VERT):
+                slots[i] = BOLD + GREEN + "|" + RESET
+            elif found.has_link(r, c, VERT):
+                slots[i] = BOLD + BLUE + "|" + RESET
+            if c == left + cols - 1:
+                continue
+
+            glyph = " "
+            if found.has_link(r, c, SLASH):
+                glyph = BOLD + BLUE + "/" + RESET
+            if found.has_link(r, c, BACKSLASH):
+                glyph = blue_backslash if glyph == " " else BOLD + BLUE + "X" + RESET
+            if selected.has_link(r, c, SLASH):
+                glyph = (BOLD + GREEN + "X" + RESET if glyph == blue_backslash
+                         else BOLD + GREEN + "/" + RESET)
+            if selected.has_link(r, c, BACKSLASH):
+                glyph = (BOLD + GREEN + "X" + RESET
+                         if glyph not in (blue_backslash, " ")
+                         else BOLD + GREEN + "\\" + RESET)
+            slots[i + 2] = glyph
+        return "".join(slots)
@@ -0,0 +1,315 @@
+"""
+Batch pipeline for generating Strands boards.
+
+Reads a file of themes, one per line, as the theme and its words
+separated by "|" (blank lines and lines starting with "#" are
+skipped):
+
+    Fore! | wood iron wedge driver putter chipper utility golfclubs
+
+and generates boards for them across a pool of worker processes:
+
+    python3 src/pipeline.py themes.txt -o boards/ -j 4
+    python3 src/pipeline.py themes.txt -o daily/ --per-theme 3
+
+Each job generates a board (see generator.py), checks with the
+solver that its words tile it in only one way (see solver.py),
+scores its difficulty, and checks that it loads with StrandsGame.
+If a board is not unique, the job tries again with the next seed,
+up to --tries times. Accepted boards are written to the output
+directory as soon as they are done, as NNNN-theme.txt where NNNN
+is the job's number.
+
+Every finished job, accepted or not, is recorded in a journal
+(kept in the board cache directory, assets/cache/, per themes
+file, output directory and set of options).
+Running the same command again after an interruption skips the
+jobs already recorded, so the pipeline resumes where it left off.
+Seeds only depend on --seed and the job, so a resumed run makes
+the same boards as an uninterrupted one.
+"""
+import os
+import re
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+from boardcache import content_key, get_cache_dir
+from generator import GeneratedBoard, generate_board
+from solver import solve_board, word_placements
+from strands import Board, StrandsGame
+
+import click
+
+NO_WORDS: frozenset[str] = frozenset()
+DEFAULT_TRIES: int = 20
+
+
+class Job(NamedTuple):
+    """
+    One board to generate: its number (from 1), the theme and words,
+    the board size, and the seed of the run.
+    """
+    number: int
+    theme: str
+    words: tuple[str, ...]
+    rows: int
+    cols: int
+    seed: int
+
+    def name(self) -> str:
+        """
+        Return the file name of the job's board, e.g.
+        "0007-fore.txt".
+        """
+        slug = re.sub(r"[^a-z0-9]+", "-", self.theme.lower()).strip("-")
+        return f"{self.number:04d}-{slug or 'board'}.txt"
+
+    def try_seed(self, attempt: int) -> int:
+        """
+        Return the generator seed for one attempt at this job.
+        """
+        key = content_key(f"{self.seed}:{self.number}:{attempt}".encode())
+        return int(key[:16], 16)
+
+
+class Difficulty(NamedTuple):
+    """
+    How hard a board is to solve: decoys is the number of
+    places the theme words can be traced other than their
+    answers, turns the number of changes of direction along
+    the answers, and nodes the solver's search effort.
+    """
+    decoys: int
+    turns: int
+    nodes: int
+
+    def score(self, num_words: int, num_steps: int) -> float:
+        """
+        Return a single score, given the number of words and
+        of steps along the answers: decoys per word plus the
+        share of steps that turn.
+        """
+        return self.decoys / max(1, num_words) + self.turns / max(1, num_steps)
+
+
+class JobResult(NamedTuple):
+    """
+    The outcome of a job: the lines of the accepted board
+    (empty if none was found), the number of attempts, its
+    difficulty score, why it was rejected (if it was), and
+    the worker's process ID and time.
+    """
+    job: Job
+    lines: list[str]
+    attempts: int
+    score: float
+    error: str
+    pid: int
+    seconds: float
+
+    def accepted(self) -> bool:
+        """
+        Decide whether or not a board was accepted.
+        """
+        return bool(self.lines)
+
+
+def read_themes(lines: Iterable[str]) -> list[tuple[str, tuple[str, ...]]]:
+    """
+    Parse a themes file into (theme, words) pairs.
+
+    Raises ValueError for a line without "|".
+    """
+    themes = []
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        theme, sep, words = line.rpartition("|")
+        if not sep:
+            raise ValueError(f"line {lineno}: expected 'THEME | WORD ...'")
+        themes.append((theme.strip(), tuple(words.lower().split())))
+    return themes
+
+
+def difficulty(generated: GeneratedBoard, board: Board, nodes: int) -> Difficulty:
+    """
+    Measure the difficulty of a generated board (see Difficulty).
+    """
+    decoys = sum(len(word_placements(board, p.word)) - 1
+                 for p in generated.answers)
+    turns = 0
+    cols = board.num_cols()
+    for _, cells in generated.answers:
+        moves = [(b // cols - a // cols, b % cols - a % cols)
+                 for a, b in zip(cells, cells[1:])]
+        turns += sum(m != n for m, n in zip(moves, moves[1:]))
+    return Difficulty(decoys, turns, nodes)
+
+
+def run_job(job: Job, tries: int = DEFAULT_TRIES) -> JobResult:
+    """
+    Generate a board for a job whose words tile it in only
+    one way, trying up to tries seeds.
+    """
+    start = time.perf_counter()
+    for attempt in range(1, tries + 1):
+        try:
+            generated = generate_board(job.theme, job.words, job.rows, job.cols,
+                                       seed=job.try_seed(attempt))
+        except ValueError as e:
+            return JobResult(job, [], attempt, 0.0, str(e), os.getpid(),
+                             time.perf_counter() - start)
+        if generated is None:
+            continue
+        game = StrandsGame(generated.spec(), dictionary=NO_WORDS)
+        board = game.board()
+        result = solve_board(board, job.words, limit=2)
+        if not result.is_unique():
+            continue
+        num_steps = sum(len(word) - 1 for word in job.words)
+        score = difficulty(generated, board, result.nodes).score(len(job.words),
+                                                                num_steps)
+        return JobResult(job, generated.lines(), attempt, score, "", os.getpid(),
+                         time.perf_counter() - start)
+    return JobResult(job, [], tries, 0.0, f"no unique board in {tries} tries",
+                     os.getpid(), time.perf_counter() - start)
+
+
+def journal_path(themes_path: str, out_dir: str, rows: int, cols: int,
+                 per_theme: int, seed: int, tries: int) -> str:
+    """
+    Return the path of the journal for a themes file, output
+    directory and the options of the run, so that a run with
+    other options does not resume from it.
+    """
+    key = content_key(f"{os.path.abspath(themes_path)}\n"
+                      f"{os.path.abspath(out_dir)}\n"
+                      f"{rows} {cols} {per_theme} {seed} {tries}".encode())
+    return os.path.join(get_cache_dir(), f"pipeline-{key[:16]}.journal")
+
+
+def read_journal(path: str) -> set[str]:
+    """
+    Return the names of the jobs recorded in a journal.
+    """
+    try:
+        with open(path, "r") as f:
+            return {line.split("\t", 1)[0] for line in f if line.strip()}
+    except OSError:
+        return set()
+
+
+def write_board(out_dir: str, name: str, lines: list[str]) -> str:
+    """
+    Write a board file atomically, returning its path.
+    """
+    path = os.path.join(out_dir, name)
+    tmp = os.path.join(out_dir, f".{name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+    return path
+
+
+def run_jobs(jobs: list[Job], workers: int | None = None,
+             tries: int = DEFAULT_TRIES) -> Iterator[JobResult]:
+    """
+    Run jobs across worker processes (one per CPU by default),
+    yielding results as they complete. At most a few jobs per
+    worker are queued at a time, so that an interrupted run
+    has not started far ahead of what it has recorded.
+    """
+    if workers == 1:
+        for job in jobs:
+            yield run_job(job, tries)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    pending: set[Future[JobResult]] = set()
+    queue = iter(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for job in queue:
+                pending.add(pool.submit(run_job, job, tries))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+######################################################################
+
+
+@click.command()
+@click.argument("themes_file")
+@click.option("-o", "--out", "out_dir", default="boards", show_default=True,
+              help="Directory to write the boards to.")
+@click.option("-r", "--rows", default=8, show_default=True, help="Number of rows.")
+@click.option("-c", "--cols", default=6, show_default=True, help="Number of columns.")
+@click.option("-n", "--per-theme", default=1, show_default=True,
+              help="Number of boards to generate per theme.")
+@click.option("-s", "--seed", default=0, show_default=True, help="Random seed.")
+@click.option("-j", "--jobs", "workers", type=int, default=None,
+              help="Number of worker processes (default: one per CPU).")
+@click.option("--tries", default=DEFAULT_TRIES, show_default=True,
+              help="Number of seeds to try per board.")
+def main(themes_file: str, out_dir: str, rows: int, cols: int, per_theme: int,
+         seed: int, workers: int | None, tries: int) -> None:
+    """Generate unique Strands boards for every theme in THEMES_FILE."""
+    with open(themes_file, "r") as f:
+        try:
+            themes = read_themes(f)
+        except ValueError as e:
+            raise click.BadParameter(f"{themes_file}: {e}") from None
+
+    jobs = [Job(i, theme, words, rows, cols, seed)
+            for i, (theme, words) in enumerate(
+                (t for t in themes for _ in range(per_theme)), 1)]
+    os.makedirs(out_dir, exist_ok=True)
+    journal = journal_path(themes_file, out_dir, rows, cols, per_theme, seed, tries)
+    os.makedirs(os.path.dirname(journal), exist_ok=True)
+    done = read_journal(journal)
+    todo = [job for job in jobs if job.name() not in done]
+    if done:
+        click.echo(f"Resuming: {len(jobs) - len(todo)} of {len(jobs)} jobs done",
+                   err=True)
+
+    accepted = 0
+    busy: dict[int, tuple[int, float]] = {}
+    start = time.perf_counter()
+    with open(journal, "a") as log:
+        for result in run_jobs(todo, workers, tries):
+            name = result.job.name()
+            if result.accepted():
+                path = write_board(out_dir, name, result.lines)
+                accepted += 1
+                click.echo(f"{path}: difficulty {result.score:.2f} "
+                           f"({result.attempts} tries)")
+                log.write(f"{name}\taccepted\t{result.score:.3f}\n")
+            else:
+                click.echo(f"{name}: {result.error}", err=True)
+                log.write(f"{name}\trejected\t{result.error}\n")
+            log.flush()
+            count, seconds = busy.get(result.pid, (0, 0.0))
+            busy[result.pid] = (count + result.accepted(), seconds + result.seconds)
+    elapsed = time.perf_counter() - start
+
+    rate = accepted / elapsed if elapsed > 0 else 0.0
+    click.echo(f"{accepted} of {len(todo)} boards accepted in {elapsed:.1f} s "
+               f"({rate:.1f} boards/s)", err=True)
+    for pid, (count, seconds) in sorted(busy.items()):
+        worker_rate = count / seconds if seconds > 0 else 0.0
+        click.echo(f"  worker {pid}: {count} boards, {worker_rate:.1f} boards/s",
+                   err=True)
+    sys.exit(0 if accepted == len(todo) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Screen buffer for the TUI.
+
+Printing a whole frame on every keystroke means hundreds of small
+writes, most of them repeating what is already on the screen. A
+Screen instead keeps the last frame it drew as a grid of cells,
+each a character and the ANSI style it is drawn in. Given the
+next frame (as lines of text, which may contain ANSI style
+codes), it works out which cells changed and writes only those,
+using cursor-addressing escape codes, in a single write.
+
+The first frame clears the screen and is drawn from the top left
+corner, so the Screen knows where every cell is. Anything else
+printed while the Screen is in use would throw that off, so
+messages should be drawn as part of the frame.
+"""
+import re
+import sys
+from typing import TextIO, TypeAlias
+
+# A character and the style codes it is drawn with ("" if none)
+Cell: TypeAlias = tuple[str, str]
+
+RESET: str = "\033[0m"
+CLEAR: str = "\033[H\033[2J"
+HIDE_CURSOR: str = "\033[?25l"
+SHOW_CURSOR: str = "\033[?25h"
+SGR_PATTERN: re.Pattern[str] = re.compile(r"\x1B\[([0-9;]*)m")
+
+# Changed cells separated by at most this many unchanged cells
+# are rewritten in one run, which is shorter than moving the
+# cursor past them
+MAX_GAP: int = 4
+
+
+def move_to(row: int, col: int) -> str:
+    """
+    Return the escape code that moves the cursor to a (0-based)
+    row and column.
+    """
+    return f"\033[{row + 1};{col + 1}H"
+
+
+def parse_line(text: str) -> list[Cell]:
+    """
+    Split a line of text with ANSI style codes into cells.
+    """
+    cells: list[Cell] = []
+    style = ""
+    pos = 0
+    for match in SGR_PATTERN.finditer(text):
+        cells.extend((ch, style) for ch in text[pos:match.start()])
+        if match.group(1) in ("", "0"):
+            style = ""
+        else:
+            style += match.group(0)
+        pos = match.end()
+    cells.extend((ch, style) for ch in text[pos:])
+    return cells
+
+
+def render_run(cells: list[Cell]) -> str:
+    """
+    Return the text that draws a run of cells, switching
+    styles only where they change.
+    """
+    out: list[str] = []
+    style = ""
+    for ch, cell_style in cells:
+        if cell_style != style:
+            out.append(RESET + cell_style if style else cell_style)
+            style = cell_style
+        out.append(ch)
+    if style:
+        out.append(RESET)
+    return "".join(out)
+
+
+class Screen:
+    """
+    The cells currently on the terminal, and the output stream
+    that changes to them are written to.
+    """
+
+    _out: TextIO
+    _lines: list[str]
+    _rows: list[list[Cell]] | None
+    bytes_written: int
+    writes: int
+
+    def __init__(self, out: TextIO | None = None) -> None:
+        """
+        Constructor
+        """
+        self._out = out if out is not None else sys.stdout
+        self._lines = []
+        self._rows = None
+        self.bytes_written = 0
+        self.writes = 0
+
+    def reset(self) -> None:
+        """
+        Forget what is on the screen, so that the next frame
+        is drawn from scratch.
+        """
+        self._lines = []
+        self._rows = None
+
+    def render(self, lines: list[str]) -> str:
+        """
+        Return the output that turns the screen into the given
+        frame, and remember the frame as what is on the screen.
+        """
+        old = self._rows
+        if old is None:
+            new = [parse_line(line) for line in lines]
+            self._lines, self._rows = list(lines), new
+            return CLEAR + "".join(
+                move_to(y, 0) + render_run(row) for y, row in enumerate(new) if row
+            ) + move_to(len(new), 0)
+
+        # Only lines whose text changed need to be compared
+        # cell by cell
+        new = []
+        out: list[str] = []
+        for y, line in enumerate(lines):
+            if y < len(old) and self._lines[y] == line:
+                new.append(old[y])
+                continue
+            row = parse_line(line)
+            new.append(row)
+            out.extend(self._diff_row(y, old[y] if y < len(old) else [], row))
+        self._lines, self._rows = list(lines), new
+        if len(old) > len(new):
+            out.append(move_to(len(new), 0) + "\033[J")
+        if out:
+            out.append(move_to(len(new), 0))
+        return "".join(out)
+
+    def _diff_row(self, y: int, old: list[Cell], new: list[Cell]) -> list[str]:
+        """
+        Return the output that turns one row of the screen from
+        old into new.
+        """
+        out: list[str] = []
+        x = 0
+        width = len(new)
+        while x < width:
+            if x < len(old) and old[x] == new[x]:
+                x += 1
+                continue
+            start = end = x
+            gap = 0
+            while x < width and gap <= MAX_GAP:
+                if x < len(old) and old[x] == new[x]:
+                    gap += 1
+                else:
+                    gap = 0
+                    end = x + 1
+                x += 1
+            out.append(move_to(y, start) + render_run(new[start:end]))
+            x = end
+        if len(old) > width:
+            out.append(move_to(y, width) + "\033[K")
+        return out
+
+    def draw(self, lines: list[str]) -> int:
+        """
+        Update the screen to show the given frame, in a single
+        write. Returns the number of characters written.
+        """
+        text = self.render(lines)
+        if text:
+            self._out.write(text)
+            self._out.flush()
+            self.bytes_written += len(text.encode())
+            self.writes += 1
+        return len(text)
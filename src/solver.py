@@ -0,0 +1,390 @@
+"""
+Exact-cover solver for Strands boards.
+
+A board is solved by laying out its theme words as strands that
+cover every cell exactly once, without folding and without two
+strands crossing. solve_board finds every such layout, so it can
+check that a game's answers are the only way to tile its board:
+
+    python3 src/solver.py boards/face-time.txt
+    python3 src/solver.py --limit 2 boards/
+
+First, every placement of every word is found: each path of
+neighbouring cells, never revisiting a cell and never crossing
+itself, that spells the word. Then choosing one placement per
+word so that each cell is used once is an exact cover problem,
+solved with Knuth's Algorithm X on dancing links (ExactCover):
+
+  - there is a primary column for each cell and for each word,
+    which must be covered exactly once,
+
+  - there is a secondary column for each 2x2 square whose
+    diagonals are used by some placement, which may be covered
+    at most once, so that no two strands cross,
+
+  - each placement is a row, covering its cells, its word and
+    the squares of its diagonal steps.
+
+The search always branches on the column with the fewest rows
+left (usually the most constrained cell), and is capped by a
+budget on the number of rows it tries.
+
+Two strands that spell the same word over the same cells count
+as the same placement, since the game accepts either of them
+for that answer.
+"""
+import sys
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from typing import NamedTuple
+
+from geometry import edge_key
+from strands import Board, CellPath, StrandsGame
+from validate import find_game_files
+
+import click
+
+DEFAULT_BUDGET: int = 1_000_000
+
+
+class ExactCover:
+    """
+    Dancing links for Algorithm X. Columns 1 to num_primary
+    are primary and must be covered exactly once; the next
+    num_secondary columns are secondary and may be covered at
+    most once. Each row has a label, and solutions are given
+    as lists of row labels.
+
+    All the links are kept in flat lists indexed by node, where
+    node 0 is the root, nodes 1 to the number of columns are
+    the column headers, and the remaining nodes are the ones
+    in rows.
+    """
+
+    _left: list[int]
+    _right: list[int]
+    _up: list[int]
+    _down: list[int]
+    _column: list[int]
+    _label: list[int]
+    _size: list[int]
+    nodes: int
+    exhausted: bool
+
+    def __init__(self, num_primary: int, num_secondary: int = 0) -> None:
+        """
+        Constructor
+        """
+        num_columns = num_primary + num_secondary
+        headers = range(num_columns + 1)
+        self._left = [c - 1 for c in headers]
+        self._right = [c + 1 for c in headers]
+        self._left[0] = num_primary
+        self._right[num_primary] = 0
+        # Secondary columns are left out of the list of columns
+        # to cover, so linked only to themselves
+        for c in range(num_primary + 1, num_columns + 1):
+            self._left[c] = self._right[c] = c
+        self._up = list(headers)
+        self._down = list(headers)
+        self._column = list(headers)
+        self._label = [-1] * (num_columns + 1)
+        self._size = [0] * (num_columns + 1)
+        self.nodes = 0
+        self.exhausted = False
+
+    def add_row(self, columns: Iterable[int], label: int) -> None:
+        """
+        Add a row covering the given columns (numbered from 1,
+        primary columns first).
+        """
+        left, right, up, down = self._left, self._right, self._up, self._down
+        first = -1
+        for c in columns:
+            node = len(left)
+            if first < 0:
+                first = node
+                left.append(node)
+                right.append(node)
+            else:
+                left.append(left[first])
+                right.append(first)
+                right[left[first]] = node
+                left[first] = node
+            up.append(up[c])
+            down.append(c)
+            down[up[c]] = node
+            up[c] = node
+            self._column.append(c)
+            self._label.append(label)
+            self._size[c] += 1
+
+    def _cover(self, c: int) -> None:
+        """
+        Remove column c, and every row that covers it.
+        """
+        left, right, up, down = self._left, self._right, self._up, self._down
+        column, size = self._column, self._size
+        left[right[c]] = left[c]
+        right[left[c]] = right[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                up[down[j]] = up[j]
+                down[up[j]] = down[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, c: int) -> None:
+        """
+        Undo _cover(c).
+        """
+        left, right, up, down = self._left, self._right, self._up, self._down
+        column, size = self._column, self._size
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                up[down[j]] = j
+                down[up[j]] = j
+                j = left[j]
+            i = up[i]
+        left[right[c]] = c
+        right[left[c]] = c
+
+    def solutions(self, budget: int = DEFAULT_BUDGET) -> Iterator[list[int]]:
+        """
+        Yield every solution, as a list of row labels. Stops
+        early, setting exhausted, once budget rows have been
+        tried. nodes counts the rows tried so far.
+        """
+        self.nodes = 0
+        self.exhausted = False
+        yield from self._search([], budget)
+
+    def _search(self, chosen: list[int], budget: int) -> Iterator[list[int]]:
+        """
+        Extend a partial solution (the chosen row nodes).
+        """
+        right, down, size = self._right, self._down, self._size
+        if right[0] == 0:
+            yield [self._label[node] for node in chosen]
+            return
+
+        # Branch on the column with the fewest rows left
+        best = c = right[0]
+        while c != 0:
+            if size[c] < size[best]:
+                best = c
+                if size[c] <= 1:
+                    break
+            c = right[c]
+        if size[best] == 0:
+            return
+
+        self._cover(best)
+        r = down[best]
+        while r != best:
+            if self.nodes >= budget:
+                self.exhausted = True
+                break
+            self.nodes += 1
+            chosen.append(r)
+            j = right[r]
+            while j != r:
+                self._cover(self._column[j])
+                j = right[j]
+            yield from self._search(chosen, budget)
+            j = self._left[r]
+            while j != r:
+                self._uncover(self._column[j])
+                j = self._left[j]
+            chosen.pop()
+            if self.exhausted:
+                break
+            r = down[r]
+        self._uncover(best)
+
+
+class Placement(NamedTuple):
+    """
+    One way to lay out a word on a board: the word and the
+    IDs of the cells it visits, in order.
+    """
+    word: str
+    cells: CellPath
+
+
+class SolveResult(NamedTuple):
+    """
+    The outcome of solve_board: the solutions found (each one
+    placement per word, in the order the words were given),
+    the number of search nodes (rows tried), and whether the
+    search finished. It does not finish if it runs out of
+    budget or reaches the limit on solutions.
+    """
+    solutions: list[tuple[Placement, ...]]
+    nodes: int
+    complete: bool
+
+    def num_solutions(self) -> int:
+        """
+        Return the number of solutions found.
+        """
+        return len(self.solutions)
+
+    def is_unique(self) -> bool:
+        """
+        Decide whether or not the search finished with exactly
+        one solution.
+        """
+        return self.complete and len(self.solutions) == 1
+
+
+def word_placements(board: Board, word: str) -> list[CellPath]:
+    """
+    Find every path of neighbouring cells that spells word
+    without revisiting a cell or crossing itself (see
+    Board.word_paths). Paths that cover the same cells are
+    only given once.
+    """
+    num_cols = board.num_cols()
+    found: dict[frozenset[int], CellPath] = {}
+    for path in board.word_paths(word):
+        diagonals = [edge_key(a, b, num_cols) for a, b in zip(path, path[1:])
+                     if a // num_cols != b // num_cols
+                     and a % num_cols != b % num_cols]
+        if len(set(diagonals)) == len(diagonals):
+            found.setdefault(frozenset(path), path)
+    return list(found.values())
+
+
+def answer_line(board: Board, placement: Placement) -> str:
+    """
+    Return the answer line of a game file ("WORD ROW COL
+    STEP ...") for a placement.
+    """
+    positions = [board.cell_pos(cell) for cell in placement.cells]
+    steps = [a.step_to(b).value for a, b in zip(positions, positions[1:])]
+    start = positions[0]
+    return " ".join([placement.word, str(start.r + 1), str(start.c + 1)] + steps)
+
+
+def solve_board(board: Board, words: Sequence[str], limit: int | None = None,
+                budget: int = DEFAULT_BUDGET) -> SolveResult:
+    """
+    Find the ways to tile board with the given (lowercase)
+    theme words as non-overlapping, non-crossing strands,
+    stopping after limit solutions (if not None) or once
+    budget search nodes have been tried. A word that is given
+    more than once must be placed that many times.
+    """
+    num_cells = board.num_cells()
+    num_cols = board.num_cols()
+    if sum(map(len, words)) != num_cells:
+        return SolveResult([], 0, True)
+
+    # Placements of each distinct word
+    distinct = list(dict.fromkeys(words))
+    placements: list[Placement] = []
+    first: dict[str, int] = {}
+    for word in distinct:
+        first[word] = len(placements)
+        placements.extend(Placement(word, cells)
+                          for cells in word_placements(board, word))
+
+    # Squares whose diagonals are used, as secondary columns
+    squares: dict[int, int] = {}
+    placement_squares: list[list[int]] = []
+    for p in placements:
+        keys = []
+        for a, b in zip(p.cells, p.cells[1:]):
+            if a // num_cols != b // num_cols and a % num_cols != b % num_cols:
+                key = edge_key(a, b, num_cols)
+                keys.append(squares.setdefault(key, len(squares)))
+        placement_squares.append(keys)
+
+    # Columns: cells, then one per word given, then squares
+    num_primary = num_cells + len(words)
+    problem = ExactCover(num_primary, len(squares))
+    word_columns: dict[str, list[int]] = {}
+    for i, word in enumerate(words):
+        word_columns.setdefault(word, []).append(num_cells + i + 1)
+    for idx, p in enumerate(placements):
+        extra = [num_primary + 1 + s for s in placement_squares[idx]]
+        for column in word_columns[p.word]:
+            problem.add_row([cell + 1 for cell in p.cells] + [column] + extra, idx)
+
+    # Copies of a repeated word are interchangeable, so each
+    # layout is found once per ordering of the copies
+    seen: set[tuple[int, ...]] = set()
+    order = {word: i for i, word in enumerate(words)}
+    solutions: list[tuple[Placement, ...]] = []
+    complete = True
+    for labels in problem.solutions(budget):
+        layout = tuple(sorted(labels))
+        if layout in seen:
+            continue
+        seen.add(layout)
+        solutions.append(tuple(sorted((placements[i] for i in layout),
+                                      key=lambda p: order[p.word])))
+        if limit is not None and len(solutions) >= limit:
+            complete = False
+            break
+    if problem.exhausted:
+        complete = False
+    return SolveResult(solutions, problem.nodes, complete)
+
+
+def solve_game(game: StrandsGame, limit: int | None = None,
+               budget: int = DEFAULT_BUDGET) -> SolveResult:
+    """
+    Find the ways to tile a game's board with its answers'
+    words (see solve_board).
+    """
+    return solve_board(game.board(), [word for word, _ in game.answers()],
+                       limit, budget)
+
+
+######################################################################
+
+
+@click.command()
+@click.argument("paths", nargs=-1, required=True)
+@click.option("-l", "--limit", type=int, default=None,
+              help="Stop after this many solutions.")
+@click.option("-b", "--budget", default=DEFAULT_BUDGET, show_default=True,
+              help="Maximum number of search nodes per board.")
+@click.option("-s", "--show", is_flag=True, help="Print every solution found.")
+def main(paths: tuple[str, ...], limit: int | None, budget: int,
+         show: bool) -> None:
+    """Count the ways to tile Strands boards with their theme words."""
+    ambiguous = 0
+    for path in find_game_files(paths):
+        try:
+            game = StrandsGame(path, dictionary=frozenset())
+        except ValueError as e:
+            click.echo(f"{path}: invalid ({e})")
+            continue
+        start = time.perf_counter()
+        result = solve_game(game, limit, budget)
+        ms = (time.perf_counter() - start) * 1000
+        count = f"{result.num_solutions()}{'' if result.complete else '+'}"
+        noun = "solution" if count == "1" else "solutions"
+        click.echo(f"{path}: {count} {noun} "
+                   f"({result.nodes:,} nodes, {ms:.1f} ms)")
+        if not result.is_unique():
+            ambiguous += 1
+        if show:
+            for i, solution in enumerate(result.solutions, 1):
+                click.echo(f"  solution {i}:")
+                for placement in solution:
+                    click.echo(f"    {answer_line(game.board(), placement)}")
+    sys.exit(1 if ambiguous else 0)
+
+
+if __name__ == "__main__":
+    main()
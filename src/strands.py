@@ -2,37 +2,109 @@
 Game logic for Milestone 3:
 Pos, Strand, Board, StrandsGame
 """
-import os
+import io
+from array import array
+from collections.abc import Container, Iterable, Sequence
 from typing import TypeAlias
 from base import PosBase, StrandBase, BoardBase, StrandsGameBase, Step
+from boardcache import Record, content_key, read_entry, write_entry
+from dictionary import get_dictionary
+from gamefile import GameFileError, GameSpec, parse_game, token_col
+from trie import NO_NODE, ROOT, Dawg, get_trie
+from verified import is_verified
 
 Row: TypeAlias = int
 Col: TypeAlias = int
+CellPath: TypeAlias = tuple[int, ...]
 
 STEPS: dict[Step, tuple[int, int]] = {
         Step.N: (-1, 0), Step.S: (1, 0), Step.E: (0, 1), Step.W: (0, -1),
         Step.NE: (-1, 1), Step.NW: (-1, -1), Step.SE: (1, 1), Step.SW: (1, -1)
         }
 
+# Inverse of STEPS: (row difference, col difference) -> Step
+DELTA_STEPS: dict[tuple[int, int], Step] = {
+        delta: step for step, delta in STEPS.items()
+        }
+
+# One-byte codes for packing strand steps
+CODE_STEPS: tuple[Step, ...] = tuple(STEPS)
+STEP_CODES: dict[Step, int] = {step: code for code, step in enumerate(CODE_STEPS)}
+CODE_DELTAS: tuple[tuple[int, int], ...] = tuple(STEPS[step] for step in CODE_STEPS)
+
+# Boards with at least this many answer edges are checked for
+# folds and crossings with NumPy (see geometry.py); below it, the
+# cost of importing NumPy and building arrays outweighs the scan
+VECTOR_MIN_EDGES: int = 1000
+
+# Neighbour tables and lists by board shape (see Board)
+_neighbour_tables: dict[tuple[int, int], array] = {}
+_neighbour_lists: dict[tuple[int, int], tuple[tuple[int, ...], ...]] = {}
+
 class Pos(PosBase):
     """
     See ABC docstring.
+
+    Positions are immutable and hashable, so they can be used
+    in sets and as dict keys. Each Board keeps one interned
+    Pos per cell (see Board.pos), linked to its in-bounds
+    neighbours, so that stepping between cells of a board
+    returns existing objects instead of allocating new ones.
+
+    The attributes are kept in __slots__, but PosBase (in
+    base.py) does not define __slots__, so every Pos still has
+    a __dict__: the slots do not make positions any smaller.
+    Immutability comes from __setattr__, not from the slots.
     """
 
+    __slots__ = ("r", "c", "_neighbours")
+
     r: Row
     c: Col
+    _neighbours: tuple["Pos | None", ...] | None
 
     def __init__(self, r: Row, c: Col) -> None:
         """
         See ABC docstring.
         """
-        self.r = r
-        self.c = c
+        object.__setattr__(self, "r", r)
+        object.__setattr__(self, "c", c)
+        object.__setattr__(self, "_neighbours", None)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """
+        Positions cannot be modified after construction.
+        """
+        raise AttributeError("Pos is immutable")
+
+    def __hash__(self) -> int:
+        """
+        Hash consistently with equality (row and column).
+        """
+        return hash((self.r, self.c))
+
+    def __reduce__(self) -> tuple[type, tuple[Row, Col]]:
+        """
+        Pickle and copy as a plain (not interned) position.
+        """
+        return (Pos, (self.r, self.c))
+
+    def __repr__(self) -> str:
+        """
+        Display the position as a constructor call.
+        """
+        return f"Pos({self.r}, {self.c})"
 
     def take_step(self, step: Step) -> "Pos":
         """
         See ABC docstring.
         """
+        neighbours = self._neighbours
+        if neighbours is not None:
+            neighbour = neighbours[STEP_CODES[step]]
+            if neighbour is not None:
+                return neighbour
+
         row_dif: int
         col_dif: int
         row_dif, col_dif = STEPS[step]
@@ -43,27 +115,22 @@ class Pos(PosBase):
         """
         See ABC docstring.
         """
-        row_dif: int = other.r - self.r
-        col_dif: int = other.c - self.c
+        step = DELTA_STEPS.get((other.r - self.r, other.c - self.c))
+        if step is not None:
+            return step
 
-        if row_dif == 0 and col_dif == 0:
+        if other.r == self.r and other.c == self.c:
             raise ValueError("Cannot test difference from a position to itself")
-
-        for step, (r, c) in STEPS.items():
-            if (row_dif, col_dif) == (r, c):
-                return step
-
         raise ValueError("More than 1 Step Away")
 
     def is_adjacent_to(self, other: PosBase) -> bool:
         """
         See ABC docstring.
         """
-        try:
-            _ = self.step_to(other)
-        except ValueError:
-            return False
-        return True
+        row_dif: int = other.r - self.r
+        col_dif: int = other.c - self.c
+        return (-1 <= row_dif <= 1 and -1 <= col_dif <= 1
+                and (row_dif != 0 or col_dif != 0))
 
 ######################################################################
 
@@ -72,45 +139,129 @@ class Strand(StrandBase):
     """
     Strands, represented as a start position
     followed by a sequence of steps.
+
+    Strands are immutable. The steps are packed into one byte
+    each, and the positions, coordinates and footprint are
+    computed on first use and then reused, so a strand can be
+    queried repeatedly (and used as a dict key) for free.
+
+    As with Pos, StrandBase does not define __slots__, so
+    strands still have a __dict__ despite their own slots.
     """
 
+    __slots__ = ("start", "_packed", "_positions", "_footprint")
+
     start: PosBase
-    steps: list[Step]
+    _packed: bytes
+    _positions: tuple[PosBase, ...] | None
+    _footprint: frozenset[tuple[Row, Col]] | None
 
     def __init__(self, start: PosBase, steps: list[Step]):
         """
         See ABC docstring.
         """
-        self.start = start
-        self.steps = steps
+        object.__setattr__(self, "start", start)
+        object.__setattr__(self, "_packed",
+                           bytes([STEP_CODES[step] for step in steps]))
+        object.__setattr__(self, "_positions", None)
+        object.__setattr__(self, "_footprint", None)
+
+    @classmethod
+    def from_packed(cls, start: PosBase, packed: bytes) -> "Strand":
+        """
+        Build a strand from steps already encoded as by
+        packed_steps.
+        """
+        strand = cls.__new__(cls)
+        object.__setattr__(strand, "start", start)
+        object.__setattr__(strand, "_packed", bytes(packed))
+        object.__setattr__(strand, "_positions", None)
+        object.__setattr__(strand, "_footprint", None)
+        return strand
+
+    @property
+    def steps(self) -> list[Step]:
+        """
+        The steps of the strand (a new list on each access).
+        """
+        return [CODE_STEPS[code] for code in self._packed]
 
-    def positions(self) -> list[PosBase]:
+    @steps.setter
+    def steps(self, steps: list[Step]) -> None:
+        raise AttributeError("Strand is immutable")
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """
+        Strands cannot be modified after construction.
+        """
+        raise AttributeError("Strand is immutable")
+
+    def __eq__(self, other: object) -> bool:
         """
         See ABC docstring.
         """
-        pos: PosBase = self.start
-        pos_seq: list[PosBase] = [pos]
+        if isinstance(other, Strand):
+            return self._packed == other._packed and self.start == other.start
+        return super().__eq__(other)
 
-        for step in self.steps:
-            pos = pos.take_step(step)
-            pos_seq.append(pos)
+    def __hash__(self) -> int:
+        """
+        Hash consistently with equality (start and steps).
+        """
+        return hash((self.start.r, self.start.c, self._packed))
 
-        return pos_seq
+    def __reduce__(self) -> tuple[type, tuple[PosBase, list[Step]]]:
+        """
+        Pickle and copy by start and steps.
+        """
+        return (Strand, (self.start, self.steps))
 
-    def is_cyclic(self) -> bool:
+    def __len__(self) -> int:
         """
-        See ABC docstring.
+        Return the number of positions in the strand.
         """
-        elts = self.positions()
-        seen = set()
+        return len(self._packed) + 1
 
-        for elt in elts:
-            coord = (elt.r, elt.c)
-            if coord in seen:
-                return True
-            seen.add(coord)
+    def packed_steps(self) -> bytes:
+        """
+        Return the steps encoded as one byte per step (see
+        STEP_CODES).
+        """
+        return self._packed
 
-        return False
+    def positions(self) -> list[PosBase]:
+        """
+        See ABC docstring.
+        """
+        pos_seq = self._positions
+        if pos_seq is None:
+            pos: PosBase = self.start
+            seq: list[PosBase] = [pos]
+            for code in self._packed:
+                pos = pos.take_step(CODE_STEPS[code])
+                seq.append(pos)
+            pos_seq = tuple(seq)
+            object.__setattr__(self, "_positions", pos_seq)
+
+        return list(pos_seq)
+
+    def footprint(self) -> frozenset[tuple[Row, Col]]:
+        """
+        Return the set of (row, col) cells covered by the
+        strand. Strands that cover the same cells have equal
+        footprints, whatever order they visit them in.
+        """
+        cells = self._footprint
+        if cells is None:
+            cells = frozenset((p.r, p.c) for p in self.positions())
+            object.__setattr__(self, "_footprint", cells)
+        return cells
+
+    def is_cyclic(self) -> bool:
+        """
+        See ABC docstring.
+        """
+        return len(self.footprint()) != len(self)
 
     def is_folded(self) -> bool:
         positions = self.positions()
@@ -124,38 +275,222 @@ class Strand(StrandBase):
         return len(mids) != len(set(mids))
 
 
+def strand_footprint(strand: StrandBase) -> frozenset[tuple[Row, Col]]:
+    """
+    Return the set of (row, col) cells covered by any strand
+    (see Strand.footprint).
+    """
+    if isinstance(strand, Strand):
+        return strand.footprint()
+    return frozenset((p.r, p.c) for p in strand.positions())
+
+
+def scan_conflicts(strands: Sequence[Sequence[int]],
+                   num_cols: int) -> tuple[list[bool], list[tuple[int, int]]]:
+    """
+    Find the folded strands and the (sorted) crossing pairs of
+    strands i < j, one edge at a time, with a dict of edge keys
+    (see geometry.py, whose find_conflicts gives the same
+    result for large boards).
+    """
+    folded = [False] * len(strands)
+    crossings: set[tuple[int, int]] = set()
+    owners: dict[int, int] = {}
+    width = 2 * num_cols - 1
+    for i, cells in enumerate(strands):
+        for a, b in zip(cells, cells[1:]):
+            key = (a // num_cols + b // num_cols) * width + a % num_cols + b % num_cols
+            j = owners.get(key)
+            if j is None:
+                owners[key] = i
+            elif j == i:
+                folded[i] = True
+            else:
+                crossings.add((j, i))
+    return folded, sorted(crossings)
+
+
 ######################################################################
 
 
+def neighbour_table(rows: int, cols: int) -> array:
+    """
+    Return the neighbour table for a board of the given shape
+    (see Board). Tables are built once per shape and shared,
+    so they must not be modified.
+    """
+    table = _neighbour_tables.get((rows, cols))
+    if table is None:
+        table = array("i", [-1]) * (8 * rows * cols)
+        for r in range(rows):
+            for c in range(cols):
+                base = 8 * (r * cols + c)
+                for code, (dr, dc) in enumerate(CODE_DELTAS):
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols:
+                        table[base + code] = nr * cols + nc
+        _neighbour_tables[(rows, cols)] = table
+    return table
+
+
+def neighbour_lists(rows: int, cols: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Return, for each cell of a board of the given shape, the
+    IDs of its neighbours on the board (the entries of its
+    neighbour table other than -1). Shared per shape, like
+    the neighbour table.
+    """
+    lists = _neighbour_lists.get((rows, cols))
+    if lists is None:
+        table = neighbour_table(rows, cols)
+        lists = tuple(tuple(n for n in table[8 * i:8 * i + 8] if n >= 0)
+                      for i in range(rows * cols))
+        _neighbour_lists[(rows, cols)] = lists
+    return lists
+
+
 class Board(BoardBase):
     """
     Boards for the Strands game, consisting of a
     rectangular grid of letters.
+
+    The letters are stored row-major in a single bytes object,
+    so each cell has an integer ID, r * num_cols + c. A
+    neighbour table gives, for cell i and step code k (see
+    STEP_CODES), the neighbouring cell neighbours[8 * i + k],
+    or -1 if that step leaves the board. Searches over the
+    board can then work on cell IDs instead of positions.
+
+    For word searches (see word_paths), the board also keeps,
+    filled in as they are used, an index from letters to the
+    cells holding them, and a memo from each suffix searched
+    for to the cells it could be traced from.
     """
 
-    
+    _letters: bytes
+    _rows: int
+    _cols: int
+    _neighbours: array
+    _cells: list[Pos]
+    _adjacent: tuple[tuple[int, ...], ...]
+    _letter_cells: dict[int, tuple[int, ...]]
+    _suffix_cells: dict[bytes, frozenset[int]]
+
     def __init__(self, letters: list[list[str]]):
         """
         See ABC docstring.
         """
-        self.letters = letters
-        
-        correct_length = len(letters[0])
+        if not letters or not letters[0]:
+            raise ValueError("Board must have at least one row and column")
+        rows: int = len(letters)
+        cols: int = len(letters[0])
         for row in letters:
-            if len(row) != correct_length:
-                raise ValueError
+            if len(row) != cols:
+                raise ValueError("Board is not rectangular")
+            for letter in row:
+                if not (len(letter) == 1 and "a" <= letter <= "z"):
+                    raise ValueError(f"Invalid letter {letter!r} on board")
+
+        self._setup("".join("".join(row) for row in letters).encode(),
+                    rows, cols)
+
+    @classmethod
+    def from_letter_bytes(cls, letters: bytes, rows: int,
+                          cols: int) -> "Board":
+        """
+        Build a board from letters already validated and
+        packed as by letter_bytes, without checking them again.
+        """
+        board = cls.__new__(cls)
+        board._setup(letters, rows, cols)
+        return board
+
+    def _setup(self, letters: bytes, rows: int, cols: int) -> None:
+        """
+        Store the packed letters and build the neighbour and
+        interning tables.
+        """
+        self._letters = letters
+        self._rows = rows
+        self._cols = cols
+
+        neighbours = neighbour_table(rows, cols)
+        self._neighbours = neighbours
+
+        # Interning table: one Pos per cell, linked to its
+        # neighbours by step code (None off the board)
+        cells = [Pos(i // cols, i % cols) for i in range(rows * cols)]
+        for i, cell in enumerate(cells):
+            object.__setattr__(cell, "_neighbours", tuple(
+                [None if n < 0 else cells[n]
+                 for n in neighbours[8 * i:8 * i + 8]]))
+        self._cells = cells
+        self._adjacent = neighbour_lists(rows, cols)
+        self._letter_cells = {}
+        self._suffix_cells = {}
 
     def num_rows(self) -> int:
         """
         Return the number of rows on the board.
         """
-        return len(self.letters)
+        return self._rows
 
     def num_cols(self) -> int:
         """
         Return the number of columns on the board.
         """
-        return len(self.letters[0])
+        return self._cols
+
+    def num_cells(self) -> int:
+        """
+        Return the number of cells on the board.
+        """
+        return len(self._letters)
+
+    def pos(self, r: Row, c: Col) -> Pos:
+        """
+        Return the interned position for a cell of the board.
+
+        Raises ValueError if the position is not within the
+        bounds of the board.
+        """
+        return self._cells[self.cell_index(r, c)]
+
+    def cell_index(self, r: Row, c: Col) -> int:
+        """
+        Return the ID of the cell at (r, c).
+
+        Raises ValueError if the position is not within the
+        bounds of the board.
+        """
+        if not (0 <= r < self._rows and 0 <= c < self._cols):
+            raise ValueError("Position is not on the board")
+        return r * self._cols + c
+
+    def cell_pos(self, cell: int) -> Pos:
+        """
+        Return the interned position of a cell ID.
+        """
+        return self._cells[cell]
+
+    def neighbours(self) -> array:
+        """
+        Return the neighbour table (see the class docstring).
+        The table is shared and must not be modified.
+        """
+        return self._neighbours
+
+    def letter_at(self, cell: int) -> str:
+        """
+        Return the letter in a cell, given its ID.
+        """
+        return chr(self._letters[cell])
+
+    def letter_bytes(self) -> bytes:
+        """
+        Return every letter on the board, row-major, as bytes.
+        """
+        return self._letters
 
     def get_letter(self, pos: PosBase) -> str:
         """
@@ -164,27 +499,166 @@ class Board(BoardBase):
         Raises ValueError if the position is not within the
         bounds of the board.
         """
-        row: Row = pos.r
-        col: Col = pos.c
+        return chr(self._letters[self.cell_index(pos.r, pos.c)])
 
-        if row >= self.num_rows() or col >= self.num_cols():
-            raise ValueError("Position is not on the board")
+    def strand_cells(self, strand: StrandBase) -> tuple[int, ...]:
+        """
+        Return the IDs of the cells visited by a strand.
+
+        Raises ValueError if any of the strand's positions
+        are not within the bounds of the board.
+        """
+        if not isinstance(strand, Strand):
+            return tuple(self.cell_index(p.r, p.c) for p in strand.positions())
+
+        neighbours = self._neighbours
+        cell = self.cell_index(strand.start.r, strand.start.c)
+        cells = [cell]
+        for code in strand.packed_steps():
+            cell = neighbours[8 * cell + code]
+            if cell < 0:
+                raise ValueError("Strand leaves the board")
+            cells.append(cell)
+        return tuple(cells)
+
+    def evaluate_cells(self, cells: Iterable[int]) -> str:
+        """
+        Return the string of letters in the given cells.
 
-        return self.letters[row][col]
+        Raises ValueError if a cell ID is not on the board.
+        """
+        letters = self._letters
+        size = len(letters)
+        out = bytearray()
+        for cell in cells:
+            if not 0 <= cell < size:
+                raise ValueError("Cell is not on the board")
+            out.append(letters[cell])
+        return out.decode()
 
     def evaluate_strand(self, strand: StrandBase) -> str:
         """
         See ABC docstring.
         """
-        positions = strand.positions()
-        result = []
-        for elt in positions:
-            if (0 <= elt.r < self.num_rows()) and (0 <= elt.c < self.num_cols()):
-                result.append(self.get_letter(elt))
-            else:
-                raise ValueError
+        return self.evaluate_cells(self.strand_cells(strand))
 
-        return "".join(result)
+    def trace_words(self, trie: Dawg,
+                    min_length: int = 3) -> dict[str, set[CellPath]]:
+        """
+        Find every word in the trie (with at least min_length
+        letters) that can be traced on the board by a path of
+        neighbouring cells that never revisits a cell.
+
+        Returns a map from each word to the set of paths that
+        spell it, where a path is a tuple of cell IDs. Paths
+        are abandoned as soon as their letters are not a
+        prefix of any word.
+        """
+        letters: bytes = self._letters
+        neighbours: array = self._neighbours
+        found: dict[str, set[CellPath]] = {}
+        path: list[int] = []
+        on_path: bytearray = bytearray(len(letters))
+
+        def extend(cell: int, node: int, spelled: str) -> None:
+            letter = chr(letters[cell])
+            node = trie.child(node, letter)
+            if node == NO_NODE:
+                return
+            spelled += letter
+            path.append(cell)
+            on_path[cell] = 1
+            if len(path) >= min_length and trie.is_terminal(node):
+                found.setdefault(spelled, set()).add(tuple(path))
+            for n in neighbours[8 * cell:8 * cell + 8]:
+                if n >= 0 and not on_path[n]:
+                    extend(n, node, spelled)
+            path.pop()
+            on_path[cell] = 0
+
+        for cell in range(len(letters)):
+            extend(cell, ROOT, "")
+        return found
+
+    def cells_with(self, letter: str) -> tuple[int, ...]:
+        """
+        Return the IDs of the cells holding a (lowercase) letter.
+        """
+        code = ord(letter)
+        cells = self._letter_cells.get(code)
+        if cells is None:
+            letters = self._letters
+            found = []
+            cell = letters.find(code)
+            while cell >= 0:
+                found.append(cell)
+                cell = letters.find(code, cell + 1)
+            cells = self._letter_cells[code] = tuple(found)
+        return cells
+
+    def _starts(self, suffix: bytes) -> frozenset[int]:
+        """
+        Return the cells from which suffix could be traced, if
+        cells could be revisited. Memoised per suffix, so words
+        with a common ending share the work.
+        """
+        starts = self._suffix_cells.get(suffix)
+        if starts is None:
+            cells = self.cells_with(chr(suffix[0]))
+            if len(suffix) > 1 and cells:
+                rest = self._starts(suffix[1:])
+                adjacent = self._adjacent
+                cells = tuple(c for c in cells if not rest.isdisjoint(adjacent[c]))
+            starts = frozenset(cells)
+            self._suffix_cells[suffix] = starts
+        return starts
+
+    def word_paths(self, word: str) -> list[CellPath]:
+        """
+        Find every path of neighbouring cells that spells word
+        (in any case) without revisiting a cell. Paths are
+        tuples of cell IDs, and may fold.
+
+        The search only ever steps to a cell from which the
+        rest of the word could still be traced (see _starts),
+        so dead ends are cut off at once, however repetitive
+        the board's letters.
+        """
+        target = word.lower().encode()
+        if not target or not target.isalpha():
+            return []
+        live = [self._starts(target[i:]) for i in range(len(target))]
+        adjacent = self._adjacent
+        last = len(target) - 1
+        found: list[CellPath] = []
+        path: list[int] = []
+        on_path = bytearray(len(self._letters))
+
+        def extend(cell: int, i: int) -> None:
+            path.append(cell)
+            if i == last:
+                found.append(tuple(path))
+            else:
+                on_path[cell] = 1
+                following = live[i + 1]
+                for n in adjacent[cell]:
+                    if n in following and not on_path[n]:
+                        extend(n, i + 1)
+                on_path[cell] = 0
+            path.pop()
+
+        for cell in sorted(live[0]):
+            extend(cell, 0)
+        return found
+
+    def find_strands(self, word: str) -> list[Strand]:
+        """
+        Return every strand that spells word (see word_paths).
+        """
+        cells = self._cells
+        return [Strand(cells[path[0]], [cells[a].step_to(cells[b])
+                                        for a, b in zip(path, path[1:])])
+                for path in self.word_paths(word)]
 
 
 ######################################################################
@@ -194,7 +668,17 @@ class StrandsGame(StrandsGameBase):
     """
     Abstract base class for Strands game logic.
     """
-    def __init__(self, game_file: str | list[str], hint_threshold: int = 3) -> None:
+
+    _theme: str
+    _board: Board
+    _answers: list[tuple[str, StrandBase]]
+    _answer_cells: list[int]
+
+    def __init__(self, game_file: str | list[str] | GameSpec,
+                 hint_threshold: int = 3,
+                 dictionary: Container[str] | None = None,
+                 bonus_words: bool = False, cache: bool = False,
+                 trusted: bool = False) -> None:
         """
         Constructor
 
@@ -202,9 +686,38 @@ class StrandsGame(StrandsGameBase):
         a particular threshold for giving hints. The game
         file can be specified either as a string filename,
         or as the list of lines that result from calling
-        readlines() on the file.
-
-        Raises ValueError if the game file is invalid.
+        readlines() on the file, or as a GameSpec already
+        parsed by gamefile.parse_game.
+
+        The dictionary of valid (bonus) words defaults to the
+        process-wide dictionary from dictionary.py, which is
+        loaded once and shared by every game. A prebuilt
+        dictionary can be passed in instead.
+
+        If bonus_words is True, every dictionary word that can
+        be traced on the board is found up front (see
+        Board.trace_words), using the dictionary itself if it
+        is a Dawg, a Dawg built from it if it is any other
+        dictionary passed in that can be iterated over, and the
+        shared trie (keeping only the words in the dictionary)
+        otherwise. Submissions are then checked against that
+        map, and the number of bonus words left is available
+        from bonus_words_left.
+
+        If cache is True and the game file is a filename, the
+        compiled board cache is used (see boardcache.py): when
+        an entry for the file's contents exists it is loaded
+        without revalidating the file, and otherwise the file
+        is validated as usual and then added to the cache.
+
+        If trusted is True, the game file is a filename, and
+        the file's contents are listed in the manifest of
+        verified boards (see verified.py), the file is parsed
+        but the answers are not checked against the board.
+        Files that are not listed are validated as usual.
+
+        Raises GameFileError (a ValueError) if the game file is
+        invalid.
 
         Valid game files include:
 
@@ -246,112 +759,43 @@ class StrandsGame(StrandsGameBase):
            - that each answer strand has no folds
              (edges do not cross)
 
+           - that no two answer strands cross
+
            - that answers fill the board
 
         Game files are allowed to use multiple space
         characters to separate tokens on a line. Also,
         leading and trailing whitespace will be ignored.
         """
-        if isinstance(game_file, str):
-            with open(game_file, 'r') as f:
-                raw_lines = [line.rstrip('\n') for line in f]
+        if isinstance(game_file, GameSpec):
+            self._load_spec(game_file)
+        elif isinstance(game_file, str):
+            if cache or trusted:
+                self._load_file(game_file, cache, trusted)
+            else:
+                with open(game_file, 'r') as f:
+                    self._load_spec(parse_game(f))
         elif isinstance(game_file, list):
-            raw_lines = [line.rstrip('\n') for line in game_file]
+            self._load_spec(parse_game(game_file, lowercase_theme=True))
         else:
             raise ValueError("game_file must be a filename (str) or list[str]")
 
-        lines: list[str] = []
-        for ln in raw_lines:
-            ln = ln.strip()
-            if ln.lower().startswith("http"):
-                break
-            lines.append(ln)
-
-        blank_idcs: list[int] = [i for i, ln in enumerate(lines) if ln == ""]
-        if len(blank_idcs) < 2:
-            raise ValueError("Invalid game file")
-        first_blank: int = blank_idcs[0]
-        second_blank: int = blank_idcs[1]
-
-        theme_lines: list[str] = lines[0:first_blank]
-        board_lines: list[str] = lines[(first_blank + 1):second_blank]
-        answer_lines: list[str] = [ln for ln in lines[(second_blank + 1):] if ln]
-
-        if not answer_lines:
-            raise ValueError("No answers provided")
-        
-        if isinstance(game_file, list):
-            self._theme: str = theme_lines[0].lower()
-        else:
-            self._theme = theme_lines[0]
-
-        grid: list[list[str]] = []
-
-        for row in board_lines:
-            letters: list[str] = row.split()
-            if len(letters) != len(board_lines[0].split()):
-                raise ValueError("Invalid Strands Board (not rectangular)")
-            grid.append([letter.lower() for letter in letters])
-
-        self._board: Board = Board(grid)
-
-        self._answers: list[tuple[str, StrandBase]] = []
-        for line in answer_lines:
-            sections: list[str] = line.split()
-            word: str = sections[0].lower()
-
-            word = sections[0].lower()
-            if len(word) < 3:
-                raise ValueError(f"The word {word} is an answer with less than 3 letters")
-
-            r: int = int(sections[1]) - 1
-            c: int = int(sections[2]) - 1
-
-            if not (0 <= r < self._board.num_rows() and
-                    0 <= c < self._board.num_cols()):
-                raise ValueError(f"Starting position for {word} is off the board")
-
-            steps: list[Step] = [Step(tok.lower()) for tok in sections[3:]]
-
-            start: Pos = Pos(r, c)
-            pos = start
-            letters = [self._board.get_letter(pos)]
-            for st in steps:
-                pos = pos.take_step(st)
-                letters.append(self._board.get_letter(pos))
-                # Remark: calling "self._board.get_letter(pos)" checks if 
-                # positions other than the start are off the board
-            candidate = "".join(letters)
-            if candidate.lower() != word:
-                raise ValueError("Answer path spells a different word")
-            
-            self._answers.append((word, Strand(start, steps)))
-
-        for word, strand in self._answers:
-            if strand.is_folded():
-                raise ValueError(f"Answer strand for {word} is folded")
-        
-        covered = set()
-        for _, strand in self._answers:
-            for p in strand.positions():
-                covered.add((p.r, p.c))
-        all_cells = set()
-        for r in range(self._board.num_rows()):
-            for c in range(self._board.num_cols()):
-                all_cells.add((r,c))
-        if covered != all_cells:
-            raise ValueError("Board is not filled")
-
-        project_root = os.path.abspath(
-            os.path.join(os.path.dirname(__file__), os.pardir)
-        )
-        
-        dict_path = os.path.join(project_root, "assets", "web2.txt")
-        
-        with open(dict_path, "r") as dict_f:
-            self._dictionary: set[str] = {
-                w.strip().lower() for w in dict_f if w.strip()
-            }
+        shared = dictionary is None
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self._dictionary: Container[str] = dictionary
+
+        # Lookup tables from theme words and from cell masks
+        # to answer indices, and a bitmask of found answers
+        # (bit i set if answer i has been found)
+        self._word_answers: dict[str, tuple[int, ...]] = {}
+        self._mask_answers: dict[int, int] = {}
+        for idx, (word, _) in enumerate(self._answers):
+            self._word_answers[word] = self._word_answers.get(word, ()) + (idx,)
+            self._mask_answers.setdefault(self._answer_cells[idx], idx)
+        self._found_mask: int = 0
+        self._all_found: int = (1 << len(self._answers)) - 1
+        self._covered_mask: int = 0
 
         self._found: list[StrandBase] = []
         self._hint_threshold: int = hint_threshold
@@ -360,6 +804,156 @@ class StrandsGame(StrandsGameBase):
         self._bonus_words: set[str] = set()
         self._score: int = 0
 
+        # _trace_complete is False if only the words of the
+        # dictionary that are also in the shared trie were traced
+        self._traceable: dict[str, set[CellPath]] | None = None
+        self._trace_complete: bool = True
+        if bonus_words:
+            if isinstance(dictionary, Dawg):
+                self._traceable = self._board.trace_words(dictionary)
+            elif not shared and isinstance(dictionary, Iterable):
+                self._traceable = self._board.trace_words(
+                    Dawg.from_words(dictionary))
+            else:
+                # The shared trie may hold words the dictionary
+                # does not (and the other way round, if the shared
+                # dictionary was replaced), so only the dictionary's
+                # are kept, and it is still asked about the rest
+                traced = self._board.trace_words(get_trie())
+                self._traceable = {w: p for w, p in traced.items()
+                                   if w in dictionary}
+                self._trace_complete = False
+
+    def _load_file(self, game_file: str, cache: bool, trusted: bool) -> None:
+        """
+        Load a game file through the board cache and/or in
+        trusted mode (see the constructor).
+        """
+        with open(game_file, 'rb') as f:
+            data = f.read()
+        key = content_key(data)
+        if cache:
+            record = read_entry(key)
+            if record is not None:
+                self._restore(record)
+                return
+
+        spec = parse_game(io.StringIO(data.decode(), newline=None))
+        self._load_spec(spec, check=not (trusted and is_verified(key)))
+        if cache:
+            write_entry(key, self._record())
+
+    def _load_spec(self, spec: GameSpec, check: bool = True) -> None:
+        """
+        Check that the answers of a parsed game file fit its
+        board (see the constructor), and set the theme, board,
+        answers and answer cell masks. If check is False, the
+        spec must already be known to be valid (for example,
+        because it is verified), and is not checked.
+        """
+        self._theme = spec.theme
+        rows = len(spec.board)
+        cols = len(spec.board[0])
+        self._board = Board.from_letter_bytes("".join(spec.board).encode(),
+                                              rows, cols)
+
+        self._answers = []
+        if not check:
+            for ans in spec.answers:
+                start = self._board.pos(ans.row, ans.col)
+                self._answers.append((ans.word, Strand(start, list(ans.steps))))
+            self._answer_cells = [
+                self._cell_mask(strand) for _, strand in self._answers
+            ]
+            return
+
+        strand_cells: list[tuple[int, ...]] = []
+        for ans in spec.answers:
+            word = ans.word
+            if not 0 <= ans.row < rows:
+                raise GameFileError(f"Starting position for {word} is off the board",
+                                    ans.lineno, token_col(ans.line, 1))
+            if not 0 <= ans.col < cols:
+                raise GameFileError(f"Starting position for {word} is off the board",
+                                    ans.lineno, token_col(ans.line, 2))
+
+            answer: Strand = Strand(self._board.pos(ans.row, ans.col),
+                                    list(ans.steps))
+            # Remark: strand_cells checks that positions other
+            # than the start are on the board
+            try:
+                cells = self._board.strand_cells(answer)
+            except ValueError:
+                # Point at the first step that leaves the board
+                pos = answer.start
+                i = 0
+                for i, step in enumerate(ans.steps):
+                    pos = pos.take_step(step)
+                    if not (0 <= pos.r < rows and 0 <= pos.c < cols):
+                        break
+                raise GameFileError(f"Answer strand for {word} leaves the board",
+                                    ans.lineno, token_col(ans.line, 3 + i)) from None
+            if self._board.evaluate_cells(cells) != word:
+                raise GameFileError("Answer path spells a different word",
+                                    ans.lineno, token_col(ans.line, 0))
+
+            self._answers.append((word, answer))
+            strand_cells.append(cells)
+
+        # Folds and crossings are found for all the answers at
+        # once, with NumPy (imported only then) on large boards
+        if sum(len(cells) - 1 for cells in strand_cells) >= VECTOR_MIN_EDGES:
+            from geometry import find_conflicts
+            conflicts = find_conflicts(strand_cells, cols)
+            folded, crossings = conflicts.folded.tolist(), conflicts.crossings
+        else:
+            folded, crossings = scan_conflicts(strand_cells, cols)
+        for i, ans in enumerate(spec.answers):
+            if folded[i]:
+                raise GameFileError(f"Answer strand for {ans.word} is folded",
+                                    ans.lineno, token_col(ans.line, 0))
+        for i, j in crossings:
+            ans = spec.answers[j]
+            raise GameFileError(f"Answer strands for {spec.answers[i].word} "
+                                f"and {ans.word} cross",
+                                ans.lineno, token_col(ans.line, 0))
+
+        # Cell bitmasks: bit i stands for the cell with ID i
+        self._answer_cells = [
+            self._cell_mask(strand) for _, strand in self._answers
+        ]
+        covered = 0
+        for mask in self._answer_cells:
+            covered |= mask
+        if covered != (1 << (rows * cols)) - 1:
+            raise GameFileError("Board is not filled")
+
+    def _record(self) -> Record:
+        """
+        Return the compiled form of this game's (validated)
+        theme, board and answers, for the board cache.
+        """
+        answers = []
+        for word, strand in self._answers:
+            assert isinstance(strand, Strand)
+            answers.append((word, strand.start.r, strand.start.c,
+                            strand.packed_steps()))
+        return (self._theme, self._board.num_rows(), self._board.num_cols(),
+                self._board.letter_bytes(), tuple(answers),
+                tuple(self._answer_cells))
+
+    def _restore(self, record: Record) -> None:
+        """
+        Set the theme, board, answers and answer cell masks
+        from a record made by _record, without revalidating.
+        """
+        theme, rows, cols, letters, answers, answer_cells = record
+        self._theme = theme
+        self._board = Board.from_letter_bytes(letters, rows, cols)
+        self._answers = [(word, Strand.from_packed(self._board.pos(r, c), packed))
+                         for word, r, c, packed in answers]
+        self._answer_cells = list(answer_cells)
+
     def theme(self) -> str:
         """
         Return the theme for the game.
@@ -403,12 +997,7 @@ class StrandsGame(StrandsGameBase):
         checking whether or not all theme words have been
         found.
         """
-        for answer in self.answers():
-            theme_word, strand = answer
-            if strand not in self.found_strands():
-                return False
-
-        return True
+        return self._found_mask == self._all_found
 
     def hint_threshold(self) -> int:
         """
@@ -475,23 +1064,34 @@ class StrandsGame(StrandsGameBase):
 
         word = self._board.evaluate_strand(strand).lower()
 
-        theme_set = {w for w, _ in self._answers}
-        if word in theme_set:
-            for idx, (w, answer_strand) in enumerate(self._answers):
-                if w == word:
-                    if answer_strand in self._found:
-                        return "Already found"
-                    
-                    self._score += 10
-                    
-                    self._found.append(strand)
-                    if self._active_hint and self._active_hint[0] == idx:
-                        self._active_hint = None
-                    # Need to clear hint stuff if you find the word
-                    
-                    return (w, True)
-                
-        if word not in self._dictionary:
+        indices = self._word_answers.get(word)
+        if indices is not None:
+            idx = self._answer_for(word, strand, indices)
+            if self._found_mask >> idx & 1:
+                return "Already found"
+
+            self._score += 10
+
+            self._found.append(strand)
+            self._found_mask |= 1 << idx
+            self._covered_mask |= self._cell_mask(strand)
+            if self._active_hint and self._active_hint[0] == idx:
+                self._active_hint = None
+            # Need to clear hint stuff if you find the word
+
+            return (word, True)
+
+        if self._traceable is not None and not strand.is_cyclic():
+            # Every acyclic dictionary word on the board was
+            # found at load time, unless only the shared trie's
+            # were traced
+            in_word_list = (word in self._traceable
+                            or (not self._trace_complete
+                                and word in self._dictionary))
+        else:
+            in_word_list = word in self._dictionary
+
+        if not in_word_list:
             self._score -= 2
             return "Not in word list"
         
@@ -527,11 +1127,12 @@ class StrandsGame(StrandsGameBase):
         """
         if self._active_hint is None:
             self._score -= 5
-            for idx, (_, answer) in enumerate(self._answers):
-                if answer not in self._found:
-                    self._active_hint = (idx, False)
-                    self._hint_meter -= self._hint_threshold
-                    return self._active_hint
+            # Lowest answer whose found bit is clear
+            idx = (~self._found_mask & (self._found_mask + 1)).bit_length() - 1
+            if idx < len(self._answers):
+                self._active_hint = (idx, False)
+                self._hint_meter -= self._hint_threshold
+                return self._active_hint
 
             return "Use your current hint"
 
@@ -546,6 +1147,72 @@ class StrandsGame(StrandsGameBase):
 
         return "Use your current hint"
     
+    def covered_cells(self) -> int:
+        """
+        Return the cells covered by the found strands, as a
+        bitmask in which bit i is set if the cell with ID i
+        (see Board.cell_index) is covered.
+        """
+        return self._covered_mask
+
+    def num_covered(self) -> int:
+        """
+        Return the number of cells covered by found strands.
+        """
+        return self._covered_mask.bit_count()
+
+    def remaining_answers(self) -> int:
+        """
+        Return the number of theme words not yet found.
+        """
+        return len(self._answers) - self._found_mask.bit_count()
+
+    def _cell_mask(self, strand: StrandBase) -> int:
+        """
+        Return the bitmask of the cells covered by a strand
+        (see covered_cells). The strand must be on the board.
+        """
+        mask = 0
+        for cell in self._board.strand_cells(strand):
+            mask |= 1 << cell
+        return mask
+
+    def _answer_for(self, word: str, strand: StrandBase,
+                    indices: tuple[int, ...]) -> int:
+        """
+        Decide which answer a strand spelling the theme word
+        word (whose answers are indices) was aiming at: the
+        answer covering the same cells if there is one, then
+        the first one not yet found, then the first one.
+        """
+        idx = self._mask_answers.get(self._cell_mask(strand))
+        if idx is not None and self._answers[idx][0] == word:
+            return idx
+        for idx in indices:
+            if not self._found_mask >> idx & 1:
+                return idx
+        return indices[0]
+
+    def traceable_words(self) -> dict[str, set[CellPath]] | None:
+        """
+        Return the map from every word that can be traced on the
+        board to its paths, or None if the game was not created
+        with bonus_words=True.
+        """
+        return self._traceable
+
+    def bonus_words_left(self) -> int | None:
+        """
+        Return how many dictionary words (other than theme
+        words) can still be found on the board, or None if the
+        game was not created with bonus_words=True.
+        """
+        if self._traceable is None:
+            return None
+        theme_words = {w for w, _ in self._answers}
+        return sum(1 for w in self._traceable
+                   if w not in theme_words and w not in self._bonus_words)
+
     def get_score(self) -> int:
         """
         Return the player’s current score.
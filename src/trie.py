@@ -0,0 +1,379 @@
+"""
+Trie index over the Strands dictionary.
+
+A flat set of words can only answer "is this a word?". The
+Dawg class below also answers "can this be extended into a
+word?", which lets board searches and solvers abandon a path
+as soon as its letters stop being the prefix of any word.
+
+The trie is built as a minimised DAWG (directed acyclic word
+graph, a trie with identical suffixes merged) and packed into
+flat arrays:
+
+  - node i has edges first[i] .. first[i + 1] - 1,
+  - edge e is labelled with the byte labels[e] and leads to
+    node targets[e], with the labels of each node sorted,
+  - node i ends a word if terminal[i] is 1.
+
+Node 0 is the root. Nodes are plain integers, so callers can
+walk the graph one letter at a time with child().
+"""
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Iterable, Iterator
+
+from dictionary import DICT_PATH, PROJECT_ROOT, is_fresh
+
+import click
+
+ROOT: int = 0
+NO_NODE: int = -1
+
+COMPILED_PATH: str = os.path.join(PROJECT_ROOT, "assets", "web2.dawg")
+MAGIC: bytes = b"STRT"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sIII")
+
+_lock: threading.Lock = threading.Lock()
+_shared: "Dawg | None" = None
+
+
+class _BuildNode:
+    """
+    Mutable trie node, used only while building a Dawg.
+    """
+
+    __slots__ = ("edges", "terminal", "index")
+
+    edges: dict[int, "_BuildNode"]
+    terminal: bool
+    index: int
+
+    def __init__(self) -> None:
+        self.edges = {}
+        self.terminal = False
+        self.index = NO_NODE
+
+    def signature(self) -> tuple:
+        """
+        Return a key identifying this node's right language,
+        assuming its children have already been minimised.
+        """
+        return (self.terminal,
+                tuple((b, id(n)) for b, n in sorted(self.edges.items())))
+
+
+class Dawg:
+    """
+    Minimised, array-packed trie of lowercase words.
+    """
+
+    _first: array
+    _labels: bytes
+    _targets: array
+    _terminal: bytes
+    _count: int
+
+    def __init__(self, first: array, labels: bytes, targets: array,
+                 terminal: bytes, count: int) -> None:
+        """
+        Constructor
+
+        Takes the packed arrays directly; use from_words or
+        load to create a Dawg.
+        """
+        self._first = first
+        self._labels = labels
+        self._targets = targets
+        self._terminal = terminal
+        self._count = count
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "Dawg":
+        """
+        Build a Dawg containing the given words, lowercased.
+        Uses the incremental construction of Daciuk et al.,
+        which minimises the trie as sorted words are added.
+        """
+        keys = sorted({w.lower().encode() for w in words if w})
+
+        root = _BuildNode()
+        register: dict[tuple, _BuildNode] = {}
+        path: list[_BuildNode] = [root]
+        previous = b""
+
+        def minimise(down_to: int) -> None:
+            # Replace each unchecked node below path[down_to]
+            # with an equivalent registered node, if any
+            while len(path) - 1 > down_to:
+                node = path.pop()
+                parent = path[-1]
+                label = previous[len(path) - 1]
+                sig = node.signature()
+                same = register.get(sig)
+                if same is None:
+                    register[sig] = node
+                else:
+                    parent.edges[label] = same
+
+        for key in keys:
+            common = 0
+            limit = min(len(key), len(previous))
+            while common < limit and key[common] == previous[common]:
+                common += 1
+            minimise(common)
+            node = path[-1]
+            for label in key[common:]:
+                child = _BuildNode()
+                node.edges[label] = child
+                path.append(child)
+                node = child
+            node.terminal = True
+            previous = key
+        minimise(0)
+
+        # Pack breadth-first so each node's edges are contiguous
+        order: list[_BuildNode] = [root]
+        root.index = 0
+        i = 0
+        while i < len(order):
+            for _, child in sorted(order[i].edges.items()):
+                if child.index == NO_NODE:
+                    child.index = len(order)
+                    order.append(child)
+            i += 1
+
+        first = array("I", [0])
+        labels = bytearray()
+        targets = array("I")
+        terminal = bytearray()
+        for node in order:
+            for label, child in sorted(node.edges.items()):
+                labels.append(label)
+                targets.append(child.index)
+            first.append(len(labels))
+            terminal.append(node.terminal)
+
+        return cls(first, bytes(labels), targets, bytes(terminal), len(keys))
+
+    @classmethod
+    def load(cls, path: str = COMPILED_PATH) -> "Dawg":
+        """
+        Load a Dawg written by save.
+
+        Raises ValueError if the file is not a saved Dawg.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not a saved trie")
+        magic, version, num_nodes, num_edges = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a saved trie")
+
+        pos = HEADER.size
+        first = array("I", data[pos:pos + 4 * (num_nodes + 1)])
+        pos += 4 * (num_nodes + 1)
+        targets = array("I", data[pos:pos + 4 * num_edges])
+        pos += 4 * num_edges
+        labels = data[pos:pos + num_edges]
+        pos += num_edges
+        terminal = data[pos:pos + num_nodes]
+        pos += num_nodes
+        (count,) = struct.unpack_from("<I", data, pos)
+        if sys.byteorder != "little":
+            first.byteswap()
+            targets.byteswap()
+        return cls(first, labels, targets, terminal, count)
+
+    def save(self, path: str = COMPILED_PATH) -> None:
+        """
+        Write the packed arrays to a file, for load.
+        """
+        first = array("I", self._first)
+        targets = array("I", self._targets)
+        if sys.byteorder != "little":
+            first.byteswap()
+            targets.byteswap()
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.num_nodes(),
+                                self.num_edges()))
+            f.write(first.tobytes())
+            f.write(targets.tobytes())
+            f.write(self._labels)
+            f.write(self._terminal)
+            f.write(struct.pack("<I", self._count))
+        os.replace(tmp, path)
+
+    def __len__(self) -> int:
+        """
+        Return the number of words in the trie.
+        """
+        return self._count
+
+    def __contains__(self, word: object) -> bool:
+        """
+        Same as is_word, so a Dawg can be used wherever a
+        set of words is expected.
+        """
+        return isinstance(word, str) and self.is_word(word)
+
+    def num_nodes(self) -> int:
+        """
+        Return the number of nodes in the packed graph.
+        """
+        return len(self._terminal)
+
+    def num_edges(self) -> int:
+        """
+        Return the number of edges in the packed graph.
+        """
+        return len(self._labels)
+
+    def nbytes(self) -> int:
+        """
+        Return the size of the packed arrays, in bytes.
+        """
+        return (self._first.itemsize * len(self._first)
+                + self._targets.itemsize * len(self._targets)
+                + len(self._labels) + len(self._terminal))
+
+    def child(self, node: int, letter: str) -> int:
+        """
+        Return the node reached from node by the given
+        letter, or NO_NODE if there is no such edge.
+        """
+        code = ord(letter)
+        if code > 255:
+            return NO_NODE
+        edge = self._labels.find(code, self._first[node], self._first[node + 1])
+        if edge < 0:
+            return NO_NODE
+        return self._targets[edge]
+
+    def is_terminal(self, node: int) -> bool:
+        """
+        Decide whether or not the path to node spells a word.
+        """
+        return self._terminal[node] == 1
+
+    def children(self, node: int = ROOT) -> Iterator[tuple[str, int]]:
+        """
+        Yield (letter, child node) pairs for every edge out
+        of node, in alphabetical order.
+        """
+        for edge in range(self._first[node], self._first[node + 1]):
+            yield chr(self._labels[edge]), self._targets[edge]
+
+    def walk(self, prefix: str, node: int = ROOT) -> int:
+        """
+        Follow the letters of prefix from node, returning the
+        node reached, or NO_NODE if the path leaves the trie.
+        """
+        for letter in prefix:
+            node = self.child(node, letter)
+            if node == NO_NODE:
+                return NO_NODE
+        return node
+
+    def is_word(self, word: str) -> bool:
+        """
+        Decide whether or not word is in the trie.
+        """
+        node = self.walk(word)
+        return node != NO_NODE and self._terminal[node] == 1
+
+    def is_prefix(self, prefix: str) -> bool:
+        """
+        Decide whether or not some word in the trie starts
+        with prefix (every word is a prefix of itself).
+        """
+        return self.walk(prefix) != NO_NODE
+
+    def words(self, prefix: str = "") -> Iterator[str]:
+        """
+        Yield every word starting with prefix, in
+        alphabetical order.
+        """
+        start = self.walk(prefix)
+        if start == NO_NODE:
+            return
+        stack: list[tuple[int, str]] = [(start, prefix)]
+        while stack:
+            node, spelled = stack.pop()
+            if self._terminal[node]:
+                yield spelled
+            for letter, child in reversed(list(self.children(node))):
+                stack.append((child, spelled + letter))
+
+
+######################################################################
+
+
+def build_trie(path: str = DICT_PATH) -> Dawg:
+    """
+    Build a Dawg from a word list (one word per line).
+    """
+    with open(path, "r") as f:
+        return Dawg.from_words(w.strip() for w in f)
+
+
+def get_trie() -> Dawg:
+    """
+    Return the process-wide trie over the dictionary,
+    building it the first time it is needed. The saved trie
+    at COMPILED_PATH is loaded if it is newer than the word
+    list; otherwise the trie is built and then saved there
+    (if it can be), so that it is only built once. Safe to
+    call from multiple threads.
+    """
+    global _shared
+    trie = _shared
+    if trie is not None:
+        return trie
+
+    with _lock:
+        if _shared is None:
+            if is_fresh(DICT_PATH, COMPILED_PATH):
+                _shared = Dawg.load()
+            else:
+                _shared = build_trie()
+                try:
+                    _shared.save()
+                except OSError:
+                    pass
+        return _shared
+
+
+def set_trie(trie: Dawg | None) -> None:
+    """
+    Replace the process-wide trie (or forget it, if None).
+    """
+    global _shared
+    with _lock:
+        _shared = trie
+
+
+@click.group()
+def main() -> None:
+    """Trie tools."""
+
+
+@main.command("compile")
+@click.option("--src", default=DICT_PATH, show_default=True,
+              help="Word list to compile.")
+@click.option("--dest", default=COMPILED_PATH, show_default=True,
+              help="Where to write the packed trie.")
+def compile_command(src: str, dest: str) -> None:
+    """Build and save the trie for a word list."""
+    trie = build_trie(src)
+    trie.save(dest)
+    click.echo(f"Wrote {len(trie)} words ({trie.num_nodes()} nodes) to {dest}")
+
+
+if __name__ == "__main__":
+    main()
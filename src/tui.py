@@ -2,31 +2,29 @@
 TUI for Strands
 """
 
-# Remark I: The getch function is giving us a mypy error. I went to my TA 
-# to ask for help in discussion section, and he tried to help, but we could not
-# resolve the issue. He said it was fine if I submited as is with the mypy 
-# issues. 
-
-# Remark II: We have to define the type of the frame like it is done throughout
+# Remark: We have to define the type of the frame like it is done throughout
 # the code (i.e. not using ArtTUIBase) because we added a few attributes, and
 # we could not addd any attributes to ArtTUIBase (it says to not modify that 
 # file). Thus, we just said it was one of the sub-types, each has our attribute
 # with a type. 
 
+import io
 import sys
-import termios
-import tty
 import click
-import random
 import os
-import re
-
-ANSI_ESCAPE_PATTERN = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
+import shutil
+from contextlib import redirect_stdout
+from functools import cache
 
+from catalog import BOARD_DIR, load_catalog
 from strands import Pos, Strand, Board, StrandsGame
 from base import Step, PosBase, StrandBase, BoardBase, StrandsGameBase
-from art_tui import ArtTUIBase, ArtTUISpecial, ArtTUIWrappers, ArtTUICat1, ArtTUICat2
+from art_tui import (ArtTUIBase, ArtTUISpecial, ArtTUIWrappers, ArtTUICat1, ArtTUICat2,
+                     FrameStrings)
 from ui import ArtTUIStub
+from keys import Key, RawInput
+from overlay import Overlay, Viewport
+from screen import HIDE_CURSOR, SHOW_CURSOR, Screen
 
 key_Enter: int = 13
 key_Esc: int = 27
@@ -35,193 +33,89 @@ key_Dn: str = "\033[B"
 key_Rt: str = "\033[C"
 key_Lt: str = "\033[D"
 
-fdInput: int = sys.stdin.fileno()
-termAttr = termios.tcgetattr(0)
-
-def getch() -> str | int:
-    """
-    getch function from Canvas page
-    """
-    tty.setraw(fdInput)
-    ch = sys.stdin.buffer.raw.read(4).decode(sys.stdin.encoding)
-    if len(ch) == 1:
-        if ord(ch) < 32 or ord(ch) > 126:
-            ch = ord(ch)
-    elif ord(ch[0]) == 27:
-        ch = "\033" + ch[1:]
-    termios.tcsetattr(fdInput, termios.TCSADRAIN, termAttr)
-    return ch
-
+# The smallest viewport shown, however small the terminal
+MIN_VIEW_ROWS: int = 3
+MIN_VIEW_COLS: int = 6
 
 def update_display(strands: StrandsGame, connections: list[StrandBase], 
                    current_pos: Pos, selected: list[Pos], 
-                   frame: ArtTUISpecial | ArtTUIWrappers | ArtTUICat1 | ArtTUICat2 | ArtTUIStub) -> None:
+                   frame: ArtTUISpecial | ArtTUIWrappers | ArtTUICat1 | ArtTUICat2 | ArtTUIStub,
+                   screen: Screen | None = None, message: str = "",
+                   overlay: Overlay | None = None) -> None:
     """
     Given all the words that have been found, this function will print what
     the board looks like at a given time. The found words are highlighted, and
     there is a tracker of how many words you've found and how many hints you've
     used at the bottom of the game. There will also be highlighted text and 
     connections to indicate the characters you currently have selected.
+
+    If a screen is given, only the parts of the display that changed since
+    the last one are redrawn, in a single write. The message, if any, is
+    shown below the board. If an overlay is given, it keeps the rows of
+    the board between calls, so only the rows that changed are rebuilt,
+    and only the rows and columns in its viewport are shown.
     """
-    board: BoardBase = strands.board()
-    rows: int = board.num_rows()
-    columns: int = board.num_cols()
-    bold: str = "\033[1m"
-    reset: str = "\033[0m"
-    blue: str = "\033[34m"
-    green: str = "\033[32m"
-    red: str = "\033[31m"
-    pink: str = "\033[35m"
-
-    horiz: set[tuple[int, int]] = set()
-    vert: set[tuple[int, int]] = set()
-    diag_slash: set[tuple[int, int]] = set()
-    diag_backslash: set[tuple[int, int]] = set()
-    for strand in connections:
-        positions: list[PosBase] = strand.positions()
-        for i, _ in enumerate(positions[:-1]):
-            p1: PosBase = positions[i]
-            p2: PosBase = positions[i+1]
-            r1: int
-            c1: int
-            r1, c1 = p1.r, p1.c
-            r2: int
-            c2: int
-            r2, c2 = p2.r, p2.c
-            dr: int
-            dc: int
-            dr = r2 - r1
-            dc = c2 - c1
-            if dr == 0:
-                horiz.add((r1, min(c1, c2)))
-            elif dc == 0:
-                vert.add((min(r1, r2), c1))
-            else:
-                if (dr, dc) == (1, 1) or (dr, dc) == (-1, -1):
-                    diag_backslash.add((min(r1, r2), min(c1, c2)))
-                else:
-                    diag_slash.add((min(r1, r2), min(c1, c2)))
-
-    selected_horiz: set[tuple[int, int]] = set()
-    selected_vert: set[tuple[int, int]] = set()
-    selected_diag_slash: set[tuple[int, int]] = set()
-    selected_diag_backslash: set[tuple[int, int]] = set()
-    for i, _ in enumerate(selected[:-1]):
-        p_1: PosBase = selected[i]
-        p_2: PosBase = selected[i+1]
-        r_1: int
-        c_1: int
-        r_1, c_1 = p_1.r, p_1.c
-        r_2: int
-        c_2: int
-        r_2, c_2 = p_2.r, p_2.c
-        d_r: int
-        d_c: int
-        d_r = r_2 - r_1
-        d_c = c_2 - c_1
-        if d_r == 0:
-            selected_horiz.add((r_1, min(c_1, c_2)))
-        elif d_c == 0:
-            selected_vert.add((min(r_1, r_2), c_1))
-        else:
-            if (d_r, d_c) == (1, 1) or (d_r, d_c) == (-1, -1):
-                selected_diag_backslash.add((min(r_1, r_2), min(c_1, c_2)))
-            else:
-                selected_diag_slash.add((min(r_1, r_2), min(c_1, c_2)))
+    if overlay is None:
+        overlay = Overlay(strands.board())
+    rows_and_connectors: list[tuple[str, str]]
+    footer_text: str
+    rows_and_connectors, footer_text = display_rows(strands, connections,
+                                                    current_pos, selected, frame,
+                                                    overlay)
+    columns: int = overlay.viewport().cols
+    lines: list[str] = display_lines(frame, rows_and_connectors, footer_text,
+                                     strands.get_score(), columns)
+    if message:
+        lines.append(message)
+    if screen is None:
+        print("\n".join(lines))
+    else:
+        screen.draw(lines)
+
+def terminal_viewport(view: Viewport, 
+                      frame: ArtTUISpecial | ArtTUIWrappers | ArtTUICat1 | ArtTUICat2 | ArtTUIStub,
+                      board: Board, current_pos: Pos,
+                      size: os.terminal_size) -> Viewport:
+    """
+    Resizes the viewport to fit a terminal of the given size, along with
+    the frame, the footer and a message line, and scrolls it to keep the
+    cursor in view.
+    """
+    rows: int = (size.lines - 2 * frame.frame_width - 3) // 2
+    cols: int = (size.columns - 2 * (frame.frame_width + 1) + 2) // 4
+    view = Viewport(view.top, view.left, max(MIN_VIEW_ROWS, rows),
+                    max(MIN_VIEW_COLS, cols))
+    return view.follow(current_pos.r, current_pos.c, board.num_rows(), board.num_cols())
+
+def display_rows(strands: StrandsGame, connections: list[StrandBase], 
+                 current_pos: Pos, selected: list[Pos], 
+                 frame: ArtTUISpecial | ArtTUIWrappers | ArtTUICat1 | ArtTUICat2 | ArtTUIStub,
+                 overlay: Overlay | None = None
+                 ) -> tuple[list[tuple[str, str]], str]:
+    """
+    Builds each row of the board (with the connectors below it) and
+    the footer of the display (see update_display), and sets the
+    frame's interior width to fit them.
+
+    The rows are drawn by the overlay, which only draws again the rows
+    that changed since it was last used. Without one, every row is drawn.
+    """
+    if overlay is None:
+        overlay = Overlay(strands.board())
 
     hint: None | tuple[int, bool] = strands.active_hint()
-    hint_pos: set[tuple[int, int]] = set()
-    hint_end: set[tuple[int, int]] = set()
+    hint_pos: list[PosBase] = []
+    show_end: bool = False
     if hint is not None:
         i2: int
-        show_end: bool
         i2, show_end = hint
         _, hstrand = strands.answers()[i2]
-        hpos = hstrand.positions()
-        if show_end:
-            for p in hpos:
-                hint_pos.add((p.r, p.c))
-            hint_end.add((hpos[0].r, hpos[0].c))
-            hint_end.add((hpos[-1].r, hpos[-1].c))
-        else:
-            for p in hpos:
-                hint_pos.add((p.r, p.c))
-
-    found_pos: list[tuple[int, int]] = []
-    for strand in connections:
-        for p in strand.positions():
-            coord: tuple[int, int] = (p.r, p.c)
-            if coord not in found_pos:
-                found_pos.append(coord)
-
-    rows_and_connectors: list[tuple[str, str]] = []
-
-    for r in range(rows):
-        line_chars: list[str] = []
-        for c in range(columns):
-            letter = board.get_letter(Pos(r, c))
-            display: str
-            if (r, c) == (current_pos.r, current_pos.c):
-                display = bold + red + letter + reset
-            elif Pos(r, c) in selected:
-                display = bold + green + letter + reset
-            elif (r, c) in hint_pos:
-                if (r, c) in hint_end:
-                    display = bold + pink + letter + reset
-                else:
-                    display = pink + letter + reset
-            elif (r, c) in found_pos:
-                display = bold + blue + letter + reset
-            else:
-                display = letter
-            if c < columns - 1:
-                if (r, c) in selected_horiz:
-                    display = display + bold + green + " - " + reset
-                elif (r, c) in horiz:
-                    display = display + bold + blue + " - " + reset
-                else:
-                    display = display + "   "
-            else:
-                display = display + " "
-            line_chars.append(display)
-        row_line: str = "".join(line_chars)
-
-        between_rows: list[str] = []
-        for _ in range(4 * columns - 2):
-            between_rows.append(" ")
-        if r < rows - 1:
-            for rr, cc in vert:
-                if rr == r:
-                    between_rows[cc * 4] = bold + blue + "|" + reset
-            for rr, cc in diag_slash:
-                if rr == r and between_rows[cc * 4 + 2] == " ":
-                    between_rows[cc * 4 + 2] = bold + blue + "/" + reset
-            for rr, cc in diag_backslash:
-                if rr == r and between_rows[cc * 4 + 2] == " ":
-                    between_rows[cc * 4 + 2] = bold + blue + "\\" + reset
-                elif rr == r and between_rows[cc * 4 + 2] == bold + blue + "/" + reset:
-                    between_rows[cc * 4 + 2] = bold + blue + "X" + reset
-
-            for rr, cc in selected_vert:
-                if rr == r:
-                    between_rows[cc * 4] = bold + green + "|" + reset
-            for rr, cc in selected_diag_slash:
-                if (rr == r 
-                    and between_rows[cc * 4 + 2] == bold + blue + "\\" + reset):
-                    between_rows[cc * 4 + 2] = bold + green + "X" + reset
-                elif rr == r:
-                    between_rows[cc * 4 + 2] = bold + green + "/" + reset
-            for rr, cc in selected_diag_backslash:
-                if (rr == r 
-                    and between_rows[cc * 4 + 2] != bold + blue + "\\" + reset 
-                    and between_rows[cc * 4 + 2] !=  " "):
-                    between_rows[cc * 4 + 2] = bold + green + "X" + reset
-                elif rr == r:
-                    between_rows[cc * 4 + 2] = bold + green + "\\" + reset
-            between_line = "".join(between_rows)
-            rows_and_connectors.append((row_line, between_line))
-        else:
-            rows_and_connectors.append((row_line, ""))  
+        hint_pos = hstrand.positions()
+
+    overlay.set_found(connections)
+    overlay.set_hint(hint_pos, show_end)
+    overlay.select(selected, current_pos)
+    rows_and_connectors: list[tuple[str, str]] = overlay.lines()
 
     found_count = len(connections)
     total = len(strands.answers())
@@ -229,39 +123,70 @@ def update_display(strands: StrandsGame, connections: list[StrandBase],
     hint_threshold = strands.hint_threshold()
     footer_text = f"Found {found_count}/{total}  Hint {hint_meter}/{hint_threshold}"
 
-    frame.interior_width = len(ANSI_ESCAPE_PATTERN.sub('', rows_and_connectors[0][0]))
-    frame.print_top_edge()
+    frame.interior_width = overlay.width()
+    return rows_and_connectors, footer_text
+
+@cache
+def stub_frame_strings(frame_width: int, interior_width: int) -> FrameStrings:
+    """
+    Builds the frame strings of an ArtTUIStub, which can only print
+    its edges and bars, by capturing what it prints.
+    """
+    stub: ArtTUIStub = ArtTUIStub(frame_width, interior_width)
+    parts: list[str] = []
+    for print_part in (stub.print_top_edge, stub.print_bottom_edge,
+                       stub.print_left_bar, stub.print_right_bar):
+        buffer: io.StringIO = io.StringIO()
+        with redirect_stdout(buffer):
+            print_part()
+        parts.append(buffer.getvalue())
+    top, bottom, left, right = parts
+    return FrameStrings(tuple(top.splitlines()), tuple(bottom.splitlines()),
+                        left, right.rstrip("\n"))
+
+def frame_strings(frame: ArtTUISpecial | ArtTUIWrappers | ArtTUICat1 | ArtTUICat2 | ArtTUIStub
+                  ) -> FrameStrings:
+    """
+    Returns the edges and bars of the frame at its current widths.
+    """
+    if isinstance(frame, ArtTUIStub):
+        return stub_frame_strings(frame.frame_width, frame.interior_width)
+    return frame.frame_strings()
+
+def display_lines(frame: ArtTUISpecial | ArtTUIWrappers | ArtTUICat1 | ArtTUICat2 | ArtTUIStub,
+                  rows_and_connectors: list[tuple[str, str]], footer_text: str,
+                  score: int, columns: int) -> list[str]:
+    """
+    Returns the lines of the display: the framed rows, footer and score.
+    """
+    strings: FrameStrings = frame_strings(frame)
+    left: str = strings.left
+    right: str = strings.right
+    lines: list[str] = list(strings.top)
     for row_line, between_line in rows_and_connectors:
-        frame.print_left_bar()
-        print(row_line, end="")
-        frame.print_right_bar()
+        lines.append(left + row_line + right)
         if row_line != rows_and_connectors[-1][0]:
-            frame.print_left_bar()
-            print(between_line, end="")
-            frame.print_right_bar()
-    
-    frame.print_left_bar()
-    print(footer_text + 
-          (" " * ((4 * columns) - (len(footer_text) + 2))), end = "")
-    frame.print_right_bar()
+            lines.append(left + between_line + right)
 
-    score_text = f"Score: {strands.get_score()}"
+    lines.append(left + footer_text + 
+                 (" " * ((4 * columns) - (len(footer_text) + 2))) + right)
+
+    score_text = f"Score: {score}"
     spaces = " " * ((4 * columns) - (len(score_text) + 2))
-    frame.print_left_bar()
-    print(score_text + spaces, end = "")
-    frame.print_right_bar()
+    lines.append(left + score_text + spaces + right)
 
-    frame.print_bottom_edge()
+    lines.extend(strings.bottom)
+    return lines
 
 def play_game(game_file: str, frame: ArtTUISpecial | ArtTUIWrappers | ArtTUICat1 | ArtTUICat2 | ArtTUIStub, 
               show: bool = False, hint_threshold: int = 3) -> None:
     """
     Allows for the game to be run in the terminal.
     """
-    game: StrandsGame = StrandsGame(game_file, hint_threshold)
-    current_pos = Pos(0, 0)
-    selected = [current_pos]
+    game: StrandsGame = StrandsGame(game_file, hint_threshold, cache=True, trusted=True)
     board: Board = game.board()
+    current_pos: Pos = board.pos(0, 0)
+    selected: list[Pos] = [current_pos]
     rows: int = board.num_rows()
     columns: int = board.num_cols()
     
@@ -269,68 +194,75 @@ def play_game(game_file: str, frame: ArtTUISpecial | ArtTUIWrappers | ArtTUICat1
         connections = []
         for _, strand in game.answers():
             connections.append(strand)
-        update_display(game, connections, Pos(0, 0), [], frame)
+        update_display(game, connections, current_pos, [], frame)
 
     else:
-        while not game.game_over():
-
-            update_display(game, game.found_strands(), current_pos, selected, frame)
-            key = getch()
-            key_dict = {"7": (-1, -1), "8": (-1, 0), "9": (-1, 1),
-                        "4": (0, -1), "6": (0, 1),
-                        "1": (1, -1), "2": (1, 0), "3": (1, 1)}
-            if key == "q":
-                break
-
-            elif isinstance(key, str) and key in key_dict:
-                dr, dc = key_dict[key]
-                new_r = current_pos.r + dr
-                new_c = current_pos.c + dc
-                if 0 <= new_r < rows and 0 <= new_c < columns:
-                    new_pos = Pos(new_r, new_c)
-                    if new_pos in selected:
-                        cut = selected.index(new_pos) + 1
-                        selected = selected[:cut]
-                    else:
-                        selected.append(new_pos)
-                    current_pos = new_pos
-
-            elif key == 27:
-                selected = [current_pos]
-
-            elif key == "h":
-                if game._hint_meter >= game.hint_threshold():
-                    game.use_hint()
-                else:
-                    print("Can't use a hint")
-                continue
-
-            elif key == 13 or key == "5":
-                steps_enum = []
-                for i, _ in enumerate(selected[:-1]):
-                    p1 = selected[i]
-                    p2 = selected[i+1]
-                    dr = p2.r - p1.r
-                    dc = p2.c - p1.c
-                    if (dr, dc) == (-1, 0):
-                        steps_enum.append(Step.N)
-                    elif (dr, dc) == (1, 0):
-                        steps_enum.append(Step.S)
-                    elif (dr, dc) == (0, 1):
-                        steps_enum.append(Step.E)
-                    elif (dr, dc) == (0, -1):
-                        steps_enum.append(Step.W)
-                    elif (dr, dc) == (-1, 1):
-                        steps_enum.append(Step.NE)
-                    elif (dr, dc) == (-1, -1):
-                        steps_enum.append(Step.NW)
-                    elif (dr, dc) == (1, 1):
-                        steps_enum.append(Step.SE)
-                    elif (dr, dc) == (1, -1):
-                        steps_enum.append(Step.SW)
-                game.submit_strand(Strand(selected[0], steps_enum))
-                selected = [current_pos]
-            update_display(game, game.found_strands(), current_pos, selected, frame)
+        screen: Screen = Screen()
+        overlay: Overlay = Overlay(board)
+        message: str = ""
+        key_dict = {"7": Step.NW, "8": Step.N, "9": Step.NE,
+                    "4": Step.W, "6": Step.E,
+                    "1": Step.SW, "2": Step.S, "3": Step.SE}
+        sys.stdout.write(HIDE_CURSOR)
+        try:
+            with RawInput() as keyboard:
+                quit_game: bool = False
+                last_size: os.terminal_size | None = None
+                while not quit_game and not game.game_over():
+
+                    # A resized terminal may have moved or cleared what
+                    # is on it, so the next frame is drawn from scratch
+                    size: os.terminal_size = shutil.get_terminal_size()
+                    if size != last_size:
+                        screen.reset()
+                        last_size = size
+                    overlay.set_viewport(terminal_viewport(overlay.viewport(), frame,
+                                                           board, current_pos, size))
+                    update_display(game, game.found_strands(), current_pos, selected,
+                                   frame, screen, message, overlay)
+                    message = ""
+                    # All the keys typed since the last frame are played
+                    # before drawing the next one
+                    try:
+                        keys: list[Key] = keyboard.read()
+                    except EOFError:
+                        break
+                    for key in keys:
+                        if key == "q":
+                            quit_game = True
+                            break
+
+                        elif isinstance(key, str) and key in key_dict:
+                            new_pos = current_pos.take_step(key_dict[key])
+                            if 0 <= new_pos.r < rows and 0 <= new_pos.c < columns:
+                                if new_pos in selected:
+                                    cut = selected.index(new_pos) + 1
+                                    selected = selected[:cut]
+                                else:
+                                    selected.append(new_pos)
+                                current_pos = new_pos
+
+                        elif key == key_Esc:
+                            selected = [current_pos]
+
+                        elif key == "h":
+                            if game._hint_meter >= game.hint_threshold():
+                                game.use_hint()
+                            else:
+                                message = "Can't use a hint"
+
+                        elif key == key_Enter or key == "5":
+                            steps_enum = [selected[i].step_to(selected[i + 1])
+                                          for i in range(len(selected) - 1)]
+                            game.submit_strand(Strand(selected[0], steps_enum))
+                            selected = [current_pos]
+                            if game.game_over():
+                                break
+                update_display(game, game.found_strands(), current_pos, selected,
+                               frame, screen, overlay=overlay)
+        finally:
+            sys.stdout.write(SHOW_CURSOR)
+            sys.stdout.flush()
 
 
 @click.command()
@@ -363,23 +295,22 @@ def main(show: bool, special: bool, game: str | None, hint: int, art: str | None
     if special:
         game_file = os.path.join("assets", "Customized.txt")
     else:
-        board = "boards"
         try:
-            files = os.listdir(board)
+            catalog = load_catalog()
         except OSError:
-            click.echo(f"Cannot list '{board}'", err=True)
-            sys.exit(1)
-        games = [f[:-4] for f in files if f.lower().endswith(".txt")]
-        if not games:
-            click.echo(f"No .txt files in '{board}'", err=True)
+            click.echo(f"Cannot list '{BOARD_DIR}'", err=True)
             sys.exit(1)
-        if not game or game not in games:
+        entry = catalog.get(game) if game else None
+        if entry is None:
             if game:
                 click.echo(f"Unknown game '{game}', picking random.", err=True)
-            game = random.choice(games)
-        game_file = os.path.join(board, f"{game}.txt")
+            entry = catalog.choose()
+            if entry is None:
+                click.echo(f"No games in '{BOARD_DIR}'", err=True)
+                sys.exit(1)
+        game_file = catalog.path(entry)
 
-    strandgame: StrandsGame = StrandsGame(game_file, hint)
+    strandgame: StrandsGame = StrandsGame(game_file, hint, cache=True, trusted=True)
     interior = 4 * (strandgame.board().num_cols() - 1) + 1
 
     frame: ArtTUISpecial | ArtTUIWrappers | ArtTUICat1 | ArtTUICat2 | ArtTUIStub
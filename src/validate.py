@@ -0,0 +1,203 @@
+"""
+Bulk validator for Strands game files.
+
+Checks every game file under the given paths (directories are
+searched recursively for *.txt files) across a pool of worker
+processes, and reports each invalid file with the line and
+column the problem was found at:
+
+    python3 src/validate.py boards/
+    python3 src/validate.py --json -j 8 submissions/
+
+The exit status is 1 if any file is invalid, so the validator
+can be used as a CI check. With --json, a machine-readable
+summary is printed instead of the per-file report.
+
+With --stamp, the hashes of the valid files are recorded in the
+manifest of verified boards (see verified.py), so that they can
+be loaded in trusted mode without being validated again:
+
+    python3 src/validate.py --stamp assets/verified.sha256 boards/
+
+Validation never consults the dictionary (bonus words play no
+part in whether a board is valid), so workers are given an
+empty one rather than each loading web2.txt.
+"""
+import io
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from boardcache import content_key
+from gamefile import GameFileError, parse_game
+from strands import StrandsGame
+from verified import read_manifest, write_manifest
+
+import click
+
+NO_WORDS: frozenset[str] = frozenset()
+
+
+class Result(NamedTuple):
+    """
+    The outcome of validating one game file. For valid files,
+    error is empty. lineno and col locate the problem, if it
+    is specific to a line (or column). digest is the hash of
+    the file's contents ("" if it could not be read).
+    """
+    path: str
+    error: str
+    lineno: int | None
+    col: int | None
+    digest: str
+
+    def is_valid(self) -> bool:
+        """
+        Decide whether or not the file is a valid game.
+        """
+        return not self.error
+
+    def describe(self) -> str:
+        """
+        Describe the problem as "path:line:col: error",
+        leaving out the line and column if they are not known.
+        """
+        where = self.path
+        if self.lineno is not None:
+            where += f":{self.lineno}"
+            if self.col is not None:
+                where += f":{self.col}"
+        return f"{where}: {self.error}"
+
+
+def find_game_files(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the given files, and every *.txt file under the
+    given directories, in sorted order within each directory.
+    Names are matched without surrounding whitespace, since
+    some shipped boards end in ".txt ".
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.strip().lower().endswith(".txt"):
+                    yield os.path.join(root, name)
+
+
+def validate_file(path: str) -> Result:
+    """
+    Validate a single game file.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return Result(path, str(e), None, None, "")
+    digest = content_key(data)
+    try:
+        spec = parse_game(io.StringIO(data.decode(), newline=None))
+        StrandsGame(spec, dictionary=NO_WORDS)
+    except GameFileError as e:
+        return Result(path, str(e), e.lineno, e.col, digest)
+    except ValueError as e:
+        return Result(path, str(e) or type(e).__name__, None, None, digest)
+    return Result(path, "", None, None, digest)
+
+
+def stamp(results: Iterable[Result], manifest: str) -> int:
+    """
+    Record the valid files among results in a manifest of
+    verified boards, and drop the invalid ones from it. Other
+    entries already in the manifest are kept. Returns the
+    number of files recorded.
+    """
+    base = os.path.dirname(os.path.abspath(manifest))
+    entries = read_manifest(manifest)
+    count = 0
+    for r in results:
+        name = os.path.relpath(os.path.abspath(r.path), base)
+        if r.is_valid():
+            entries[name] = r.digest
+            count += 1
+        else:
+            entries.pop(name, None)
+    write_manifest(entries.items(), manifest)
+    return count
+
+
+def validate_files(paths: list[str], jobs: int | None = None) -> Iterator[Result]:
+    """
+    Validate game files across jobs worker processes (one per
+    CPU by default), yielding results in the order of paths.
+    With jobs=1, files are validated in this process.
+    """
+    if jobs == 1 or len(paths) <= 1:
+        yield from map(validate_file, paths)
+        return
+
+    workers = jobs or os.cpu_count() or 1
+    # Boards are small, so hand them out in batches to keep
+    # the cost of talking to the workers down
+    chunksize = max(1, min(256, len(paths) // (4 * workers)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(validate_file, paths, chunksize=chunksize)
+
+
+######################################################################
+
+
+@click.command()
+@click.argument("paths", nargs=-1, required=True)
+@click.option("-j", "--jobs", type=int, default=None,
+              help="Number of worker processes (default: one per CPU).")
+@click.option("--json", "as_json", is_flag=True,
+              help="Print a JSON summary instead of a report.")
+@click.option("-q", "--quiet", is_flag=True, help="Only report invalid files.")
+@click.option("--stamp", "manifest", default=None,
+              help="Record the valid files in this manifest of verified boards.")
+def main(paths: tuple[str, ...], jobs: int | None, as_json: bool,
+         quiet: bool, manifest: str | None) -> None:
+    """Validate Strands game files."""
+    files = list(find_game_files(paths))
+    start = time.perf_counter()
+    results = list(validate_files(files, jobs))
+    seconds = time.perf_counter() - start
+    invalid = [r for r in results if not r.is_valid()]
+    rate = len(results) / seconds if seconds > 0 else 0.0
+    if manifest is not None:
+        stamped = stamp(results, manifest)
+        click.echo(f"Recorded {stamped} verified files in {manifest}", err=True)
+
+    if as_json:
+        summary = {
+            "files": len(results),
+            "valid": len(results) - len(invalid),
+            "invalid": len(invalid),
+            "seconds": round(seconds, 6),
+            "boards_per_second": round(rate, 1),
+            "errors": [{"path": r.path, "line": r.lineno, "col": r.col,
+                        "error": r.error} for r in invalid],
+        }
+        click.echo(json.dumps(summary, indent=2))
+    else:
+        for r in results:
+            if not r.is_valid():
+                click.echo(r.describe())
+            elif not quiet:
+                click.echo(f"{r.path}: ok")
+        click.echo(f"{len(results)} files, {len(invalid)} invalid, "
+                   f"{seconds:.3f} s ({rate:,.0f} boards/s)", err=True)
+
+    sys.exit(1 if invalid else 0)
+
+
+if __name__ == "__main__":
+    main()
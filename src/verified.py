@@ -0,0 +1,95 @@
+"""
+Manifest of verified game files.
+
+Boards that have been validated offline (see validate.py
+--stamp) can be listed, by the SHA-256 hash of their contents,
+in a manifest that ships with the repository. A game file whose
+contents are listed can then be loaded in trusted mode (see
+StrandsGame), which skips checking that the answers fit the
+board. Any change to a file changes its hash, so an edited file
+is validated again as usual.
+
+The manifest uses the format of sha256sum, so it can also be
+checked from the shell:
+
+    cd assets && sha256sum -c verified.sha256
+"""
+import os
+import threading
+from collections.abc import Iterable
+
+from dictionary import PROJECT_ROOT
+
+MANIFEST_PATH: str = os.path.join(PROJECT_ROOT, "assets", "verified.sha256")
+
+_lock: threading.Lock = threading.Lock()
+_manifest_path: str = MANIFEST_PATH
+_digests: frozenset[str] | None = None
+
+
+def read_manifest(path: str = MANIFEST_PATH) -> dict[str, str]:
+    """
+    Read a manifest into a dict from file name to digest.
+    Returns an empty dict if there is no manifest.
+    """
+    entries: dict[str, str] = {}
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                digest, sep, name = line.rstrip("\n").partition("  ")
+                if sep and len(digest) == 64:
+                    entries[name] = digest
+    except OSError:
+        pass
+    return entries
+
+
+def write_manifest(entries: Iterable[tuple[str, str]],
+                   path: str = MANIFEST_PATH) -> None:
+    """
+    Write (file name, digest) pairs to a manifest, sorted by
+    name. File names are relative to the manifest's directory.
+    """
+    lines = [f"{digest}  {name}\n" for name, digest in sorted(entries)]
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.writelines(lines)
+    os.replace(tmp, path)
+    reset_manifest()
+
+
+def is_verified(digest: str) -> bool:
+    """
+    Decide whether or not a file with the given content
+    digest (see boardcache.content_key) is in the manifest.
+    The manifest is read the first time it is needed.
+    """
+    global _digests
+    digests = _digests
+    if digests is None:
+        with _lock:
+            if _digests is None:
+                _digests = frozenset(read_manifest(_manifest_path).values())
+            digests = _digests
+    return digest in digests
+
+
+def set_manifest(path: str = MANIFEST_PATH) -> None:
+    """
+    Use a different manifest (or the default one, if no path
+    is given).
+    """
+    global _manifest_path, _digests
+    with _lock:
+        _manifest_path = path
+        _digests = None
+
+
+def reset_manifest() -> None:
+    """
+    Forget the digests read from the manifest, so that it is
+    read again when next needed.
+    """
+    global _digests
+    with _lock:
+        _digests = None
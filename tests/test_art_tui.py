@@ -0,0 +1,59 @@
+"""
+Tests for the TUI art frame strings
+"""
+import random
+
+import pytest
+
+from art_tui import (ArtTUICat1, ArtTUICat2, ArtTUISpecial, ArtTUIWrappers,
+                     FrameStrings, colors, reset)
+from tui import stub_frame_strings
+
+
+@pytest.mark.parametrize("frame, expected", [
+    (ArtTUIWrappers(2, 5),
+     FrameStrings(("#########", "@@@@@@@@@"), ("@@@@@@@@@", "#########"), "#@", "@#")),
+    (ArtTUIWrappers(1, 22),
+     FrameStrings(("#" * 24,), ("#" * 24,), "#", "#")),
+    (ArtTUIWrappers(0, 5), FrameStrings((), (), "", "")),
+    (ArtTUICat1(3, 5),
+     FrameStrings(("| | | | | |",) * 3, ("| | | | | |",) * 3, "| |", "| |")),
+    (ArtTUICat2(2, 5),
+     FrameStrings(("><><><><>",) * 2, ("><><><><>",) * 2, "><", "<>")),
+])
+def test_frame_strings(frame: ArtTUIWrappers | ArtTUICat1 | ArtTUICat2,
+                       expected: FrameStrings) -> None:
+    """
+    The frame strings are the text the frames used to print
+    one character or line at a time.
+    """
+    assert frame.frame_strings() == expected
+
+
+@pytest.mark.parametrize("frame_width, interior_width, expected", [
+    (1, 5, FrameStrings(("TOP------",), ("BOTTOM---",), "L ", " R")),
+    (2, 3, FrameStrings(("TOP------",) * 2, ("BOTTOM---",) * 2, "LL ", " RR")),
+])
+def test_stub_frame_strings(frame_width: int, interior_width: int,
+                            expected: FrameStrings) -> None:
+    """
+    The stub's frame strings are captured from what it prints.
+    """
+    assert stub_frame_strings(frame_width, interior_width) == expected
+
+
+def test_special_frame_strings() -> None:
+    """
+    The special frame's parts are each in one of its colors,
+    which stay the same from one frame to the next.
+    """
+    random.seed(5)
+    frame = ArtTUISpecial(1, 22)
+    strings = frame.frame_strings()
+    assert frame.frame_strings() == strings
+    top_color = strings.top[0][:-len("# SPECIAL STUFF         #" + reset)]
+    assert top_color in colors
+    assert strings.top == (top_color + "# SPECIAL STUFF         #" + reset,)
+    for bar in (strings.left, strings.right):
+        assert bar[:-len("#" + reset)] in colors
+        assert bar.endswith("#" + reset)
@@ -0,0 +1,107 @@
+"""
+Tests for the compiled board cache
+"""
+import os
+import shutil
+
+import pytest
+
+from boardcache import (clear_cache, content_key, entry_path, get_cache_dir,
+                        read_entry, set_cache_dir)
+from strands import StrandsGame
+
+BOARDS: list[str] = sorted(f for f in os.listdir("boards") if f.endswith(".txt"))
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """
+    Point the board cache at an empty temporary directory.
+    """
+    set_cache_dir(str(tmp_path / "cache"))
+    yield tmp_path / "cache"
+    set_cache_dir()
+
+
+def game_key(path: str) -> str:
+    """
+    Return the cache key for a game file.
+    """
+    with open(path, "rb") as f:
+        return content_key(f.read())
+
+
+def test_cached_game_matches_parsed_game(cache_dir) -> None:
+    """
+    A game loaded from the cache has the same theme, board
+    and answers as one parsed from the file.
+    """
+    path = "boards/face-time.txt"
+    parsed = StrandsGame(path)
+    assert read_entry(game_key(path)) is None
+
+    StrandsGame(path, cache=True)
+    assert read_entry(game_key(path)) is not None
+    cached = StrandsGame(path, cache=True)
+
+    assert cached.theme() == parsed.theme()
+    assert cached.answers() == parsed.answers()
+    rows, cols = parsed.board().num_rows(), parsed.board().num_cols()
+    assert (cached.board().num_rows(), cached.board().num_cols()) == (rows, cols)
+    assert cached.board().letter_bytes() == parsed.board().letter_bytes()
+
+    for word, strand in parsed.answers():
+        assert cached.submit_strand(strand) == (word, True)
+    assert cached.game_over()
+
+
+@pytest.mark.parametrize("name", BOARDS)
+def test_cache_round_trip_all_boards(cache_dir, name) -> None:
+    """
+    Every valid shipped board survives a trip through the
+    cache; invalid boards are rejected and never cached.
+    """
+    path = os.path.join("boards", name)
+    try:
+        parsed = StrandsGame(path, cache=True)
+    except ValueError:
+        with pytest.raises(ValueError):
+            StrandsGame(path, cache=True)
+        assert read_entry(game_key(path)) is None
+        return
+
+    cached = StrandsGame(path, cache=True)
+    assert cached.theme() == parsed.theme()
+    assert cached.answers() == parsed.answers()
+
+
+def test_cache_keyed_by_contents(cache_dir, tmp_path) -> None:
+    """
+    Editing a game file misses the cache rather than using
+    the stale entry.
+    """
+    path = tmp_path / "game.txt"
+    shutil.copy("boards/face-time.txt", path)
+    StrandsGame(str(path), cache=True)
+
+    text = path.read_text()
+    path.write_text(text.replace("Face time", "Face off", 1))
+    game = StrandsGame(str(path), cache=True)
+    assert game.theme() == '"Face off"'
+    assert len(os.listdir(get_cache_dir())) == 2
+
+
+def test_unreadable_entry_ignored(cache_dir) -> None:
+    """
+    A corrupt cache entry is treated as a miss and replaced.
+    """
+    path = "boards/face-time.txt"
+    key = game_key(path)
+    os.makedirs(get_cache_dir())
+    with open(entry_path(key), "wb") as f:
+        f.write(b"not a record")
+
+    game = StrandsGame(path, cache=True)
+    assert len(game.answers()) == len(StrandsGame(path).answers())
+    assert read_entry(key) is not None
+    assert clear_cache() == 1
@@ -0,0 +1,123 @@
+"""
+Tests for load-time bonus word precomputation
+"""
+import os
+import time
+
+import pytest
+
+from base import Step
+from dictionary import get_dictionary, set_dictionary
+from strands import Board, Pos, Strand, StrandsGame
+from trie import Dawg, get_trie
+
+HERE = os.path.dirname(__file__)
+BOARD_DIR = os.path.abspath(os.path.join(HERE, os.pardir, "boards"))
+
+
+def test_trace_words_small_board() -> None:
+    """
+    Every traceable word is found with all of its paths (as
+    cell IDs), and words needing a revisited cell are not.
+    """
+    board = Board([["c", "a"], ["t", "s"]])
+    trie = Dawg.from_words(["cat", "cats", "act", "acts", "tact", "sat", "at"])
+
+    found = board.trace_words(trie)
+    assert set(found) == {"cat", "cats", "act", "acts", "sat"}
+    assert found["cat"] == {(0, 1, 2)}
+    assert found["sat"] == {(3, 1, 2)}
+
+
+def test_bonus_words_match_dictionary() -> None:
+    """
+    Precomputing bonus words does not change the result of
+    any submission.
+    """
+    plain = StrandsGame("boards/face-time.txt")
+    fast = StrandsGame("boards/face-time.txt", bonus_words=True)
+
+    strands = [
+        Strand(Pos(1, 1), [Step.E, Step.NW, Step.W, Step.S, Step.S]),
+        Strand(Pos(6, 1), [Step.S, Step.E, Step.E]),
+        Strand(Pos(3, 2), [Step.W, Step.N, Step.W, Step.S]),
+        Strand(Pos(0, 0), [Step.E, Step.W, Step.E]),
+        fast.answers()[0][1],
+    ]
+    for strand in strands:
+        assert fast.submit_strand(strand) == plain.submit_strand(strand)
+    assert fast.get_score() == plain.get_score()
+
+    traceable = fast.traceable_words()
+    assert traceable is not None
+    assert "cancer" in traceable and "food" in traceable
+    assert plain.traceable_words() is None
+    assert plain.bonus_words_left() is None
+
+
+def test_bonus_words_left() -> None:
+    """
+    Finding a bonus word lowers the count of words left.
+    """
+    game = StrandsGame("boards/face-time.txt", bonus_words=True)
+    left = game.bonus_words_left()
+    assert left is not None and left > 0
+
+    assert game.submit_strand(Strand(Pos(6, 1), [Step.S, Step.E, Step.E])) \
+        == ("food", False)
+    assert game.bonus_words_left() == left - 1
+
+
+def test_bonus_words_use_given_dictionary() -> None:
+    """
+    With a dictionary that is not a Dawg, only its words are
+    bonus words.
+    """
+    food = Strand(Pos(6, 1), [Step.S, Step.E, Step.E])
+    game = StrandsGame("boards/face-time.txt", dictionary={"zzz"},
+                       bonus_words=True)
+    assert game.bonus_words_left() == 0
+    assert game.submit_strand(food) == "Not in word list"
+
+    game = StrandsGame("boards/face-time.txt", dictionary={"food"},
+                       bonus_words=True)
+    assert game.bonus_words_left() == 1
+    assert game.submit_strand(food) == ("food", False)
+
+
+def test_bonus_words_not_in_shared_trie() -> None:
+    """
+    A word in the given dictionary but not in the shared trie
+    is a bonus word, as it is without bonus_words.
+    """
+    cno = Strand(Pos(0, 0), [Step.E, Step.E])
+    assert "cno" not in get_trie()
+    for bonus_words in (False, True):
+        game = StrandsGame("boards/face-time.txt", dictionary={"cno"},
+                           bonus_words=bonus_words)
+        assert game.submit_strand(cno) == ("cno", False)
+    assert game.bonus_words_left() == 0
+
+    saved = get_dictionary()
+    try:
+        set_dictionary(frozenset({"cno"}))
+        game = StrandsGame("boards/face-time.txt", bonus_words=True)
+        assert game.submit_strand(cno) == ("cno", False)
+    finally:
+        set_dictionary(saved)
+
+
+@pytest.mark.parametrize("filename", sorted(os.listdir(BOARD_DIR)))
+def test_trace_words_fast(filename: str) -> None:
+    """
+    Precomputing bonus words takes well under a second
+    on every shipped board.
+    """
+    try:
+        game = StrandsGame(os.path.join(BOARD_DIR, filename))
+    except ValueError:
+        return
+    trie = get_trie()
+    start = time.perf_counter()
+    game.board().trace_words(trie)
+    assert time.perf_counter() - start < 0.5
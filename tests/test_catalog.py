@@ -0,0 +1,170 @@
+"""
+Tests for the board catalog
+"""
+import os
+import random
+import shutil
+
+import pytest
+
+import catalog
+from boardcache import set_cache_dir
+from catalog import Catalog, load_catalog
+
+
+@pytest.fixture
+def boards(tmp_path):
+    """
+    A small boards directory (three valid games and one
+    invalid one), with the board cache in a temporary
+    directory.
+    """
+    set_cache_dir(str(tmp_path / "cache"))
+    board_dir = tmp_path / "boards"
+    board_dir.mkdir()
+    for name in ["face-time", "directions", "cs-142", "shine-on"]:
+        shutil.copy(f"boards/{name}.txt", board_dir)
+    (board_dir / "notes.md").write_text("not a game\n")
+    yield str(board_dir), str(tmp_path / "catalog.index")
+    set_cache_dir()
+
+
+def test_catalog_entries(boards) -> None:
+    """
+    The catalog describes each game file without the caller
+    loading it.
+    """
+    board_dir, index = boards
+    cat = load_catalog(board_dir, index)
+
+    assert len(cat) == 4
+    assert [e.name for e in cat] == ["cs-142", "directions", "face-time",
+                                     "shine-on"]
+    entry = cat.get("face-time")
+    assert entry is not None and entry.is_valid()
+    assert entry.theme == '"Face time"'
+    assert (entry.num_rows, entry.num_cols) == (8, 6)
+    assert entry.num_answers == len(entry.word_lengths) == 6
+    assert sum(entry.word_lengths) == 48
+    assert entry.url.startswith("https://www.nytimes.com/games/strands")
+
+    invalid = cat.get("shine-on")
+    assert invalid is not None and not invalid.is_valid()
+    assert "off the board" in invalid.error
+    assert cat.path(entry) == os.path.join(board_dir, "face-time.txt")
+
+
+def test_catalog_selection(boards) -> None:
+    """
+    Random and filtered selection only ever picks valid
+    games that match.
+    """
+    board_dir, index = boards
+    cat = load_catalog(board_dir, index)
+    rng = random.Random(0)
+
+    names = set()
+    for _ in range(50):
+        entry = cat.choose(rng)
+        assert entry is not None
+        names.add(entry.name)
+    assert names == {"cs-142", "directions", "face-time"}
+    assert [e.name for e in cat.games(answers=6)] == ["face-time"]
+    entry = cat.choose(rng, rows=8, cols=6, answers=6)
+    assert entry is not None and entry.name == "face-time"
+    assert cat.choose(rng, rows=99) is None
+
+
+def test_catalog_persisted(boards, monkeypatch) -> None:
+    """
+    A saved index is reused without loading any game files
+    while the directory is unchanged.
+    """
+    board_dir, index = boards
+    first = load_catalog(board_dir, index)
+
+    def fail(*args: object) -> None:
+        raise AssertionError("game file loaded again")
+
+    monkeypatch.setattr(catalog, "scan_game", fail)
+    second = load_catalog(board_dir, index)
+    assert list(second) == list(first)
+    assert not second.update()
+
+
+def test_catalog_incremental(boards) -> None:
+    """
+    Adding, removing and editing files updates only the
+    affected entries.
+    """
+    board_dir, index = boards
+    cat = load_catalog(board_dir, index)
+
+    shutil.copy("boards/fore.txt", board_dir)
+    os.remove(os.path.join(board_dir, "cs-142.txt"))
+    assert cat.update()
+    assert cat.get("fore") is not None and cat.get("cs-142") is None
+    assert "fore" in {e.name for e in cat.games()}
+
+
+
+def edit_in_place(path: str, old: str, new: str) -> None:
+    """
+    Replace text in a file, making sure its modification time
+    changes (the directory's does not).
+    """
+    with open(path) as f:
+        text = f.read()
+    mtime_ns = os.stat(path).st_mtime_ns
+    with open(path, "w") as f:
+        f.write(text.replace(old, new, 1))
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+def test_catalog_files_edited_in_place(boards) -> None:
+    """
+    Editing a file in place leaves the directory unchanged, but
+    is noticed when the game is looked up or chosen, and when
+    the file of an invalid entry is edited.
+    """
+    board_dir, index = boards
+    load_catalog(board_dir, index)
+
+    edit_in_place(os.path.join(board_dir, "face-time.txt"),
+                  "Face time", "Face off")
+    cat = load_catalog(board_dir, index)
+    entry = cat.get("face-time")
+    assert entry is not None and entry.theme == '"Face off"'
+    assert load_catalog(board_dir, index).get("face-time") == entry
+
+    edit_in_place(os.path.join(board_dir, "directions.txt"),
+                  "\n\n", "\n\n\n\n")
+    cat = load_catalog(board_dir, index)
+    rng = random.Random(0)
+    names = set()
+    for _ in range(50):
+        chosen = cat.choose(rng)
+        assert chosen is not None
+        names.add(chosen.name)
+    assert names == {"cs-142", "face-time"}
+
+    edit_in_place(os.path.join(board_dir, "shine-on.txt"),
+                  "dazzle     4 8", "dazzle     4 6")
+    cat = load_catalog(board_dir, index)
+    # The next error in the file is found without a full update
+    assert not cat.update()
+    repaired = cat.get("shine-on")
+    assert repaired is not None and "radiate" in repaired.error
+
+
+def test_catalog_names_with_trailing_space(boards) -> None:
+    """
+    A file named "*.txt " is listed under its name without
+    the space, and its path is the file's own.
+    """
+    board_dir, index = boards
+    shutil.copy("boards/training-day.txt ", board_dir)
+    cat = load_catalog(board_dir, index)
+    entry = cat.get("training-day")
+    assert entry is not None and entry.is_valid()
+    assert cat.path(entry) == os.path.join(board_dir, "training-day.txt ")
@@ -0,0 +1,119 @@
+"""
+Tests for the shared dictionary
+"""
+import threading
+
+import pytest
+
+from dictionary import (MappedDictionary, compile_dictionary, get_dictionary,
+                        is_fresh, load_words, reset_dictionary,
+                        set_dictionary)
+from strands import Pos, Strand, StrandsGame
+from base import Step
+
+
+def test_dictionary_loaded_once() -> None:
+    """
+    Every game should share the same dictionary object.
+    """
+    game1 = StrandsGame("boards/face-time.txt")
+    game2 = StrandsGame("boards/directions.txt")
+
+    assert game1._dictionary is get_dictionary()
+    assert game2._dictionary is game1._dictionary
+    assert "cancer" in get_dictionary()
+
+
+def test_dictionary_thread_safe() -> None:
+    """
+    Concurrent first calls should all see a single dictionary.
+    """
+    reset_dictionary()
+    results = []
+
+    def worker() -> None:
+        results.append(get_dictionary())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 8
+    assert all(words is results[0] for words in results)
+
+
+def test_injected_dictionary() -> None:
+    """
+    A dictionary passed to the constructor (or installed with
+    set_dictionary) is used instead of web2.txt.
+    """
+    cancer = Strand(Pos(1, 1), [Step.E, Step.NW, Step.W, Step.S, Step.S])
+
+    game = StrandsGame("boards/face-time.txt", dictionary={"food"})
+    assert game.submit_strand(cancer) == "Not in word list"
+
+    saved = get_dictionary()
+    try:
+        set_dictionary(frozenset({"cancer"}))
+        game = StrandsGame("boards/face-time.txt")
+        assert game.submit_strand(cancer) == ("cancer", False)
+    finally:
+        set_dictionary(saved)
+
+
+def test_load_words_lowercase(tmp_path) -> None:
+    """
+    load_words lowercases entries and skips blank lines.
+    """
+    path = tmp_path / "words.txt"
+    path.write_text("Apple\n\nbanana\n")
+    assert load_words(str(path)) == frozenset({"apple", "banana"})
+
+
+def test_mapped_dictionary(tmp_path) -> None:
+    """
+    A compiled dictionary answers the same membership
+    queries as the set it was built from.
+    """
+    src = tmp_path / "words.txt"
+    src.write_text("Zebra\napple\n\nmango\napple\nap\n")
+    dest = tmp_path / "words.dict"
+
+    assert compile_dictionary(str(src), str(dest)) == 4
+    assert is_fresh(str(src), str(dest))
+
+    words = MappedDictionary(str(dest))
+    assert len(words) == 4
+    for word in ["ap", "apple", "mango", "zebra"]:
+        assert word in words
+    missing: list[object] = ["", "a", "app", "apples", "Zebra", "zzz", 42]
+    for other in missing:
+        assert other not in words
+    words.close()
+
+
+def test_mapped_dictionary_matches_web2(tmp_path) -> None:
+    """
+    Compiling web2.txt keeps every word in the word list.
+    """
+    dest = tmp_path / "web2.dict"
+    compile_dictionary(dest=str(dest))
+    words = MappedDictionary(str(dest))
+    expected = load_words()
+
+    assert len(words) == len(expected)
+    assert all(word in words for word in list(expected)[::97])
+    assert "cancer" in words and "cancerx" not in words
+    words.close()
+
+
+def test_mapped_dictionary_rejects_other_files(tmp_path) -> None:
+    """
+    Opening a file that is not a compiled dictionary fails.
+    """
+    path = tmp_path / "words.txt"
+    path.write_text("apple\nmango\n")
+    with pytest.raises(ValueError):
+        MappedDictionary(str(path))
@@ -0,0 +1,121 @@
+"""
+Tests for the streaming game-file parser
+"""
+from collections.abc import Iterator
+
+import pytest
+
+from base import Step
+from gamefile import GameFileError, parse_game
+from strands import StrandsGame
+
+with open("boards/face-time.txt") as f:
+    FACE_TIME: list[str] = f.readlines()
+
+
+def test_parse_face_time() -> None:
+    """
+    The spec holds the theme, board rows, answers and source.
+    """
+    spec = parse_game(FACE_TIME)
+    assert spec.theme == '"Face time"'
+    assert len(spec.board) == 8
+    assert spec.board[0] == "cnomze"
+    assert spec.url == "https://www.nytimes.com/games/strands (4/26/2025)"
+
+    first = spec.answers[0]
+    assert (first.word, first.row, first.col, first.lineno) == ("primer", 3, 3, 12)
+    assert first.steps == (Step.SE, Step.N, Step.E, Step.S, Step.S)
+    assert [a.word for a in spec.answers] == [w for w, _ in
+                                              StrandsGame(FACE_TIME).answers()]
+
+
+def test_parse_lowercase_theme() -> None:
+    """
+    The theme is only lowercased on request.
+    """
+    assert parse_game(FACE_TIME, lowercase_theme=True).theme == '"face time"'
+
+
+def test_parse_streams_lines() -> None:
+    """
+    Lines are read one at a time, and nothing after the
+    source line is read.
+    """
+    read: list[int] = []
+
+    def lines() -> Iterator[str]:
+        for i, line in enumerate(FACE_TIME + ["not a game line\n"]):
+            read.append(i)
+            yield line
+
+    spec = parse_game(lines())
+    assert spec.url
+    assert len(read) == len(FACE_TIME)
+
+
+def test_game_from_spec() -> None:
+    """
+    A game built from a parsed spec matches one loaded from
+    the file.
+    """
+    game = StrandsGame(parse_game(FACE_TIME))
+    expected = StrandsGame("boards/face-time.txt")
+    assert game.theme() == expected.theme()
+    assert game.answers() == expected.answers()
+
+
+@pytest.mark.parametrize("lineno, line, col, message", [
+    (4, "E C A N B", 10, "not rectangular"),
+    (4, "E C A N B R X", 13, "not rectangular"),
+    (5, "R A L K 0 R", 9, "Invalid letter '0'"),
+    (5, "R A L KO O R", 7, "Invalid letter 'ko'"),
+    (12, "primer 4 4 se n e s up", 21, "bad step 'up'"),
+    (12, "primer 4 four se n e s s", 10, "bad position 'four'"),
+    (12, "  pr 4 4 se", 3, "less than 3 letters"),
+    (12, "primer", 7, "no starting position"),
+    (12, "primer 4 9 se n e s s", 10, "off the board"),
+    (12, "primer 4 4 se n e s s s s s", 27, "leaves the board"),
+])
+def test_error_columns(lineno, line, col, message) -> None:
+    """
+    Errors point at the line and column of the offending token.
+    """
+    lines = list(FACE_TIME)
+    lines[lineno - 1] = line + "\n"
+    with pytest.raises(GameFileError, match=message) as info:
+        StrandsGame(lines)
+    assert (info.value.lineno, info.value.col) == (lineno, col)
+
+
+def test_layout_errors() -> None:
+    """
+    Files that are not laid out as game files are rejected.
+    """
+    with pytest.raises(GameFileError, match="Invalid game file") as info:
+        parse_game(["Theme", "", "a b c"])
+    assert (info.value.lineno, info.value.col) == (3, 6)
+    with pytest.raises(GameFileError, match="No answers") as info:
+        parse_game(["Theme", "", "a b c", "", ""])
+    assert (info.value.lineno, info.value.col) == (5, 1)
+    with pytest.raises(GameFileError, match="at least one row") as info:
+        parse_game(["Theme", "", "", "abc 1 1 e e"])
+    assert info.value.lineno == 3
+
+
+def test_http_lines_before_the_source() -> None:
+    """
+    Only a URL among the answers is taken as the source line;
+    a theme, board row or answer that starts with "http" is
+    read like any other line.
+    """
+    spec = parse_game(["HTTP Codes", "", "h t t p s", "x y z z y", "",
+                       "https 1 1 e e e e", "xyzzy 2 1 e e e e", "",
+                       "http://example.com", "not read"])
+    assert spec.theme == "HTTP Codes"
+    assert [a.word for a in spec.answers] == ["https", "xyzzy"]
+    assert spec.url == "http://example.com"
+
+    with pytest.raises(GameFileError, match="Invalid letter 'http'") as info:
+        parse_game(["Theme", "", "http", "", "abc 1 1 e e"])
+    assert (info.value.lineno, info.value.col) == (3, 1)
@@ -0,0 +1,63 @@
+"""
+Tests for the board generator
+"""
+import pytest
+
+from generator import generate_board
+from solver import solve_game
+from strands import StrandsGame
+
+FORE: list[str] = ["wood", "iron", "wedge", "driver", "putter", "chipper",
+                   "utility", "golfclubs"]
+
+
+def test_generated_board_loads() -> None:
+    """
+    A generated board is a valid game whose answers are the
+    theme words, and the solver finds its layout.
+    """
+    board = generate_board('"Fore!"', FORE, 8, 6, seed=1)
+    assert board is not None
+    game = StrandsGame(board.spec(), dictionary=frozenset())
+    assert game.theme() == '"Fore!"'
+    assert [word for word, _ in game.answers()] == FORE
+    assert (game.board().num_rows(), game.board().num_cols()) == (8, 6)
+
+    layout = {(p.word, frozenset(p.cells)) for p in board.answers}
+    solutions = solve_game(game).solutions
+    assert layout in [{(p.word, frozenset(p.cells)) for p in s} for s in solutions]
+
+
+def test_generation_is_seedable() -> None:
+    """
+    The same seed gives the same board.
+    """
+    first = generate_board("Golf", FORE, 8, 6, seed=5)
+    assert first is not None
+    assert generate_board("Golf", FORE, 8, 6, seed=5) == first
+
+
+@pytest.mark.parametrize("rows, cols", [(4, 4), (10, 10), (15, 15)])
+def test_generate_sizes(rows, cols) -> None:
+    """
+    Boards of other sizes can be generated.
+    """
+    words = ["abcde", "fghi", "jklmnop"] * (rows * cols // 16)
+    left = rows * cols - sum(map(len, words))
+    words += ["q" * 4] * (left // 4)
+    words[-1] += "r" * (left % 4)
+    board = generate_board("Letters", words, rows, cols, seed=0)
+    assert board is not None
+    StrandsGame(board.spec(), dictionary=frozenset())
+
+
+def test_generate_errors() -> None:
+    """
+    Words that cannot cover the board are rejected, and the
+    generator gives up when out of budget.
+    """
+    with pytest.raises(ValueError, match="48 letters"):
+        generate_board("Golf", FORE, 7, 6)
+    with pytest.raises(ValueError, match="Invalid theme word"):
+        generate_board("Golf", ["ab", "cdefghij"], 2, 5)
+    assert generate_board("Golf", FORE, 8, 6, seed=1, budget=0) is None
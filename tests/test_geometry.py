@@ -0,0 +1,132 @@
+"""
+Tests for vectorised fold and crossing detection
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from gamefile import GameFileError
+from geometry import find_conflicts
+from strands import VECTOR_MIN_EDGES, StrandsGame, scan_conflicts
+
+
+def test_straight_strands_are_clear() -> None:
+    """
+    Strands along their own rows neither fold nor cross.
+    """
+    conflicts = find_conflicts([[0, 1, 2], [3, 4, 5], [6, 7, 8]], 3)
+    assert conflicts.is_clear()
+    assert conflicts.folded.tolist() == [False, False, False]
+    assert conflicts.crossings == []
+
+
+def test_folded_strand() -> None:
+    """
+    A strand that crosses its own diagonal is folded, and the
+    others are not.
+    """
+    # 0 1
+    # 2 3: 0 -> 3 -> 1 -> 2 crosses 0-3 with 1-2
+    conflicts = find_conflicts([[0, 3, 1, 2], [4, 5]], 2)
+    assert conflicts.folded.tolist() == [True, False]
+    assert conflicts.crossings == []
+    assert not conflicts.is_clear()
+
+
+def test_crossing_strands() -> None:
+    """
+    Two strands using the two diagonals of a 2x2 square cross,
+    and each crossing pair is reported once.
+    """
+    strands = [[0, 4, 2, 6], [3, 1, 5, 7], [8, 9, 10, 11]]
+    conflicts = find_conflicts(strands, 4)
+    assert not conflicts.folded.any()
+    assert conflicts.crossings == [(0, 1)]
+
+
+@pytest.mark.parametrize("strands, num_cols", [
+    ([[0, 1, 2], [3, 4, 5], [6, 7, 8]], 3),
+    ([[0, 3, 1, 2], [4, 5]], 2),
+    ([[0, 4, 2, 6], [3, 1, 5, 7], [8, 9, 10, 11]], 4),
+    ([[0, 5, 2, 7], [4, 1, 6, 3], [0, 1, 0]], 4),
+    ([], 6),
+])
+def test_scan_matches_find_conflicts(strands: list[list[int]],
+                                     num_cols: int) -> None:
+    """
+    The pure-Python scan used for small boards finds the same
+    folds and crossings.
+    """
+    conflicts = find_conflicts(strands, num_cols)
+    assert scan_conflicts(strands, num_cols) == (conflicts.folded.tolist(),
+                                                 conflicts.crossings)
+
+
+def test_no_strands() -> None:
+    """
+    An empty layout is clear.
+    """
+    assert find_conflicts([], 6).is_clear()
+    assert find_conflicts([[5]], 6).is_clear()
+
+
+def test_shipped_boards_are_clear() -> None:
+    """
+    No answer strands on the valid shipped boards fold or cross.
+    """
+    for name in sorted(os.listdir("boards")):
+        if not name.endswith(".txt"):
+            continue
+        try:
+            game = StrandsGame(os.path.join("boards", name), dictionary=frozenset())
+        except ValueError:
+            continue
+        board = game.board()
+        strands = [board.strand_cells(s) for _, s in game.answers()]
+        assert find_conflicts(strands, board.num_cols()).is_clear(), name
+
+
+@pytest.mark.parametrize("answers, lineno, message", [
+    (["afbe 1 1 se n sw", "cdhg 1 3 e s w"], 6, "afbe is folded"),
+    (["abgh 1 1 e se e", "efcd 2 1 e ne e"], 7, "abgh and efcd cross"),
+])
+def test_loader_rejects_conflicts(answers: list[str], lineno: int,
+                                  message: str) -> None:
+    """
+    The loader reports a folded answer at its line, and two
+    crossing answers at the line of the second.
+    """
+    lines = ["Theme", "", "a b c d", "e f g h", ""] + answers
+    with pytest.raises(GameFileError, match=message) as info:
+        StrandsGame(lines)
+    assert info.value.lineno == lineno
+
+
+def test_loader_on_large_boards() -> None:
+    """
+    Boards with many answer edges are checked with
+    find_conflicts, and crossings are still reported.
+    """
+    rows, cols = 40, 30
+    assert rows * (cols - 1) >= VECTOR_MIN_EDGES
+    steps = " ".join(["e"] * (cols - 1))
+    lines = (["Theme", ""] + [" ".join("a" * cols)] * rows + [""]
+             + [f"{'a' * cols} {r + 1} 1 {steps}" for r in range(rows)])
+    assert len(StrandsGame(lines).answers()) == rows
+
+    lines[rows + 3] = "a" * cols + " 1 1 " + " ".join(["se", "ne"] * 14 + ["se"])
+    lines[rows + 4] = "a" * cols + " 2 1 " + " ".join(["ne", "se"] * 14 + ["ne"])
+    with pytest.raises(GameFileError, match="cross") as info:
+        StrandsGame(lines)
+    assert info.value.lineno == rows + 5
+
+
+def test_strands_does_not_import_numpy() -> None:
+    """
+    NumPy is only imported for large boards, not by the game
+    module itself.
+    """
+    code = "import sys, strands; assert 'numpy' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], cwd="src", check=True)
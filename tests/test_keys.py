@@ -0,0 +1,82 @@
+"""
+Tests for TUI keyboard input
+"""
+import os
+import pty
+import termios
+
+import pytest
+
+from keys import KeyDecoder, RawInput
+
+
+def test_keys_are_split() -> None:
+    """
+    Bytes read together are split into keys, with control
+    characters given as code points.
+    """
+    decoder = KeyDecoder()
+    assert decoder.feed(b"78\r\x1b[Ah\x1bOB") == ["7", "8", 13, "\033[A", "h",
+                                                   "\033OB"]
+    assert not decoder.pending()
+
+
+def test_split_escape_sequences_are_joined() -> None:
+    """
+    An escape sequence split across reads is put back together,
+    and so is a character split across reads.
+    """
+    decoder = KeyDecoder()
+    assert decoder.feed(b"4\x1b[") == ["4"]
+    assert decoder.pending()
+    assert decoder.feed(b"1;5C6") == ["\033[1;5C", "6"]
+    assert decoder.feed(b"\xc3") == []
+    assert decoder.feed(b"\xa9") == [233]
+
+
+def test_lone_escape() -> None:
+    """
+    An ESC on its own is the Esc key once nothing follows it.
+    """
+    decoder = KeyDecoder()
+    assert decoder.feed(b"\x1b") == []
+    assert decoder.flush() == [27]
+    assert decoder.feed(b"\x1b\x1b[B") == [27, "\033[B"]
+    assert not decoder.pending()
+
+
+def test_raw_input() -> None:
+    """
+    RawInput reads every key available from a terminal in raw
+    mode, and puts the terminal back afterwards.
+    """
+    master, slave = pty.openpty()
+    try:
+        before = termios.tcgetattr(slave)
+        with RawInput(slave) as keyboard:
+            assert termios.tcgetattr(slave) != before
+            assert keyboard.read(timeout=0) == []
+            os.write(master, b"89\x1b[D")
+            assert keyboard.read(timeout=1) == ["8", "9", "\033[D"]
+            os.write(master, b"\x1b")
+            assert keyboard.read(timeout=1) == [27]
+        assert termios.tcgetattr(slave) == before
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+def test_raw_input_restored_on_error() -> None:
+    """
+    The terminal is put back when leaving with an exception.
+    """
+    master, slave = pty.openpty()
+    try:
+        before = termios.tcgetattr(slave)
+        with pytest.raises(RuntimeError):
+            with RawInput(slave):
+                raise RuntimeError
+        assert termios.tcgetattr(slave) == before
+    finally:
+        os.close(master)
+        os.close(slave)
@@ -0,0 +1,129 @@
+"""
+Tests for the TUI overlay of found strands, hints and selections
+"""
+from base import Step
+from overlay import (BACKSLASH, BLUE, BOLD, GREEN, HORIZ, RED, RESET, SLASH, VERT,
+                     Overlay, Viewport, strand_links)
+from strands import Board, Pos, Strand
+
+
+def small_board() -> Board:
+    """
+    A 3x3 board with the letters a to i.
+    """
+    return Board([["a", "b", "c"], ["d", "e", "f"], ["g", "h", "i"]])
+
+
+def test_strand_links() -> None:
+    """
+    Links are keyed by the top left cell of their pair of cells,
+    whichever direction they are taken in.
+    """
+    positions = [Pos(1, 1), Pos(1, 0), Pos(0, 0), Pos(1, 1), Pos(0, 2)]
+    assert strand_links(positions) == [(1, 0, HORIZ), (0, 0, VERT),
+                                       (0, 0, BACKSLASH), (0, 1, SLASH)]
+
+
+def test_found_strands_are_drawn() -> None:
+    """
+    Found strands are drawn in blue, with their connectors, and
+    crossing diagonals are drawn as an X.
+    """
+    overlay = Overlay(small_board())
+    overlay.set_found([Strand(Pos(0, 0), [Step.E, Step.SW]),
+                       Strand(Pos(0, 0), [Step.SE])])
+    overlay.select([], Pos(2, 2))
+    lines = overlay.lines()
+    blue = BOLD + BLUE
+    assert lines[0][0] == (f"{blue}a{RESET}{blue} - {RESET}{blue}b{RESET}"
+                           "   c ")
+    assert lines[0][1] == f"  {blue}X{RESET}       "
+    assert lines[2] == (f"g   h   {BOLD + RED}i{RESET} ", "")
+
+
+def test_selection_is_drawn_over_found_strands() -> None:
+    """
+    The selection is drawn in green, over any found strand.
+    """
+    overlay = Overlay(small_board())
+    overlay.set_found([Strand(Pos(0, 0), [Step.S])])
+    overlay.select([Pos(0, 0), Pos(1, 0), Pos(1, 1)], Pos(1, 1))
+    lines = overlay.lines()
+    green = BOLD + GREEN
+    assert lines[0][0] == f"{green}a{RESET}   b   c "
+    assert lines[0][1] == f"{green}|{RESET}         "
+    assert lines[1][0] == (f"{green}d{RESET}{green} - {RESET}"
+                           f"{BOLD + RED}e{RESET}   f ")
+
+
+def test_only_changed_rows_are_drawn_again() -> None:
+    """
+    Moving the cursor within a row only draws that row again,
+    and the rows match those of an overlay drawn from scratch.
+    """
+    board = small_board()
+    overlay = Overlay(board)
+    overlay.set_found([Strand(Pos(2, 0), [Step.E, Step.E])])
+    overlay.select([Pos(0, 0)], Pos(0, 0))
+    before = overlay.lines()
+
+    overlay.select([Pos(0, 0), Pos(0, 1)], Pos(0, 1))
+    after = overlay.lines()
+    assert after[0] != before[0]
+    assert after[1] is before[1] and after[2] is before[2]
+
+    fresh = Overlay(board)
+    fresh.set_found([Strand(Pos(2, 0), [Step.E, Step.E])])
+    fresh.select([Pos(0, 0), Pos(0, 1)], Pos(0, 1))
+    assert fresh.lines() == after
+
+
+def test_hint_and_found_changes() -> None:
+    """
+    Hints are drawn in pink, and replacing the found strands
+    redraws the rows they were on.
+    """
+    board = small_board()
+    overlay = Overlay(board)
+    found = [Strand(Pos(1, 0), [Step.E])]
+    overlay.set_found(found)
+    overlay.set_hint([Pos(0, 0), Pos(0, 1)], True)
+    overlay.select([], Pos(2, 2))
+    assert "\033[35ma" in overlay.lines()[0][0]
+
+    overlay.set_hint([], False)
+    overlay.set_found([])
+    lines = overlay.lines()
+    assert lines[0][0] == "a   b   c "
+    assert lines[1][0] == "d   e   f "
+
+
+def test_viewport_follows_the_cursor() -> None:
+    """
+    The viewport scrolls as little as it can to keep the cursor
+    in view, and never past the edges of the board.
+    """
+    view = Viewport(0, 0, 3, 4)
+    assert view.follow(2, 3, 10, 10) == view
+    assert view.follow(4, 5, 10, 10) == Viewport(2, 2, 3, 4)
+    assert Viewport(5, 5, 3, 4).follow(4, 5, 10, 10) == Viewport(4, 5, 3, 4)
+    assert Viewport(8, 8, 3, 4).follow(9, 9, 10, 10) == Viewport(7, 6, 3, 4)
+    assert view.follow(1, 1, 2, 2) == Viewport(0, 0, 2, 2)
+
+
+def test_only_the_viewport_is_drawn() -> None:
+    """
+    Only the rows and columns in the viewport are drawn, with
+    the connectors between them.
+    """
+    overlay = Overlay(small_board())
+    overlay.set_found([Strand(Pos(1, 1), [Step.E, Step.SW])])
+    overlay.select([], Pos(0, 0))
+    overlay.set_viewport(Viewport(1, 1, 5, 2))
+    assert overlay.viewport() == Viewport(1, 1, 2, 2)
+    assert overlay.width() == 6
+    blue = BOLD + BLUE
+    assert overlay.lines() == [
+        (f"{blue}e{RESET}{blue} - {RESET}{blue}f{RESET} ", f"  {blue}/{RESET}   "),
+        (f"{blue}h{RESET}   i ", ""),
+    ]
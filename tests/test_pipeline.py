@@ -0,0 +1,114 @@
+"""
+Tests for the batch generation pipeline
+"""
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from boardcache import set_cache_dir
+from pipeline import Job, main, read_themes, run_job, run_jobs
+from solver import solve_game
+from strands import StrandsGame
+
+THEMES: str = """\
+# Golf, twice over
+Fore! | wood iron wedge driver putter chipper utility golfclubs
+
+Pets | cats dogs fish bird
+"""
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """
+    Keep journals in a temporary cache directory.
+    """
+    set_cache_dir(str(tmp_path / "cache"))
+    yield tmp_path / "cache"
+    set_cache_dir()
+
+
+def test_read_themes() -> None:
+    """
+    Themes are split from their words at the last "|".
+    """
+    assert read_themes(THEMES.splitlines()) == [
+        ("Fore!", ("wood", "iron", "wedge", "driver", "putter", "chipper",
+                   "utility", "golfclubs")),
+        ("Pets", ("cats", "dogs", "fish", "bird")),
+    ]
+    with pytest.raises(ValueError, match="line 2"):
+        read_themes(["A | abc", "no words"])
+
+
+def test_run_job() -> None:
+    """
+    An accepted board loads, its words tile it in only one
+    way, and the same job always makes the same board.
+    """
+    job = Job(7, "Pets", ("cats", "dogs", "fish", "bird"), 4, 4, 0)
+    assert job.name() == "0007-pets.txt"
+    result = run_job(job)
+    assert result.accepted() and not result.error
+    game = StrandsGame(result.lines, dictionary=frozenset())
+    assert solve_game(game).is_unique()
+    assert run_job(job).lines == result.lines
+
+
+def test_run_job_rejected() -> None:
+    """
+    Jobs whose words do not fit the board are rejected.
+    """
+    result = run_job(Job(1, "Pets", ("cats", "dogs"), 4, 4, 0))
+    assert not result.accepted()
+    assert "8 letters" in result.error
+
+
+def test_run_jobs_without_workers() -> None:
+    """
+    With one worker, jobs are run in this process, in order.
+    """
+    jobs = [Job(i, "Pets", ("cats", "dogs", "fish", "bird"), 4, 4, 0)
+            for i in (1, 2)]
+    results = list(run_jobs(jobs, 1))
+    assert [r.job for r in results] == jobs
+    assert {r.pid for r in results} == {os.getpid()}
+
+
+def test_run_jobs_with_workers() -> None:
+    """
+    With more than one worker, every job is run in a worker
+    process, making the same boards as in this process.
+    """
+    jobs = [Job(i, "Pets", ("cats", "dogs", "fish", "bird"), 4, 4, 0)
+            for i in (1, 2, 3)]
+    results = list(run_jobs(jobs, 2))
+    assert sorted(r.job for r in results) == jobs
+    assert os.getpid() not in {r.pid for r in results}
+    for r in results:
+        assert r.lines == run_job(r.job).lines
+
+
+def test_pipeline_resumes(cache_dir, tmp_path) -> None:
+    """
+    Accepted boards are written to the output directory, and
+    a second run skips the jobs already done.
+    """
+    themes = tmp_path / "themes.txt"
+    themes.write_text(THEMES)
+    out = tmp_path / "out"
+    args = [str(themes), "-o", str(out), "-j", "1"]
+
+    runner = CliRunner()
+    result = runner.invoke(main, args)
+    assert result.exit_code == 1
+    assert sorted(os.listdir(out)) == ["0001-fore.txt"]
+    StrandsGame(str(out / "0001-fore.txt"))
+
+    result = runner.invoke(main, args)
+    assert "Resuming: 2 of 2 jobs done" in result.output
+    assert sorted(os.listdir(out)) == ["0001-fore.txt"]
+
+    result = runner.invoke(main, args + ["--seed", "1"])
+    assert "Resuming" not in result.output
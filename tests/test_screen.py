@@ -0,0 +1,83 @@
+"""
+Tests for the TUI screen buffer
+"""
+import io
+
+from screen import CLEAR, RESET, Screen, move_to, parse_line, render_run
+
+BLUE: str = "\033[34m"
+BOLD: str = "\033[1m"
+
+
+def test_parse_line() -> None:
+    """
+    Style codes apply to the characters after them, until a
+    reset.
+    """
+    cells = parse_line(f"a{BOLD}{BLUE}b{RESET}c")
+    assert cells == [("a", ""), ("b", BOLD + BLUE), ("c", "")]
+    assert parse_line("") == []
+
+
+def test_render_run() -> None:
+    """
+    Styles are only switched where they change.
+    """
+    cells = [("a", BLUE), ("b", BLUE), ("c", ""), ("d", BOLD)]
+    assert render_run(cells) == f"{BLUE}ab{RESET}c{BOLD}d{RESET}"
+
+
+def test_first_frame_is_drawn_in_full() -> None:
+    """
+    The first frame clears the screen and draws every line.
+    """
+    screen = Screen(io.StringIO())
+    out = screen.render(["abc", "", "de"])
+    assert out.startswith(CLEAR)
+    assert move_to(0, 0) + "abc" in out and move_to(2, 0) + "de" in out
+
+
+def test_only_changes_are_drawn() -> None:
+    """
+    Later frames only draw the cells that changed, and clear
+    what is left of shorter lines and frames.
+    """
+    screen = Screen(io.StringIO())
+    screen.render(["abcdefghijklmnop", "second", "third"])
+    assert screen.render(["abcdefghijklmnop", "second", "third"]) == ""
+
+    out = screen.render(["abcXefghijklmnoY", "second", "third"])
+    assert out == (move_to(0, 3) + "X" + move_to(0, 15) + "Y"
+                   + move_to(3, 0))
+    out = screen.render(["abcXefghijklmnoY", f"se{BLUE}c{RESET}ond"])
+    assert out == (move_to(1, 2) + BLUE + "c" + RESET
+                   + move_to(2, 0) + "\033[J" + move_to(2, 0))
+    out = screen.render(["abcX", f"se{BLUE}c{RESET}ond"])
+    assert out == move_to(0, 4) + "\033[K" + move_to(2, 0)
+
+
+def test_nearby_changes_are_drawn_together() -> None:
+    """
+    Changes close together are drawn as one run.
+    """
+    screen = Screen(io.StringIO())
+    screen.render(["abcdef"])
+    assert screen.render(["XbcdeY"]) == move_to(0, 0) + "XbcdeY" + move_to(1, 0)
+
+
+def test_draw_writes_once() -> None:
+    """
+    Each frame is a single write, and unchanged frames are
+    not written at all.
+    """
+    out = io.StringIO()
+    screen = Screen(out)
+    screen.draw(["abc"])
+    screen.draw(["abc"])
+    screen.draw(["abd"])
+    assert screen.writes == 2
+    assert screen.bytes_written == len(out.getvalue())
+
+    screen.reset()
+    screen.draw(["abd"])
+    assert out.getvalue().count(CLEAR) == 2
@@ -0,0 +1,95 @@
+"""
+Tests for the exact-cover solver
+"""
+from solver import (ExactCover, Placement, answer_line, solve_board, solve_game,
+                    word_placements)
+from strands import Board, StrandsGame
+
+
+def test_exact_cover() -> None:
+    """
+    Knuth's example from "Dancing Links" has one solution.
+    """
+    problem = ExactCover(7)
+    rows = [[3, 5, 6], [1, 4, 7], [2, 3, 6], [1, 4], [2, 7], [4, 5, 7]]
+    for label, columns in enumerate(rows):
+        problem.add_row(columns, label)
+    assert [sorted(s) for s in problem.solutions()] == [[0, 3, 4]]
+    assert not problem.exhausted
+
+
+def test_exact_cover_secondary() -> None:
+    """
+    Secondary columns may be left uncovered, but not covered
+    twice.
+    """
+    problem = ExactCover(2, 1)
+    problem.add_row([1, 3], 0)
+    problem.add_row([2, 3], 1)
+    problem.add_row([2], 2)
+    assert sorted(sorted(s) for s in problem.solutions()) == [[0, 2]]
+
+
+def test_word_placements() -> None:
+    """
+    Every non-folded path spelling the word is found, once
+    per set of cells.
+    """
+    board = Board([["a", "b"], ["b", "a"]])
+    assert sorted(word_placements(board, "aba")) == [(0, 1, 3), (0, 2, 3)]
+    # a -> d -> b -> c crosses itself
+    board = Board([["a", "b"], ["c", "d"]])
+    assert word_placements(board, "adbc") == []
+    assert word_placements(board, "abdc") == [(0, 1, 3, 2)]
+
+
+def test_solve_face_time() -> None:
+    """
+    The answers of face-time are the only way to tile it.
+    """
+    game = StrandsGame("boards/face-time.txt", dictionary=frozenset())
+    result = solve_game(game)
+    assert result.is_unique()
+    board = game.board()
+    expected = {(word, frozenset(board.strand_cells(s)))
+                for word, s in game.answers()}
+    assert {(p.word, frozenset(p.cells)) for p in result.solutions[0]} == expected
+    assert [p.word for p in result.solutions[0]] == [w for w, _ in game.answers()]
+
+
+def test_solve_ambiguous() -> None:
+    """
+    The words of directions can be laid out four ways, and
+    the search stops at the limit or when out of budget.
+    """
+    game = StrandsGame("boards/directions.txt", dictionary=frozenset())
+    result = solve_game(game)
+    assert result.num_solutions() == 4
+    assert result.complete and not result.is_unique()
+
+    limited = solve_game(game, limit=2)
+    assert limited.num_solutions() == 2
+    assert not limited.complete
+
+    starved = solve_game(game, budget=3)
+    assert starved.nodes == 3
+    assert not starved.complete
+
+
+def test_repeated_words() -> None:
+    """
+    A repeated word is placed once per copy, and each layout
+    is only counted once.
+    """
+    board = Board([list("abc"), list("abc")])
+    result = solve_board(board, ["abc", "abc"])
+    assert result.num_solutions() == 1
+    assert solve_board(board, ["abc"]).num_solutions() == 0
+
+
+def test_answer_line() -> None:
+    """
+    Placements are written as answer lines of a game file.
+    """
+    board = Board([list("abc"), list("def")])
+    assert answer_line(board, Placement("bfc", (1, 5, 2))) == "bfc 1 2 se n"
@@ -190,4 +190,250 @@ def test_scoring_face_time(ft_game) -> None:
     # 6) finally submit a theme word → +10
     word0, strand0 = ft_game.answers()[0]
     assert ft_game.submit_strand(strand0) == (word0, True)
-    assert ft_game.get_score() == 11
\ No newline at end of file
+    assert ft_game.get_score() == 11
+
+def test_pos_hashable_and_immutable() -> None:
+    """
+    Positions can be used in sets and as dict keys, and
+    cannot be modified.
+    """
+    assert len({Pos(1, 2), Pos(1, 2), Pos(2, 1)}) == 2
+    assert {Pos(0, 0): "a"}[Pos(0, 0)] == "a"
+
+    pos = Pos(1, 2)
+    with pytest.raises(AttributeError):
+        pos.r = 5
+    assert pos == Pos(1, 2)
+
+
+def test_board_interns_positions() -> None:
+    """
+    Board.pos returns one shared Pos per cell, and stepping
+    between cells of the board reuses those objects.
+    """
+    board = Board([['a', 'b', 'c'], ['d', 'e', 'f']])
+
+    assert board.pos(1, 1) is board.pos(1, 1)
+    assert board.pos(0, 0).take_step(Step.SE) is board.pos(1, 1)
+    assert board.pos(1, 2).take_step(Step.W) is board.pos(1, 1)
+
+    off_board = board.pos(0, 0).take_step(Step.N)
+    assert off_board == Pos(-1, 0)
+
+    with pytest.raises(ValueError):
+        board.pos(2, 0)
+
+    strand = Strand(board.pos(0, 0), [Step.E, Step.E, Step.S])
+    assert all(p is board.pos(p.r, p.c) for p in strand.positions())
+
+
+def test_pos_adjacency_to_itself() -> None:
+    """
+    A position is not adjacent to itself, and step_to
+    refuses to compute a step from a position to itself.
+    """
+    pos = Pos(3, 2)
+    assert not pos.is_adjacent_to(Pos(3, 2))
+    with pytest.raises(ValueError):
+        pos.step_to(Pos(3, 2))
+    assert all(pos.is_adjacent_to(pos.take_step(step)) for step in Step)
+
+
+def test_strand_immutable_and_hashable() -> None:
+    """
+    Equal strands hash equally and can be used as dict keys;
+    strands cannot be modified, and the steps list handed out
+    is a copy.
+    """
+    s1 = Strand(Pos(0, 0), [Step.E, Step.S, Step.W])
+    s2 = Strand(Pos(0, 0), [Step.E, Step.S, Step.W])
+    s3 = Strand(Pos(0, 0), [Step.S, Step.E, Step.N])
+
+    assert s1 == s2 and hash(s1) == hash(s2)
+    assert s1 != s3
+    assert {s1: "u"}[s2] == "u"
+    assert s1.packed_steps() == s2.packed_steps()
+    assert len(s1) == 4
+
+    with pytest.raises(AttributeError):
+        s1.steps = [Step.N]
+    with pytest.raises(AttributeError):
+        s1.start = Pos(1, 1)
+    s1.steps.append(Step.N)
+    assert s1.steps == [Step.E, Step.S, Step.W]
+
+
+def test_strand_positions_memoised() -> None:
+    """
+    positions() returns equal lists of the same Pos objects
+    on every call, and strands covering the same cells share
+    a footprint.
+    """
+    strand = Strand(Pos(1, 1), [Step.E, Step.S, Step.W])
+    first = strand.positions()
+    first.append(Pos(9, 9))
+    second = strand.positions()
+
+    assert second == [Pos(1, 1), Pos(1, 2), Pos(2, 2), Pos(2, 1)]
+    assert all(a is b for a, b in zip(first, second))
+
+    other = Strand(Pos(2, 1), [Step.E, Step.N, Step.W])
+    assert strand.footprint() == other.footprint()
+    assert strand.footprint() == {(1, 1), (1, 2), (2, 2), (2, 1)}
+
+
+def test_alternate_path_marks_answer_found() -> None:
+    """
+    Submitting a different path for a theme word finds that
+    answer: the answer's own strand is then "Already found"
+    and hints move on to the next answer.
+    """
+    game = StrandsGame("boards/i-get-around.txt")
+    idx = [w for w, _ in game.answers()].index("wheelie")
+
+    other_path = Strand(Pos(5, 0), [Step.E, Step.NE, Step.S, Step.E, Step.E, Step.E])
+    assert other_path != game.answers()[idx][1]
+    assert game.submit_strand(other_path) == ("wheelie", True)
+    assert game.submit_strand(game.answers()[idx][1]) == "Already found"
+    assert game.found_strands() == [other_path]
+
+    first_unfound = 1 if idx == 0 else 0
+    assert game.use_hint() == (first_unfound, False)
+
+
+def test_repeated_theme_word_uses_footprint() -> None:
+    """
+    When a theme word appears in two answers, the strand
+    covering an answer's cells finds that answer.
+    """
+    lines = [
+        "Twice", "",
+        "C A T",
+        "C A T",
+        "",
+        "cat 1 1 e e",
+        "cat 2 1 e e",
+    ]
+    game = StrandsGame(lines, dictionary=frozenset())
+    second = Strand(Pos(1, 0), [Step.E, Step.E])
+
+    assert game.submit_strand(second) == ("cat", True)
+    assert game.use_hint() == (0, False)
+    assert game.submit_strand(second) == "Already found"
+    assert game.submit_strand(game.answers()[0][1]) == ("cat", True)
+    assert game.active_hint() is None
+    assert game.game_over()
+
+
+def test_found_and_covered_bitmasks(dir_game) -> None:
+    """
+    covered_cells, num_covered and remaining_answers track
+    found answers as they are submitted.
+    """
+    cols = dir_game.board().num_cols()
+    total = len(dir_game.answers())
+    assert dir_game.covered_cells() == 0
+    assert dir_game.remaining_answers() == total
+
+    word, strand = dir_game.answers()[0]
+    assert dir_game.submit_strand(strand) == (word, True)
+    expected = 0
+    for p in strand.positions():
+        expected |= 1 << (p.r * cols + p.c)
+    assert dir_game.covered_cells() == expected
+    assert dir_game.num_covered() == len(strand.positions())
+    assert dir_game.remaining_answers() == total - 1
+
+    for _, strand in dir_game.answers()[1:]:
+        dir_game.submit_strand(strand)
+    assert dir_game.game_over()
+    assert dir_game.remaining_answers() == 0
+    assert dir_game.num_covered() == 7 * 4
+
+
+def test_answer_with_negative_position_rejected() -> None:
+    """
+    Answers that step off the top or left of the board are
+    rejected rather than wrapping around.
+    """
+    lines = ["Wrap", "", "A B", "C D", "", "bab 1 2 w w", "dcd 2 2 w w"]
+    with pytest.raises(ValueError):
+        StrandsGame(lines)
+
+
+def test_board_cells_and_neighbours() -> None:
+    """
+    Cells are numbered row-major, and the neighbour table
+    has one entry per step code, -1 where a step leaves the
+    board.
+    """
+    board = Board([['a', 'b', 'c'], ['d', 'e', 'f']])
+    assert board.num_cells() == 6
+    assert board.cell_index(1, 2) == 5
+    assert board.cell_pos(4) is board.pos(1, 1)
+    assert board.letter_at(4) == "e"
+    assert board.letter_bytes() == b"abcdef"
+
+    table = board.neighbours()
+    corner = [n for n in table[0:8] if n >= 0]
+    assert sorted(corner) == [1, 3, 4]
+    assert sorted(n for n in table[8 * 4:8 * 5] if n >= 0) == [0, 1, 2, 3, 5]
+
+    strand = Strand(board.pos(0, 0), [Step.SE, Step.E, Step.N])
+    assert board.strand_cells(strand) == (0, 4, 5, 2)
+    assert board.evaluate_cells([0, 4, 5, 2]) == "aefc"
+    with pytest.raises(ValueError):
+        board.evaluate_cells([6])
+    with pytest.raises(ValueError):
+        board.strand_cells(Strand(board.pos(0, 0), [Step.W]))
+
+
+@pytest.mark.parametrize("letters", [
+    [['a', 'b'], ['c']],
+    [['a', 'bb']],
+    [['a', '1']],
+    [['a', 'B']],
+    [],
+])
+def test_board_rejects_invalid_letters(letters) -> None:
+    """
+    Boards must be rectangular grids of single lowercase
+    letters.
+    """
+    with pytest.raises(ValueError):
+        Board(letters)
+
+
+def test_board_word_paths() -> None:
+    """
+    word_paths finds every non-revisiting path that spells a
+    word, in any case, and find_strands gives them as strands.
+    """
+    board = Board([['a', 'b', 'a'], ['b', 'a', 'c']])
+    assert board.cells_with("a") == (0, 2, 4)
+    assert board.cells_with("z") == ()
+    assert sorted(board.word_paths("abc")) == [(0, 1, 5), (2, 1, 5), (4, 1, 5)]
+    assert sorted(board.word_paths("ABA")) == [
+        (0, 1, 2), (0, 1, 4), (0, 3, 4), (2, 1, 0),
+        (2, 1, 4), (4, 1, 0), (4, 1, 2), (4, 3, 0)]
+    assert len(board.word_paths("abab")) == 6
+    assert board.word_paths("ababab") == []
+    assert board.word_paths("xyz") == [] and board.word_paths("") == []
+
+    strands = board.find_strands("abc")
+    assert [board.strand_cells(s) for s in strands] == board.word_paths("abc")
+    assert all(board.evaluate_strand(s) == "abc" for s in strands)
+
+
+def test_board_word_paths_repetitive() -> None:
+    """
+    On a board of one repeated letter, only paths that end on
+    the one different letter are followed.
+    """
+    letters = [['a'] * 6 for _ in range(8)]
+    letters[7][5] = 'b'
+    board = Board(letters)
+    paths = board.word_paths("aab")
+    assert len(paths) == 15
+    assert {p[-1] for p in paths} == {47}
+    assert all(len(set(p)) == 7 for p in board.word_paths("aaaaaab"))
@@ -0,0 +1,89 @@
+"""
+Tests for the dictionary trie
+"""
+import pytest
+
+from trie import NO_NODE, ROOT, Dawg
+
+WORDS = ["car", "card", "cards", "care", "cared", "cat", "cats", "dog",
+         "dogs", "bard", "bards", "Cart"]
+
+
+@pytest.fixture
+def dawg() -> Dawg:
+    return Dawg.from_words(WORDS)
+
+
+def test_is_word(dawg) -> None:
+    """
+    Exactly the (lowercased) input words are words.
+    """
+    assert len(dawg) == len(WORDS)
+    for word in WORDS:
+        assert dawg.is_word(word.lower())
+        assert word.lower() in dawg
+    for word in ["", "ca", "cars", "do", "bar", "cartz", "Cart"]:
+        assert not dawg.is_word(word)
+    assert 7 not in dawg
+
+
+def test_is_prefix(dawg) -> None:
+    """
+    Prefixes of words (including the words themselves)
+    are prefixes; nothing else is.
+    """
+    for prefix in ["", "c", "ca", "car", "card", "cared", "ba", "do"]:
+        assert dawg.is_prefix(prefix)
+    for prefix in ["a", "cb", "cardz", "dogz", "x"]:
+        assert not dawg.is_prefix(prefix)
+
+
+def test_children_and_walk(dawg) -> None:
+    """
+    Walking the graph one letter at a time agrees with walk.
+    """
+    assert [letter for letter, _ in dawg.children(ROOT)] == ["b", "c", "d"]
+
+    node = ROOT
+    for letter in "car":
+        node = dawg.child(node, letter)
+    assert node == dawg.walk("car")
+    assert dawg.is_terminal(node)
+    assert [letter for letter, _ in dawg.children(node)] == ["d", "e", "t"]
+    assert dawg.child(node, "z") == NO_NODE
+    assert dawg.walk("carz") == NO_NODE
+
+
+def test_words(dawg) -> None:
+    """
+    words() lists completions in alphabetical order.
+    """
+    assert list(dawg.words("car")) == ["car", "card", "cards", "care",
+                                       "cared", "cart"]
+    assert sorted(dawg.words()) == sorted(w.lower() for w in WORDS)
+    assert list(dawg.words("x")) == []
+
+
+def test_minimised(dawg) -> None:
+    """
+    Shared suffixes are merged: "card"/"bard" both end in the
+    same "d" -> "s" chain.
+    """
+    assert dawg.walk("card") == dawg.walk("bard")
+    assert dawg.num_nodes() < sum(len(w) for w in WORDS)
+
+
+def test_save_and_load(dawg, tmp_path) -> None:
+    """
+    A saved trie loads back with the same contents.
+    """
+    path = str(tmp_path / "words.dawg")
+    dawg.save(path)
+    loaded = Dawg.load(path)
+    assert sorted(loaded.words()) == sorted(dawg.words())
+    assert loaded.num_nodes() == dawg.num_nodes()
+
+    bad = tmp_path / "bad.dawg"
+    bad.write_bytes(b"not a trie at all")
+    with pytest.raises(ValueError):
+        Dawg.load(str(bad))
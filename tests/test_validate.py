@@ -0,0 +1,108 @@
+"""
+Tests for the bulk game-file validator
+"""
+import json
+import os
+import shutil
+
+import pytest
+from click.testing import CliRunner
+
+from strands import GameFileError, StrandsGame
+from validate import find_game_files, main, validate_file, validate_files
+
+with open("boards/face-time.txt") as f:
+    FACE_TIME: list[str] = f.readlines()
+
+
+@pytest.fixture
+def board_dir(tmp_path):
+    """
+    A directory with two valid games, one invalid game and a
+    file that is not a game file, one of them in a
+    subdirectory.
+    """
+    shutil.copy("boards/face-time.txt", tmp_path)
+    shutil.copy("boards/shine-on.txt", tmp_path)
+    (tmp_path / "more").mkdir()
+    shutil.copy("boards/cs-142.txt", tmp_path / "more")
+    (tmp_path / "README.md").write_text("not a game\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("lineno, line, message", [
+    (1, "", "No theme"),
+    (4, "E C A N B", "not rectangular"),
+    (5, "E C A N B 7", "Invalid letter"),
+    (12, "primer 2 2 e nw w s s", "spells a different word"),
+    (12, "cancer 2 x e nw w s s", "Invalid answer line"),
+    (12, "cancer 2", "Invalid answer line"),
+    (12, "cancer 2 2 n n n n n", "leaves the board"),
+    (12, "ca 2 2 e", "less than 3 letters"),
+])
+def test_errors_have_line_numbers(lineno, line, message) -> None:
+    """
+    Errors in a game file report the line they were found on.
+    """
+    lines = list(FACE_TIME)
+    lines[lineno - 1] = line + "\n"
+    with pytest.raises(GameFileError, match=message) as info:
+        StrandsGame(lines)
+    assert info.value.lineno == lineno
+
+
+def test_validate_file() -> None:
+    """
+    validate_file reports the error and line of invalid files.
+    """
+    assert validate_file("boards/face-time.txt").is_valid()
+
+    result = validate_file("boards/shine-on.txt")
+    assert not result.is_valid()
+    assert (result.lineno, result.col) == (13, 14)
+    assert result.describe() == ("boards/shine-on.txt:13:14: Starting position "
+                                 "for dazzle is off the board")
+    assert not validate_file("boards/no-such-board.txt").is_valid()
+
+
+def test_validate_files_in_parallel(board_dir) -> None:
+    """
+    Validating across worker processes gives the same results,
+    in the same order, as validating in this process.
+    """
+    files = list(find_game_files([str(board_dir)]))
+    assert [os.path.basename(f) for f in files] == [
+        "face-time.txt", "shine-on.txt", "cs-142.txt"]
+
+    serial = list(validate_files(files, jobs=1))
+    assert list(validate_files(files, jobs=2)) == serial
+    assert [r.is_valid() for r in serial] == [True, False, True]
+
+
+def test_find_game_files_with_trailing_space(tmp_path) -> None:
+    """
+    Files named "*.txt " (like some of the shipped boards)
+    are found too.
+    """
+    shutil.copy("boards/training-day.txt ", tmp_path)
+    shutil.copy("boards/face-time.txt", tmp_path)
+    files = list(find_game_files([str(tmp_path)]))
+    assert [os.path.basename(f) for f in files] == ["face-time.txt",
+                                                    "training-day.txt "]
+    assert all(r.is_valid() for r in validate_files(files, jobs=1))
+
+
+def test_validate_cli_json(board_dir) -> None:
+    """
+    The JSON summary counts the files and lists each error,
+    and the exit status is 1 when a file is invalid.
+    """
+    result = CliRunner().invoke(main, ["--json", "-j", "1", str(board_dir)])
+    assert result.exit_code == 1
+    summary = json.loads(result.output)
+    assert (summary["files"], summary["valid"], summary["invalid"]) == (3, 2, 1)
+    assert summary["errors"][0]["line"] == 13
+
+    os.remove(board_dir / "shine-on.txt")
+    result = CliRunner().invoke(main, ["-q", str(board_dir)])
+    assert result.exit_code == 0
@@ -0,0 +1,93 @@
+"""
+Tests for trusted loading of verified boards
+"""
+import shutil
+
+import pytest
+
+from boardcache import content_key
+from gamefile import GameFileError
+from strands import StrandsGame
+from validate import stamp, validate_file
+from verified import is_verified, read_manifest, set_manifest, write_manifest
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """
+    Use an empty manifest in a temporary directory.
+    """
+    path = tmp_path / "verified.sha256"
+    set_manifest(str(path))
+    yield path
+    set_manifest()
+
+
+def unfilled_board(tmp_path) -> str:
+    """
+    Write a copy of face-time.txt with its last answer
+    removed, so that the board is not filled.
+    """
+    with open("boards/face-time.txt") as f:
+        lines = f.readlines()
+    path = tmp_path / "unfilled.txt"
+    path.write_text("".join(lines[:16]))
+    return str(path)
+
+
+def test_shipped_boards_verified() -> None:
+    """
+    The shipped manifest lists every valid shipped board.
+    """
+    entries = read_manifest()
+    assert "../boards/face-time.txt" in entries
+    assert "../boards/shine-on.txt" not in entries
+    with open("boards/face-time.txt", "rb") as f:
+        assert is_verified(content_key(f.read()))
+
+
+def test_trusted_load_matches(manifest) -> None:
+    """
+    A verified board loads the same way trusted or not.
+    """
+    assert stamp([validate_file("boards/face-time.txt")], str(manifest)) == 1
+    trusted = StrandsGame("boards/face-time.txt", trusted=True)
+    checked = StrandsGame("boards/face-time.txt")
+    assert trusted.theme() == checked.theme()
+    assert trusted.answers() == checked.answers()
+    for word, strand in checked.answers():
+        assert trusted.submit_strand(strand) == (word, True)
+    assert trusted.game_over()
+
+
+def test_trusted_only_for_verified(manifest, tmp_path) -> None:
+    """
+    Trusted mode skips the checks only for files listed in
+    the manifest.
+    """
+    path = unfilled_board(tmp_path)
+    with pytest.raises(GameFileError, match="not filled"):
+        StrandsGame(path, trusted=True)
+
+    with open(path, "rb") as f:
+        write_manifest([("unfilled.txt", content_key(f.read()))], str(manifest))
+    assert len(StrandsGame(path, trusted=True).answers()) == 5
+    with pytest.raises(GameFileError, match="not filled"):
+        StrandsGame(path)
+
+
+def test_stamp_drops_invalid_files(manifest, tmp_path) -> None:
+    """
+    Stamping records valid files and removes invalid ones,
+    keeping unrelated entries.
+    """
+    shutil.copy("boards/face-time.txt", tmp_path)
+    path = tmp_path / "face-time.txt"
+    write_manifest([("other.txt", "0" * 64)], str(manifest))
+
+    assert stamp([validate_file(str(path))], str(manifest)) == 1
+    assert set(read_manifest(str(manifest))) == {"face-time.txt", "other.txt"}
+
+    path.write_text(path.read_text().replace("primer", "primed"))
+    assert stamp([validate_file(str(path))], str(manifest)) == 0
+    assert set(read_manifest(str(manifest))) == {"other.txt"}